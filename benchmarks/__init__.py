@@ -0,0 +1,17 @@
+"""
+Offline benchmarks for Mopey.
+
+Run any module directly from the repo root, e.g.:
+    python -m benchmarks.bench_queue
+
+or all of them, saving and comparing JSON results:
+    python -m benchmarks.run --out baseline.json
+    python -m benchmarks.run --compare baseline.json
+
+Playback benchmarks drive the real GuildPlayer against the in-process fakes
+in benchmarks.fakes, so no Discord, YouTube or ffmpeg is needed.
+
+For capacity planning, benchmarks.load_sim drives MusicCog commands for many
+simulated guilds with real ffmpeg audio from a local tone file:
+    python -m benchmarks.load_sim --guilds 500 --duration 120
+"""
@@ -0,0 +1,113 @@
+"""
+GuildPlayer playback benchmark, run against in-process fakes.
+
+Measures, with the real player code driving a FakeVoiceClient:
+  - song-transition gap: last packet of one song to first packet of the next
+  - prefetch hit rate for a fast and a slow source (resolve faster/slower than a song)
+  - seek latency: seek() call to the first packet of the re-spawned audio
+
+Usage:
+    python -m benchmarks.bench_playback
+"""
+
+import asyncio
+import statistics
+import threading
+from time import perf_counter
+
+from mopey.core.player import PREFETCH_LOOKUPS
+
+from .fakes import BenchPlayer, FakeBot, FakeSource, make_songs
+
+SONGS = 8
+SONG_SECONDS = 1
+SEEKS = 10
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"median_ms": 0.0, "max_ms": 0.0}
+    return {
+        "median_ms": statistics.median(values) * 1000,
+        "max_ms": max(values) * 1000,
+    }
+
+
+async def _play_through(source: FakeSource, spawn_latency: float) -> BenchPlayer:
+    """Queue SONGS short songs and wait for the queue to drain."""
+    player = BenchPlayer(FakeBot(asyncio.get_running_loop()), spawn_latency=spawn_latency)
+    songs = make_songs(SONGS, duration=SONG_SECONDS)
+    player.expect(songs)
+    for song in songs[1:]:
+        player.queue.add(song)
+    player.current_song = songs[0]
+    await player.play_song(songs[0], source, after_ctx=None)
+
+    deadline = perf_counter() + SONGS * (SONG_SECONDS + 3)
+    while (player.current_song or not player.queue.is_empty()) and perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    return player
+
+
+async def transition_gap(resolve_latency: float, spawn_latency: float) -> dict[str, float]:
+    hits = PREFETCH_LOOKUPS.value(result="hit")
+    misses = PREFETCH_LOOKUPS.value(result="miss")
+    player = await _play_through(FakeSource(resolve_latency=resolve_latency), spawn_latency)
+    records = [r for r in player.voice.records if r.first_packet is not None]
+    gaps = [
+        nxt.first_packet - prev.last_packet
+        for prev, nxt in zip(records, records[1:])
+        if prev.last_packet is not None
+    ]
+    hits = PREFETCH_LOOKUPS.value(result="hit") - hits
+    misses = PREFETCH_LOOKUPS.value(result="miss") - misses
+    return {
+        **{f"gap_{k}": v for k, v in _summary(gaps).items()},
+        "prefetch_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "late_packets": sum(r.late_packets for r in records),
+    }
+
+
+async def seek_latency(spawn_latency: float) -> dict[str, float]:
+    player = BenchPlayer(FakeBot(asyncio.get_running_loop()), spawn_latency=spawn_latency)
+    source = FakeSource()
+    [song] = make_songs(1, duration=SEEKS * 10 + 30)
+    player.expect([song])
+    player.current_song = song
+    await player.play_song(song, source, after_ctx=None)
+
+    first_packet = threading.Event()
+    player.voice.on_first_packet = lambda record: first_packet.set()
+    loop = asyncio.get_running_loop()
+    latencies = []
+    for _ in range(SEEKS):
+        await asyncio.sleep(0.1)
+        first_packet.clear()
+        start = perf_counter()
+        await player.seek(5, source, ctx=None)
+        await loop.run_in_executor(None, first_packet.wait, 2)
+        latencies.append(perf_counter() - start)
+    player.stop()
+    return {f"seek_{k}": v for k, v in _summary(latencies).items()}
+
+
+async def _run() -> dict:
+    return {
+        "fast_source": await transition_gap(resolve_latency=0.05, spawn_latency=0.01),
+        "slow_source": await transition_gap(resolve_latency=SONG_SECONDS * 1.5, spawn_latency=0.01),
+        "seek": await seek_latency(spawn_latency=0.01),
+    }
+
+
+def main() -> dict:
+    results = asyncio.run(_run())
+    print(f"{'scenario':<14}{'metric':<22}{'value':>12}")
+    print("-" * 48)
+    for scenario, metrics in results.items():
+        for name, value in metrics.items():
+            print(f"{scenario:<14}{name:<22}{value:>12.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+SongQueue complexity benchmark.
+
+Times each queue operation at 10, 1k and 100k queued songs and compares
+against the original list-backed implementation and a deque-backed one,
+so the per-op cost growth (O(1) vs O(n)) is visible at a glance.
+
+Usage:
+    python -m benchmarks.bench_queue
+"""
+
+import timeit
+from collections import deque
+
+from mopey.core.queue import SongQueue
+from mopey.core.song import Song
+
+SIZES = (10, 1_000, 100_000)
+
+
+class ListSongQueue:
+    """The previous list-backed queue, kept here as the baseline."""
+
+    def __init__(self, max_size: int):
+        self._songs: list[Song] = []
+        self.max_size = max_size
+
+    def add(self, song: Song) -> bool:
+        if len(self._songs) >= self.max_size:
+            return False
+        self._songs.append(song)
+        return True
+
+    def pop_next(self):
+        return self._songs.pop(0) if self._songs else None
+
+    def remove_at(self, position: int):
+        index = position - 1
+        if 0 <= index < len(self._songs):
+            return self._songs.pop(index)
+        return None
+
+    def move_to_front(self, position: int):
+        index = position - 1
+        if 0 <= index < len(self._songs):
+            song = self._songs.pop(index)
+            self._songs.insert(0, song)
+            return song
+        return None
+
+    def contains(self, link: str) -> bool:
+        return any(s.link == link for s in self._songs)
+
+    def __len__(self):
+        return len(self._songs)
+
+
+class DequeSongQueue(ListSongQueue):
+    """A deque-backed queue: O(1) at the ends, but O(n) indexing in the middle."""
+
+    def __init__(self, max_size: int):
+        self._songs: deque[Song] = deque()
+        self.max_size = max_size
+
+    def pop_next(self):
+        return self._songs.popleft() if self._songs else None
+
+    def remove_at(self, position: int):
+        index = position - 1
+        if 0 <= index < len(self._songs):
+            song = self._songs[index]
+            del self._songs[index]
+            return song
+        return None
+
+    def move_to_front(self, position: int):
+        song = self.remove_at(position)
+        if song is not None:
+            self._songs.appendleft(song)
+        return song
+
+
+def _make_songs(n: int) -> list[Song]:
+    return [
+        Song(title=f"Song {i}", url="", link=f"https://youtu.be/{i:011d}", duration=200)
+        for i in range(n)
+    ]
+
+
+def _filled(cls, songs: list[Song]):
+    queue = cls(max_size=len(songs) + 1)
+    for song in songs:
+        queue.add(song)
+    return queue
+
+
+def _time_op(fn, number: int) -> float:
+    """Best-of-5 seconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def bench(size: int, cls) -> dict[str, float]:
+    songs = _make_songs(size)
+    queue = _filled(cls, songs)
+    extra = Song(title="Extra", url="", link="https://youtu.be/extra", duration=200)
+    middle = size // 2 + 1
+    last_link = songs[-1].link
+    number = 200 if size >= 100_000 else 2_000
+
+    def pop_then_add():
+        queue.add(queue.pop_next())
+
+    def move_last_to_front():
+        # Move the tail to the head, then rotate it back so the size is stable
+        song = queue.move_to_front(len(queue))
+        queue.remove_at(1)
+        queue.add(song)
+
+    def remove_middle_then_add():
+        queue.add(queue.remove_at(middle))
+
+    def contains_last():
+        queue.contains(last_link)
+
+    def add_then_pop():
+        queue.add(extra)
+        queue.remove_at(len(queue))
+
+    return {
+        "pop_next+add": _time_op(pop_then_add, number),
+        "move_to_front(tail)": _time_op(move_last_to_front, number),
+        "remove_at(middle)+add": _time_op(remove_middle_then_add, number),
+        "contains(link)": _time_op(contains_last, number),
+        "add+remove_at(tail)": _time_op(add_then_pop, number),
+    }
+
+
+def main() -> dict:
+    results = {}
+    for size in SIZES:
+        for name, cls in (("list", ListSongQueue), ("deque", DequeSongQueue), ("queue", SongQueue)):
+            results[f"{name}/{size}"] = bench(size, cls)
+
+    ops = list(next(iter(results.values())).keys())
+    header = f"{'operation':<24}" + "".join(f"{k:>16}" for k in results)
+    print(header)
+    print("-" * len(header))
+    for op in ops:
+        row = f"{op:<24}" + "".join(f"{results[k][op] * 1e6:>14.2f}us" for k in results)
+        print(row)
+    return results
+
+
+if __name__ == "__main__":
+    main()
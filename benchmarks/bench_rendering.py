@@ -0,0 +1,70 @@
+"""
+Rendering benchmark: the text helpers and embeds rebuilt on every Now
+Playing edit and search page.
+
+Usage:
+    python -m benchmarks.bench_rendering
+"""
+
+import timeit
+
+import discord
+
+from mopey.core.queue import SongQueue
+from mopey.core.song import Song
+from mopey.ui.now_playing import build_now_playing_embed
+from mopey.ui.search_menu import build_results_embed
+from mopey.utils.formatting import build_progress_bar, format_song_line
+
+NUMBER = 20_000
+
+
+class _StaticPlayer:
+    """The GuildPlayer attributes build_now_playing_embed reads."""
+
+    def __init__(self, song: Song, upcoming: Song):
+        self.current_song = song
+        self.elapsed = 95
+        self.is_paused = False
+        self.queue = SongQueue(max_size=10)
+        self.queue.add(upcoming)
+
+
+def _per_call_us(fn, number: int = NUMBER) -> float:
+    """Best-of-5 microseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> dict:
+    song = Song(
+        title="A Fairly Typical Song Title (Official Audio)", url="", link="fake://1",
+        duration=245, artist="Some Artist", album="Some Album",
+        thumbnail="https://i.ytimg.com/vi/xxxxxxxxxxx/hqdefault.jpg",
+    )
+    upcoming = Song(title="Next Up", url="", link="fake://2", duration=180)
+    player = _StaticPlayer(song, upcoming)
+    results = [
+        Song(title=f"Result {i}", url="", link=f"fake://r{i}", duration=200 + i, artist="Artist")
+        for i in range(10)
+    ]
+    color = discord.Color.dark_gray()
+
+    timings = {
+        "format_song_line_us": _per_call_us(
+            lambda: format_song_line(song.title, song.duration, song.artist, song.album)
+        ),
+        "build_progress_bar_us": _per_call_us(lambda: build_progress_bar(95, 245)),
+        "now_playing_embed_us": _per_call_us(lambda: build_now_playing_embed(player), NUMBER // 10),
+        "results_embed_page_us": _per_call_us(
+            lambda: build_results_embed(results, 1, "Search Results", color), NUMBER // 10
+        ),
+    }
+    print(f"{'operation':<26}{'us/call':>10}")
+    print("-" * 36)
+    for name, value in timings.items():
+        print(f"{name:<26}{value:>10.2f}")
+    return timings
+
+
+if __name__ == "__main__":
+    main()
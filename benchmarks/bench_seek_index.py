@@ -0,0 +1,90 @@
+"""
+Seek index benchmark and decode check: builds a WebM (Cues) and a
+fragmented M4A (sidx) with ffmpeg, indexes them, splices the init segment
+onto the stream from an index point — the bytes RangeSeeker's proxy
+serves — and decodes that with the player's indexed-seek options.
+
+A splice that decodes to nothing fails the run: that's what every indexed
+seek would play. Skipped when ffmpeg isn't on PATH.
+
+Usage:
+    python -m benchmarks.bench_seek_index
+"""
+
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+import timeit
+
+from mopey.core.player import _ffmpeg_options_from_index
+from mopey.core.seek_index import SeekIndex, parse_mp4, webm_cues, webm_layout
+
+DURATION = 300         # seconds of test tone per file
+TARGET = 200.0         # seek target, seconds
+NUMBER = 2_000
+
+_ENCODINGS = {
+    "webm": ("-c:a", "libopus", "-b:a", "64k", "-cluster_time_limit", "5000"),
+    # Fragments addressed relative to their moof, as in YouTube's DASH m4a streams
+    "m4a": ("-c:a", "aac", "-b:a", "64k", "-f", "mp4", "-frag_duration", "5000000",
+            "-movflags", "+frag_keyframe+empty_moov+default_base_moof+global_sidx"),
+}
+
+
+def _index(data: bytes) -> SeekIndex:
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        segment_start, scale, cues_at = webm_layout(data[:64 * 1024])
+        return webm_cues(data[cues_at:], segment_start, scale)
+    return parse_mp4(data)
+
+
+def _decoded_seconds(ffmpeg: str, stream: bytes, options: dict) -> float:
+    """Seconds of audio ffmpeg decodes from `stream` with FFmpegOpusAudio-style `options`."""
+    result = subprocess.run(
+        [ffmpeg, "-hide_banner", *shlex.split(options["before_options"]), "-i", "pipe:0",
+         *shlex.split(options["options"]), "-f", "null", "-"],
+        input=stream, capture_output=True, check=True,
+    )
+    times = re.findall(rb"time=(\d+):(\d+):(\d+\.\d+)", result.stderr)
+    if not times:
+        return 0.0
+    hours, minutes, seconds = times[-1]
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def main() -> dict:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        print("ffmpeg not found; skipped")
+        return {}
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, encoding in _ENCODINGS.items():
+            path = os.path.join(directory, f"tone.{name}")
+            subprocess.run(
+                [ffmpeg, "-v", "error", "-f", "lavfi", "-i", f"sine=f=440:d={DURATION}", *encoding, path],
+                check=True,
+            )
+            with open(path, "rb") as f:
+                data = f.read()
+
+            index = _index(data)
+            point, offset = index.locate(TARGET)
+            spliced = data[:index.init_end] + data[offset:]
+            decoded = _decoded_seconds(ffmpeg, spliced, _ffmpeg_options_from_index(TARGET - point))
+            expected = DURATION - TARGET
+            print(f"{name:<6}{len(index.times):>5} points  seek {TARGET:.0f}s from {point:.1f}s  "
+                  f"decoded {decoded:.1f}s (expected ~{expected:.0f}s)")
+            if decoded < expected / 2:
+                raise AssertionError(f"indexed seek into {name} decoded {decoded:.1f}s of audio")
+
+            results[f"{name}_index_us"] = min(timeit.repeat(lambda: _index(data), number=NUMBER, repeat=5)) / NUMBER * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Song memory benchmark.
+
+Reports bytes per queued song for the previous plain-dataclass Song (which
+also kept the unplayed googlevideo URL from search results) against the
+current slotted, interned Song.
+
+Usage:
+    python -m benchmarks.bench_song_memory
+"""
+
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from mopey.core.queue import SongQueue, LARGE_QUEUE_SIZE
+from mopey.core.song import Song
+
+QUEUE_LENGTH = 5_000
+ARTISTS = 50
+ALBUMS = 200
+
+
+@dataclass
+class LegacySong:
+    """The previous Song: a plain dataclass with a per-instance __dict__."""
+    title: str
+    url: str
+    link: str
+    duration: int
+    artist: Optional[str] = None
+    album: Optional[str] = None
+    thumbnail: Optional[str] = None
+
+
+def _fresh(text: str) -> str:
+    """A new string object, as if freshly parsed from a yt-dlp/Plex response."""
+    return "".join(list(text))
+
+
+def _youtube_fields(i: int, keep_stream_url: bool) -> dict:
+    video_id = f"{i:011d}"
+    stream_url = (
+        f"https://rr3---sn-abc.googlevideo.com/videoplayback?expire=1700000000&id={video_id}"
+        + "&sig=" + "A" * 900
+    )
+    return {
+        "title": _fresh(f"Some Song Title Number {i}"),
+        "url": _fresh(stream_url) if keep_stream_url else "",
+        "link": _fresh(f"https://www.youtube.com/watch?v={video_id}"),
+        "duration": 200 + i % 200,
+        "thumbnail": _fresh(f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"),
+    }
+
+
+def _plex_fields(i: int) -> dict:
+    stream_url = _fresh(f"http://plex.local:32400/library/parts/{i}/file.flac?X-Plex-Token=abcdef123456")
+    album = i % ALBUMS
+    return {
+        "title": _fresh(f"Track {i}"),
+        "url": stream_url,
+        "link": _fresh(stream_url),
+        "duration": 180 + i % 120,
+        "artist": _fresh(f"Artist {album % ARTISTS}"),
+        "album": _fresh(f"Album {album}"),
+        "thumbnail": _fresh(f"/library/metadata/{album}/art/1700000000"),
+    }
+
+
+def measure(factory, fields) -> float:
+    """Bytes allocated per queued song, including its strings."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    queue = SongQueue(max_size=LARGE_QUEUE_SIZE)
+    for i in range(QUEUE_LENGTH):
+        queue.add(factory(**fields(i)))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del queue
+    return (after - before) / QUEUE_LENGTH
+
+
+def main() -> dict:
+    results = {
+        "youtube/legacy": measure(LegacySong, lambda i: _youtube_fields(i, keep_stream_url=True)),
+        "youtube/slotted": measure(Song, lambda i: _youtube_fields(i, keep_stream_url=False)),
+        "plex/legacy": measure(LegacySong, _plex_fields),
+        "plex/slotted": measure(Song, _plex_fields),
+    }
+    print(f"{'variant':<20}{'bytes/song':>12}")
+    print("-" * 32)
+    for name, value in results.items():
+        print(f"{name:<20}{value:>12.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
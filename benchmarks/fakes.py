@@ -0,0 +1,219 @@
+"""
+In-process fakes for benchmarking the player without Discord, YouTube or ffmpeg.
+
+    FakeSource       — an AudioSource whose search/resolve sleep for a set latency
+    FakeAudio        — a discord.AudioSource yielding silent 20 ms Opus frames
+    FakeVoiceClient  — consumes packets in real time on a thread, like
+                       discord.py's AudioPlayer, and records packet timing
+    FakeBot          — just enough of commands.Bot for GuildPlayer
+    BenchPlayer      — a GuildPlayer that spawns FakeAudio instead of ffmpeg
+
+The player code under test (queue advance, prefetch, seek, after-callback
+thread hop) is the real code; only the I/O at the edges is faked.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Optional
+
+import discord
+
+from mopey.core.player import GuildPlayer
+from mopey.core.song import Song
+from mopey.core.sources import AudioSource
+
+FRAME_SECONDS = 0.02                  # discord.py sends one Opus frame every 20 ms
+SILENT_FRAME = b"\xf8\xff\xfe"        # an Opus silence frame
+
+
+def make_songs(n: int, duration: int = 1, prefix: str = "bench") -> list[Song]:
+    return [
+        Song(title=f"{prefix} {i}", url="", link=f"fake://{prefix}/{i}", duration=duration)
+        for i in range(n)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Source and audio
+# ---------------------------------------------------------------------------
+
+class FakeSource(AudioSource):
+
+    def __init__(self, search_latency: float = 0.0, resolve_latency: float = 0.0):
+        self.search_latency = search_latency
+        self.resolve_latency = resolve_latency
+        self.resolves = 0
+
+    async def search(self, query: str, limit: int = 3) -> list[Song]:
+        await asyncio.sleep(self.search_latency)
+        return make_songs(limit, prefix=query)
+
+    async def resolve(self, song: Song) -> Song:
+        await asyncio.sleep(self.resolve_latency)
+        self.resolves += 1
+        return Song(
+            title=song.title, url=f"{song.link}#stream", link=song.link,
+            duration=song.duration, artist=song.artist, album=song.album,
+        )
+
+
+class FakeAudio(discord.AudioSource):
+    """`duration` seconds of silent Opus frames."""
+
+    def __init__(self, duration: float):
+        self._remaining = max(1, int(duration / FRAME_SECONDS))
+        self.cleaned_up = False
+
+    def read(self) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        self._remaining -= 1
+        return SILENT_FRAME
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+# ---------------------------------------------------------------------------
+# Voice client and bot
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PlaybackRecord:
+    """Packet timing for one voice_client.play() call."""
+    started: float
+    first_packet: Optional[float] = None
+    last_packet: Optional[float] = None
+    packets: int = 0
+    late_packets: int = 0
+    jitter_total: float = 0.0    # sum of |actual - scheduled| send times, seconds
+    jitter_max: float = 0.0
+
+    @property
+    def jitter_mean(self) -> float:
+        return self.jitter_total / self.packets if self.packets else 0.0
+
+
+class FakeVoiceClient:
+    """
+    Reads one frame per 20 ms on a background thread, like discord.py's
+    AudioPlayer, and calls `after` from that thread when the source ends or
+    is stopped. Timing of every play() is kept in `records`.
+    """
+
+    def __init__(self, channel_name: str = "bench"):
+        self.channel = type("FakeChannel", (), {"name": channel_name, "id": 1})()
+        self.records: list[PlaybackRecord] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._connected = True
+        self.on_first_packet: Optional[Callable[[PlaybackRecord], None]] = None
+
+    def play(self, source: discord.AudioSource, *, after=None) -> None:
+        if self.is_playing():
+            raise discord.ClientException("Already playing audio.")
+        self._stop = threading.Event()
+        record = PlaybackRecord(started=perf_counter())
+        self.records.append(record)
+        self._thread = threading.Thread(
+            target=self._run, args=(source, after, record, self._stop), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, source, after, record: PlaybackRecord, stop: threading.Event) -> None:
+        next_at = perf_counter()
+        error = None
+        try:
+            while not stop.is_set():
+                self._resumed.wait()
+                data = source.read()
+                if not data:
+                    break
+                now = perf_counter()
+                if record.first_packet is None:
+                    record.first_packet = now
+                    if self.on_first_packet:
+                        self.on_first_packet(record)
+                deviation = abs(now - next_at)
+                record.jitter_total += deviation
+                record.jitter_max = max(record.jitter_max, deviation)
+                if now - next_at > FRAME_SECONDS:
+                    record.late_packets += 1
+                record.last_packet = now
+                record.packets += 1
+                next_at += FRAME_SECONDS
+                delay = next_at - perf_counter()
+                if delay > 0:
+                    stop.wait(delay)
+        except Exception as e:
+            error = e
+        finally:
+            source.cleanup()
+            if after:
+                after(error)
+
+    def stop(self) -> None:
+        # Like discord.py: signal the thread and return; `after` fires from it shortly
+        self._stop.set()
+        self._resumed.set()
+        self._thread = None
+
+    def pause(self) -> None:
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    def is_playing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._resumed.is_set()
+
+    def is_paused(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._resumed.is_set()
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def disconnect(self, *, force: bool = False) -> None:
+        self.stop()
+        self._connected = False
+
+
+class FakeBot:
+    """The attributes GuildPlayer touches on commands.Bot."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.cogs: dict = {}
+
+
+# ---------------------------------------------------------------------------
+# Player
+# ---------------------------------------------------------------------------
+
+class BenchPlayer(GuildPlayer):
+    """GuildPlayer wired to a FakeVoiceClient, with FakeAudio in place of ffmpeg."""
+
+    def __init__(self, bot: FakeBot, spawn_latency: float = 0.0, **kwargs):
+        super().__init__(guild_id=0, bot=bot, **kwargs)
+        self.spawn_latency = spawn_latency
+        self.voice = FakeVoiceClient()
+        self._voice_client = self.voice
+        self._durations: dict[str, float] = {}
+
+    def expect(self, songs: list[Song]) -> None:
+        """Register song durations so spawned audio lasts as long as the song."""
+        for song in songs:
+            self._durations[f"{song.link}#stream"] = song.duration
+
+    async def _create_audio(self, url: str, options: dict, kind: str, profile=None, settings=None) -> discord.AudioSource:
+        await asyncio.sleep(self.spawn_latency)
+        audio = FakeAudio(self._durations.get(url, 1.0))
+        self._tracker.register(audio, self, kind)
+        return audio
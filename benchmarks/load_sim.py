@@ -0,0 +1,401 @@
+"""
+Many-guild load simulator for MusicCog.
+
+Drives the real MusicCog commands (play, search, skip, seek, queue) for
+thousands of simulated guilds with stubbed Discord objects, so we can see how
+many concurrent guilds one process serves before commands slow down or
+audio jitters. Audio is real: each player spawns ffmpeg against a tone file
+(generated with ffmpeg at startup) served from a local HTTP server, and a
+FakeVoiceClient per guild reads Opus frames on its own thread every 20 ms,
+exactly like discord.py's AudioPlayer.
+
+Arrivals are realistic rather than lock-step: guilds start as a Poisson
+process over the ramp-up period, and each guild's members then issue
+commands with exponential think times drawn from a weighted command mix.
+Search pickers are "clicked" by the simulated user after a short delay.
+
+Reports:
+  - command latency percentiles per command
+  - event-loop lag percentiles (how late a 100 ms timer fires)
+  - per-guild packet send jitter and late-packet fraction
+
+Usage:
+    python -m benchmarks.load_sim --guilds 500 --duration 120
+    python -m benchmarks.load_sim --guilds 2000 --ramp 60 --out load.json
+
+Requires ffmpeg on PATH (the same binary the bot uses) and discord.py.
+"""
+
+import argparse
+import asyncio
+import http.server
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import defaultdict
+from functools import partial
+from time import perf_counter
+from typing import Optional
+
+import discord
+
+from mopey.cogs.music import MusicCog
+from mopey.core.song import Song
+from mopey.core.sources import AudioSource
+from mopey.ui.search_menu import SearchPicker
+
+from .fakes import FakeVoiceClient
+
+COMMAND_MIX = {"play": 0.35, "queue": 0.20, "skip": 0.15, "seek": 0.15, "search": 0.15}
+LAG_PROBE_INTERVAL = 0.1
+PERCENTILES = (50, 90, 95, 99)
+
+_ids = itertools.count(1_000_000)
+
+
+def _percentiles(values: list[float], scale: float = 1000.0) -> dict[str, float]:
+    """Percentiles (in ms by default) plus max and count."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    result = {
+        f"p{p}_ms": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * scale
+        for p in PERCENTILES
+    }
+    result["max_ms"] = ordered[-1] * scale
+    result["count"] = len(ordered)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Local media
+# ---------------------------------------------------------------------------
+
+def make_tone(directory: str, seconds: int) -> str:
+    """Encode a sine tone to Opus/WebM with ffmpeg; returns the file name."""
+    name = "tone.webm"
+    subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={seconds}",
+            "-c:a", "libopus", "-b:a", "96k", os.path.join(directory, name),
+        ],
+        check=True,
+    )
+    return name
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory: str) -> tuple[http.server.ThreadingHTTPServer, str]:
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(_QuietHandler, directory=directory)
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="load-sim-http", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class ToneSource(AudioSource):
+    """Every search result and resolve points at the local tone file."""
+
+    def __init__(self, stream_url: str, duration: int, latency: float):
+        self._stream_url = stream_url
+        self._duration = duration
+        self._latency = latency
+
+    async def _delay(self) -> None:
+        # Long-tailed, like real yt-dlp extractions
+        await asyncio.sleep(random.lognormvariate(0, 0.5) * self._latency)
+
+    async def search(self, query: str, limit: int = 3) -> list[Song]:
+        await self._delay()
+        return [
+            Song(title=f"{query} #{i}", url="", link=f"{self._stream_url}?id={next(_ids)}",
+                 duration=self._duration)
+            for i in range(limit)
+        ]
+
+    async def resolve(self, song: Song) -> Song:
+        await self._delay()
+        return Song(title=song.title, url=self._stream_url, link=song.link, duration=song.duration)
+
+
+# ---------------------------------------------------------------------------
+# Stubbed Discord objects
+# ---------------------------------------------------------------------------
+
+class SimMessage:
+
+    def __init__(self, channel: "SimTextChannel"):
+        self.id = next(_ids)
+        self.channel = channel
+
+    async def edit(self, **kwargs) -> None:
+        await self.channel.sim.rest_call()
+
+    async def delete(self) -> None:
+        await self.channel.sim.rest_call()
+
+
+class SimTextChannel:
+
+    def __init__(self, sim: "LoadSim"):
+        self.id = next(_ids)
+        self.name = "music"
+        self.sim = sim
+
+    async def send(self, content: Optional[str] = None, *, embed=None, view=None) -> SimMessage:
+        await self.sim.rest_call()
+        if isinstance(view, SearchPicker):
+            asyncio.ensure_future(self.sim.pick(view))
+        return SimMessage(self)
+
+
+class SimVoiceChannel:
+
+    def __init__(self, sim: "LoadSim"):
+        self.id = next(_ids)
+        self.name = "voice"
+        self.sim = sim
+
+    async def connect(self) -> FakeVoiceClient:
+        await self.sim.rest_call()
+        client = FakeVoiceClient(self.name)
+        client.channel = self
+        self.sim.voice_clients[self.id].append(client)
+        return client
+
+
+class SimGuild:
+
+    def __init__(self, sim: "LoadSim", members: int):
+        self.id = next(_ids)
+        self.name = f"guild-{self.id}"
+        self.text = SimTextChannel(sim)
+        self.voice = SimVoiceChannel(sim)
+        voice_state = type("VoiceState", (), {"channel": self.voice})()
+        self.members = [
+            type("Member", (), {"id": next(_ids), "name": f"user{i}", "discriminator": "0", "voice": voice_state})()
+            for i in range(members)
+        ]
+
+
+class SimContext:
+    """What MusicCog commands read from commands.Context."""
+
+    def __init__(self, guild: SimGuild, author):
+        self.guild = guild
+        self.author = author
+        self.channel = guild.text
+        self.interaction = None
+        self.message = type("Message", (), {"id": discord.utils.time_snowflake(discord.utils.utcnow())})()
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> SimMessage:
+        return await self.channel.send(content, **kwargs)
+
+    async def defer(self, **kwargs) -> None:
+        pass
+
+
+class SimBot:
+    """The attributes MusicCog and its helpers touch on commands.Bot."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.cogs: dict = {}
+        self.guilds: list = []
+
+    async def change_presence(self, **kwargs) -> None:
+        pass
+
+    def add_view(self, view) -> None:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+class LoadSim:
+
+    def __init__(self, args: argparse.Namespace, stream_url: str):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.bot = SimBot(asyncio.get_running_loop())
+        self.source = ToneSource(stream_url, args.song_seconds, args.resolve_latency)
+        self.cog = MusicCog(self.bot, self.source)
+        self.bot.cogs["MusicCog"] = self.cog
+        self.guilds: list[SimGuild] = []
+        self.voice_clients: dict[int, list[FakeVoiceClient]] = defaultdict(list)
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.loop_lag: list[float] = []
+        self._commands = list(COMMAND_MIX)
+        self._weights = list(COMMAND_MIX.values())
+
+    async def rest_call(self) -> None:
+        """Simulated Discord REST round trip."""
+        await asyncio.sleep(self.args.rest_latency)
+
+    async def pick(self, picker: SearchPicker) -> None:
+        """The searching user reads the results and presses a number."""
+        await asyncio.sleep(self.rng.uniform(0.5, 3.0))
+        picker.chosen = self.rng.choice(picker._songs)
+        picker.stop()
+
+    async def run_command(self, name: str, guild: SimGuild) -> None:
+        ctx = SimContext(guild, self.rng.choice(guild.members))
+        command = getattr(MusicCog, name)
+        if name == "play":
+            call = command.callback(self.cog, ctx, link=f"tone {self.rng.randint(1, 10_000)}")
+        elif name == "search":
+            call = command.callback(self.cog, ctx, query=f"tone {self.rng.randint(1, 10_000)}")
+        elif name == "seek":
+            call = command.callback(self.cog, ctx, seconds=self.rng.choice((-10, 10, 30)))
+        else:
+            call = command.callback(self.cog, ctx)
+        start = perf_counter()
+        try:
+            await call
+        except Exception:
+            self.errors[name] += 1
+        self.latencies[name].append(perf_counter() - start)
+
+    async def guild_session(self, guild: SimGuild, until: float) -> None:
+        await self.run_command("play", guild)
+        while perf_counter() < until:
+            await asyncio.sleep(self.rng.expovariate(1 / self.args.mean_interval))
+            if perf_counter() >= until:
+                break
+            name = self.rng.choices(self._commands, self._weights)[0]
+            await self.run_command(name, guild)
+
+    async def probe_loop_lag(self) -> None:
+        while True:
+            expected = perf_counter() + LAG_PROBE_INTERVAL
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.loop_lag.append(max(0.0, perf_counter() - expected))
+
+    async def run(self) -> dict:
+        self.cog._idle.start()
+        self.cog._now_playing.start()
+        self.cog._presence.start()
+        probe = asyncio.ensure_future(self.probe_loop_lag())
+
+        start = perf_counter()
+        until = start + self.args.duration
+        sessions = []
+        arrival_rate = self.args.guilds / max(self.args.ramp, 1e-6)
+        for _ in range(self.args.guilds):
+            await asyncio.sleep(self.rng.expovariate(arrival_rate))
+            guild = SimGuild(self, self.args.members)
+            self.guilds.append(guild)
+            sessions.append(asyncio.ensure_future(self.guild_session(guild, until)))
+        await asyncio.gather(*sessions)
+
+        probe.cancel()
+        for guild in self.guilds:
+            await self.cog.stop_player(guild.id)
+        self.cog._idle.stop()
+        self.cog._now_playing.stop()
+        self.cog._presence.stop()
+        return self.report()
+
+    def report(self) -> dict:
+        guild_jitter_mean, guild_jitter_max = [], []
+        packets = late = 0
+        for clients in self.voice_clients.values():
+            records = [r for client in clients for r in client.records if r.packets]
+            if not records:
+                continue
+            count = sum(r.packets for r in records)
+            packets += count
+            late += sum(r.late_packets for r in records)
+            guild_jitter_mean.append(sum(r.jitter_total for r in records) / count)
+            guild_jitter_max.append(max(r.jitter_max for r in records))
+        return {
+            "config": {
+                key: getattr(self.args, key)
+                for key in ("guilds", "members", "duration", "ramp", "mean_interval",
+                            "song_seconds", "resolve_latency", "rest_latency", "seed")
+            },
+            "commands": {name: _percentiles(values) for name, values in sorted(self.latencies.items())},
+            "errors": dict(self.errors),
+            "loop_lag": _percentiles(self.loop_lag),
+            "jitter": {
+                "guild_mean": _percentiles(guild_jitter_mean),
+                "guild_max": _percentiles(guild_jitter_max),
+                "packets": packets,
+                "late_fraction": late / packets if packets else 0.0,
+            },
+        }
+
+
+def _print_report(report: dict) -> None:
+    def row(label: str, stats: dict) -> str:
+        if not stats.get("count"):
+            return f"{label:<22}{'(none)':>10}"
+        cells = "".join(f"{stats[f'p{p}_ms']:>10.1f}" for p in PERCENTILES)
+        return f"{label:<22}{stats['count']:>8}{cells}{stats['max_ms']:>10.1f}"
+
+    header = f"{'':<22}{'n':>8}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}"
+    print(header + "   (ms)")
+    print("-" * len(header))
+    for name, stats in report["commands"].items():
+        print(row(f"cmd {name}", stats))
+    print(row("event loop lag", report["loop_lag"]))
+    print(row("jitter mean/guild", report["jitter"]["guild_mean"]))
+    print(row("jitter max/guild", report["jitter"]["guild_max"]))
+    jitter = report["jitter"]
+    print(f"\npackets sent: {jitter['packets']}, late (>20 ms): {jitter['late_fraction']:.3%}")
+    if report["errors"]:
+        print(f"command errors: {report['errors']}")
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory(prefix="mopey-load-") as directory:
+        tone = make_tone(directory, args.song_seconds)
+        server, base_url = serve_directory(directory)
+        try:
+            return await LoadSim(args, f"{base_url}/{tone}").run()
+        finally:
+            server.shutdown()
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Many-guild load simulator for MusicCog")
+    parser.add_argument("--guilds", type=int, default=200)
+    parser.add_argument("--members", type=int, default=5, help="simulated users per guild")
+    parser.add_argument("--duration", type=float, default=120.0, help="seconds of simulated traffic")
+    parser.add_argument("--ramp", type=float, default=30.0, help="seconds over which guilds arrive")
+    parser.add_argument("--mean-interval", type=float, default=15.0, help="mean seconds between a guild's commands")
+    parser.add_argument("--song-seconds", type=int, default=60)
+    parser.add_argument("--resolve-latency", type=float, default=0.3, help="median search/resolve latency")
+    parser.add_argument("--rest-latency", type=float, default=0.05, help="simulated Discord REST latency")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the report JSON to this path")
+    args = parser.parse_args(argv)
+
+    if shutil.which("ffmpeg") is None:
+        parser.error("ffmpeg not found on PATH")
+
+    report = asyncio.run(_main(args))
+    _print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved report to {args.out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Run the offline benchmarks, save results as JSON, and compare against a baseline.
+
+Usage:
+    python -m benchmarks.run                                  # run everything
+    python -m benchmarks.run --only queue,playback
+    python -m benchmarks.run --out results.json               # save for later
+    python -m benchmarks.run --compare baseline.json          # flag regressions
+
+Every benchmark module exposes main() -> dict of (nested) numbers. Results
+are flattened to 'module.key.subkey' paths. When comparing, lower is better
+except for metrics ending in '_rate'; a change worse than --threshold
+(default 10%) is reported as a regression and the exit status is 1.
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+BENCHMARKS = ("queue", "song_memory", "rendering", "playback", "seek_index")
+
+
+def _flatten(value, prefix: str = "") -> dict[str, float]:
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    return {prefix: float(value)}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(names: list[str]) -> dict:
+    results = {}
+    for name in names:
+        print(f"\n== {name} ==")
+        module = importlib.import_module(f"benchmarks.bench_{name}")
+        results.update(_flatten(module.main(), name))
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print a comparison table; return the metrics that regressed."""
+    regressions = []
+    print(f"\n{'metric':<52}{'baseline':>12}{'current':>12}{'change':>10}")
+    print("-" * 86)
+    for key in sorted(current.keys() & baseline.keys()):
+        old, new = baseline[key], current[key]
+        change = (new - old) / old if old else 0.0
+        worse = -change if key.endswith("_rate") else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif worse < -threshold:
+            flag = "  improved"
+        print(f"{key:<52}{old:>12.4g}{new:>12.4g}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--out", help="write results JSON to this path")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold (fraction)")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    report = run(names)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nSaved results to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
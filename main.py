@@ -1,3 +1,10 @@
+import os
+
+if os.getenv("startup_profile"):
+    # Must be hooked before the bot (and discord.py, yt-dlp, ...) is imported
+    from mopey.utils import startup
+    startup.enable()
+
 from mopey.bot import run_bot
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ constructs the concrete source/cog objects. Everything else
 receives its dependencies via constructor injection.
 """
 
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
@@ -13,21 +14,93 @@ from dotenv import load_dotenv
 import discord
 from discord.ext import commands
 
-from .core.sources import YouTubeSource, PlexSource
+from .core import admission
+from .core.admission import AdmissionController, AdmissionRejected
+from .core.loudness import LoudnessNormaliser, LoudnessStore, DEFAULT_LOUDNESS_PATH
+from .core.queue import MAX_QUEUE_SIZE
+from .core.seek_index import RangeSeeker
+from .core.sources import (
+    YouTubeSource, PlexSource, DEFAULT_YTDL_CACHE_DIR,
+    HEDGE_AFTER, SEARCH_DEADLINE, RESOLVE_DEADLINE,
+)
+from .core.state_store import PlayerStateStore, DEFAULT_STATE_PATH
 from .cogs.music import MusicCog
 from .cogs.plex_cog import PlexCog
 from .utils.log import setup_logging, get_logger
+from .utils import startup, tracing
+from .utils.metrics import serve_metrics
 
 log = get_logger(__name__)
 
 
+def _parse_guild_queue_sizes(raw: str | None) -> dict[int, int]:
+    """
+    Parse per-guild queue capacities from 'guild_id:size,guild_id:size'.
+    Malformed entries are skipped with a warning rather than aborting startup.
+    """
+    sizes: dict[int, int] = {}
+    if not raw:
+        return sizes
+    for entry in raw.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            guild_id, size = entry.split(":")
+            sizes[int(guild_id)] = int(size)
+        except ValueError:
+            log.warning(f"Ignoring malformed queue_guild_sizes entry: {entry!r}")
+    return sizes
+
+
+def _env_seconds(name: str, default: float) -> float | None:
+    """A duration in seconds from the environment; 0 means disabled (None)."""
+    raw = os.getenv(name)
+    try:
+        value = float(raw) if raw not in (None, "") else default
+    except ValueError:
+        log.warning(f"Ignoring non-numeric {name}={raw!r}")
+        value = default
+    return value or None
+
+
+def _env_count(name: str, default: int) -> int:
+    """A positive whole number from the environment; anything else falls back to `default`."""
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        log.warning(f"Ignoring {name}={raw!r}: expected a positive whole number")
+        return default
+    return value
+
+
 def run_bot():
-    setup_logging(level=logging.INFO)
     load_dotenv()
+    setup_logging(
+        level=logging.DEBUG if os.getenv("log_level", "").upper() == "DEBUG" else logging.INFO,
+        json_lines=os.getenv("log_format", "").lower() == "json",
+        debug_sample_every=_env_count("log_debug_sample", 1),
+    )
 
     TOKEN = os.getenv("discord_token")
     PLEX_BASE_URL = os.getenv("plex_base_url")
     PLEX_TOKEN = os.getenv("plex_token")
+    QUEUE_SIZE = int(os.getenv("queue_max_size", MAX_QUEUE_SIZE))
+    GUILD_QUEUE_SIZES = _parse_guild_queue_sizes(os.getenv("queue_guild_sizes"))
+    STATE_PATH = os.getenv("state_path", DEFAULT_STATE_PATH)
+    METRICS_PORT = int(os.getenv("metrics_port", 0))  # 0 disables the /metrics endpoint
+    YTDL_CACHE_DIR = os.getenv("ytdl_cache_dir", DEFAULT_YTDL_CACHE_DIR)  # empty: yt-dlp default
+    TRACE_FILE = os.getenv("trace_file")  # JSON lines of completed play traces
+    LOUDNESS_PATH = os.getenv("loudness_path", DEFAULT_LOUDNESS_PATH)  # empty: no normalisation
+    SEEK_INDEX_ENABLED = os.getenv("seek_index", "on").lower() not in ("off", "0", "false")
+    ADMISSION_ENABLED = os.getenv("admission", "on").lower() not in ("off", "0", "false")
+    # Publishing slash commands is rate limited; only needed when they change
+    SYNC_COMMANDS = os.getenv("sync_commands", "off").lower() in ("on", "1", "true")
 
     if not TOKEN:
         raise ValueError("discord_token not set in environment.")
@@ -36,26 +109,90 @@ def run_bot():
     intents.message_content = True
 
     bot = commands.Bot(command_prefix=".", intents=intents)
-
-    youtube = YouTubeSource()
-    plex = PlexSource(PLEX_BASE_URL, PLEX_TOKEN) if PLEX_BASE_URL and PLEX_TOKEN else None
+    tracing.configure_export(TRACE_FILE)
+
+    admission_control = AdmissionController(
+        user_rate=float(os.getenv("admission_user_rate", admission.USER_RATE)),
+        user_burst=float(os.getenv("admission_user_burst", admission.USER_BURST)),
+        guild_rate=float(os.getenv("admission_guild_rate", admission.GUILD_RATE)),
+        guild_burst=float(os.getenv("admission_guild_burst", admission.GUILD_BURST)),
+        max_extractions=int(os.getenv("ytdl_max_extractions", admission.MAX_EXTRACTIONS)),
+        max_waiting_per_guild=int(os.getenv("ytdl_max_waiting_per_guild", admission.MAX_WAITING_PER_GUILD)),
+    ) if ADMISSION_ENABLED else None
+
+    with startup.phase("build sources"):
+        # Cheap: yt-dlp and Plex are loaded by warm_up() once the bot is ready
+        youtube = YouTubeSource(
+            cache_dir=YTDL_CACHE_DIR or None,
+            hedge_after=_env_seconds("ytdl_hedge_after", HEDGE_AFTER),
+            search_deadline=_env_seconds("ytdl_search_deadline", SEARCH_DEADLINE),
+            resolve_deadline=_env_seconds("ytdl_resolve_deadline", RESOLVE_DEADLINE),
+            admission=admission_control,
+        )
+        plex = PlexSource(PLEX_BASE_URL, PLEX_TOKEN) if PLEX_BASE_URL and PLEX_TOKEN else None
+        # Slow YouTube resolves race a matching track from the Plex library
+        youtube.set_fallback(plex)
+    with startup.phase("open state store"):
+        # Empty state_path disables warm restarts
+        state_store = PlayerStateStore(STATE_PATH) if STATE_PATH else None
+    with startup.phase("open loudness store"):
+        loudness_store = LoudnessStore(LOUDNESS_PATH) if LOUDNESS_PATH else None
+        loudness = LoudnessNormaliser(loudness_store) if loudness_store else None
+    seeker = RangeSeeker() if SEEK_INDEX_ENABLED else None
+
+    async def warm_up():
+        """Load source clients in the background so the first .play doesn't pay for it."""
+        for source in filter(None, (youtube, plex)):
+            with startup.phase(f"warm up {type(source).__name__}"):
+                try:
+                    await source.warm_up()
+                except Exception as e:
+                    log.warning(f"Warm-up of {type(source).__name__} failed: {e}")
+        profile = startup.report()
+        if profile:
+            log.info(profile)
 
     async def setup():
-        await bot.add_cog(MusicCog(bot, youtube))
+        await bot.add_cog(MusicCog(
+            bot, youtube,
+            queue_size=QUEUE_SIZE,
+            guild_queue_sizes=GUILD_QUEUE_SIZES,
+            state_store=state_store,
+            admission=admission_control,
+            loudness=loudness,
+            seeker=seeker,
+        ))
         if plex:
-            await bot.add_cog(PlexCog(bot, plex))
+            await bot.add_cog(PlexCog(bot, plex, admission=admission_control))
         else:
             log.warning("Plex not configured — .plex and .plexsearch commands unavailable.")
 
+    synced = False
+
     @bot.event
     async def on_ready():
+        nonlocal synced
         log.info(f"Logged in as {bot.user} (id={bot.user.id})")
+        if not synced:
+            startup.mark("ready")
+            asyncio.ensure_future(warm_up())
+            synced = True
+            if SYNC_COMMANDS:
+                # Publish slash command equivalents of the prefix commands
+                try:
+                    app_commands = await bot.tree.sync()
+                    log.info(f"Synced {len(app_commands)} slash command(s)")
+                except discord.HTTPException as e:
+                    log.warning(f"Slash command sync failed: {e}")
         log.info(f"Connected to {len(bot.guilds)} guild(s): {', '.join(g.name for g in bot.guilds)}")
 
     @bot.event
     async def on_command_error(ctx, error):
-        # Unwrap the discord.py wrapper to get the real exception
-        if isinstance(error, discord.ext.commands.CommandInvokeError):
+        # Unwrap the discord.py wrappers to get the real exception
+        # (slash invocations of hybrid commands add a HybridCommandError layer)
+        if isinstance(error, discord.ext.commands.HybridCommandError):
+            error = error.original
+        if isinstance(error, (discord.ext.commands.CommandInvokeError, discord.app_commands.CommandInvokeError)):
             error = error.original
 
         if isinstance(error, discord.ext.commands.CommandNotFound):
@@ -69,6 +206,10 @@ def run_bot():
             await ctx.send(f"That doesn't look right. Try **.commands** for usage info.")
             return
 
+        if isinstance(error, AdmissionRejected):
+            await ctx.send(str(error), delete_after=max(5.0, error.retry_after))
+            return
+
         if isinstance(error, discord.ext.commands.CheckFailure):
             await ctx.send("You don't have permission to use that command.")
             return
@@ -80,11 +221,21 @@ def run_bot():
         )
         await ctx.send("Something went wrong. Try again in a moment.")
 
-    import asyncio
-
     async def main():
-        async with bot:
-            await setup()
-            await bot.start(TOKEN)
+        try:
+            async with bot:
+                with startup.phase("add cogs"):
+                    await setup()
+                if METRICS_PORT:
+                    await serve_metrics(METRICS_PORT)
+                await bot.start(TOKEN)
+        finally:
+            # The bot has closed and unloaded its cogs: nothing writes any more
+            if state_store:
+                state_store.close()
+            if loudness_store:
+                loudness_store.close()
+            if seeker:
+                await seeker.close()
 
     asyncio.run(main())
\ No newline at end of file
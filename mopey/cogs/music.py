@@ -5,28 +5,123 @@ Commands are thin: they validate input, get/create the GuildPlayer,
 and delegate to it. No business logic lives here.
 """
 
+import asyncio
+
 import discord
+from discord import app_commands
 from discord.ext import commands, tasks
 
-from ..core.player import GuildPlayer
+from ..core.admission import AdmissionController, AdmissionRejected, scope as admission_scope
+from ..core.audio_tracker import TRACKER
+from ..core.federated import FederatedSearch, FederatedResult
+from ..core.filters import FilterSettings, VOLUME_RANGE, BASS_RANGE, SPEED_RANGE
+from ..core.hedge import DeadlineExceeded
+from ..core.idle import IdleScheduler
+from ..core.loudness import LoudnessNormaliser
+from ..core.player import GuildPlayer, INACTIVITY_LIMIT
+from ..core.presence import PresenceManager
+from ..core.queue import MAX_QUEUE_SIZE
+from ..core.seek_index import RangeSeeker
 from ..core.sources import AudioSource, YouTubeSource, VideoUnavailableError
 from ..core.song import Song
-from ..ui.now_playing import send_now_playing
-from ..ui.search_menu import show_search_results
+from ..core.state_store import PlayerStateStore, stream_url_expired
+from ..core.track_index import TrackIndex, choice_label, MAX_CHOICE_LENGTH
+from ..ui.controls import PlaybackControls
+from ..ui.now_playing import NowPlayingBoard
+from ..ui.search_menu import show_search_results, show_streaming_results
 from ..utils.formatting import format_time, format_song_line
+from ..utils import tracing
 from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
 
 log = get_logger(__name__)
 
+# Message/interaction creation to voice_client.play(), i.e. what the user waits for
+REQUEST_TO_AUDIO_SECONDS = REGISTRY.histogram(
+    "mopey_request_to_audio_seconds", "Command sent to audio starting", ["source"],
+    buckets=(0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 20.0, 30.0),
+)
+
+RECENT_INDEX_SIZE = 2_000   # recent YouTube results kept for /play autocomplete
+SEARCH_RESULTS = 5          # results shown by .search (each costs a yt-dlp extraction)
+PERSIST_INTERVAL = 5        # seconds between state snapshots
+COMPACT_EVERY = 120         # compact the state store every N snapshot ticks (~10 min)
+RATE_LIMITED_COMMANDS = {"play", "search", "searchall"}  # charged by admission control
+
+
+def _request_age(ctx) -> float:
+    """Seconds since the invoking message or interaction was created (from its snowflake)."""
+    source_id = ctx.interaction.id if ctx.interaction else ctx.message.id
+    return (discord.utils.utcnow() - discord.utils.snowflake_time(source_id)).total_seconds()
+
 
 class MusicCog(commands.Cog, name="MusicCog"):
 
-    def __init__(self, bot: commands.Bot, youtube: YouTubeSource):
+    def __init__(
+        self,
+        bot: commands.Bot,
+        youtube: YouTubeSource,
+        queue_size: int = MAX_QUEUE_SIZE,
+        guild_queue_sizes: dict[int, int] | None = None,
+        state_store: PlayerStateStore | None = None,
+        admission: AdmissionController | None = None,
+        loudness: LoudnessNormaliser | None = None,
+        seeker: RangeSeeker | None = None,
+    ):
         self.bot = bot
         self._youtube = youtube
+        # Rate limits for the commands that hit YouTube (optional)
+        self._admission = admission
+        # Per-track loudness normalisation (optional)
+        self._loudness = loudness
+        # Byte-offset seeks into long streams (optional)
+        self._seeker = seeker
         self._players: dict[int, GuildPlayer] = {}
+        # Queue capacity: a default for every guild, overridable per guild
+        self._queue_size = queue_size
+        self._guild_queue_sizes: dict[int, int] = dict(guild_queue_sizes or {})
         # Track which source a player is currently using so UI buttons can seek
         self._player_sources: dict[int, AudioSource] = {}
+        # All known sources by class name, so restored players get their source back
+        self._sources: dict[str, AudioSource] = {}
+        self.register_source(youtube)
+
+        # Recent YouTube results, answering /play autocomplete without yt-dlp
+        self._recent = TrackIndex(max_size=RECENT_INDEX_SIZE)
+
+        # One persistent controls view shared by every Now Playing message,
+        # and one live, edited-in-place Now Playing message per guild
+        self._controls = PlaybackControls(bot)
+        self._now_playing = NowPlayingBoard(bot, controls=self._controls)
+
+        # Aggregates every player's "now playing" into one bot presence
+        self._presence = PresenceManager(bot)
+
+        # Fires once per guild when its inactivity deadline passes
+        self._idle = IdleScheduler(INACTIVITY_LIMIT, self._on_player_idle)
+
+        # Every player's ffmpeg processes, with a periodic audit reaping leaked ones
+        self._audio_tracker = TRACKER
+
+        # Warm-restart persistence (optional)
+        self._state_store = state_store
+        self._persisted_keys: dict[int, tuple] = {}
+        self._restored = False
+
+        REGISTRY.gauge(
+            "mopey_players", "Guild players by state", ["state"]
+        ).set_callback(self._player_counts)
+        REGISTRY.gauge(
+            "mopey_queued_songs", "Songs waiting in all guild queues"
+        ).set_callback(lambda: {(): sum(len(p.queue) for p in self._players.values())})
+
+    def _player_counts(self) -> dict:
+        players = list(self._players.values())
+        return {
+            ("total",): len(players),
+            ("connected",): sum(1 for p in players if p.is_connected),
+            ("playing",): sum(1 for p in players if p.is_playing),
+        }
 
     # ------------------------------------------------------------------
     # Player management
@@ -37,12 +132,60 @@ class MusicCog(commands.Cog, name="MusicCog"):
 
     def get_or_create_player(self, guild_id: int) -> GuildPlayer:
         if guild_id not in self._players:
-            self._players[guild_id] = GuildPlayer(guild_id, self.bot)
+            self._players[guild_id] = GuildPlayer(
+                guild_id, self.bot,
+                max_queue_size=self.queue_size_for(guild_id),
+                idle=self._idle,
+                on_track_change=self._now_playing.track_changed,
+                presence=self._presence,
+                loudness=self._loudness,
+                seeker=self._seeker,
+                tracker=self._audio_tracker,
+            )
         return self._players[guild_id]
 
+    def queue_size_for(self, guild_id: int) -> int:
+        return self._guild_queue_sizes.get(guild_id, self._queue_size)
+
+    def set_queue_size(self, guild_id: int, size: int) -> None:
+        """Change a guild's queue capacity, applying it to a live player too."""
+        self._guild_queue_sizes[guild_id] = size
+        player = self.get_player(guild_id)
+        if player:
+            player.queue.resize(size)
+
     def get_source_for_player(self, player: GuildPlayer) -> AudioSource:
         return self._player_sources.get(player.guild_id, self._youtube)
 
+    def register_source(self, source: AudioSource) -> None:
+        """Make a source available for restoring players after a restart."""
+        self._sources[type(source).__name__] = source
+
+    def refresh_now_playing(self, player: GuildPlayer) -> None:
+        """Request a (coalesced) edit of the guild's live Now Playing message."""
+        self._now_playing.refresh(player)
+
+    async def stop_player(self, guild_id: int) -> bool:
+        """Disconnect and forget a guild's player. Returns False if there was none."""
+        player = self.get_player(guild_id)
+        if not player:
+            return False
+        await player.disconnect()
+        self._remove_player(guild_id)
+        return True
+
+    def _remove_player(self, guild_id: int) -> None:
+        """Forget a player that has stopped, including its persisted state."""
+        player = self._players.pop(guild_id, None)
+        if player:
+            self._now_playing.refresh(player)  # freezes the live message as "nothing playing"
+        self._player_sources.pop(guild_id, None)
+        self._idle.cancel(guild_id)
+        self._presence.clear(guild_id)
+        self._persisted_keys.pop(guild_id, None)
+        if self._state_store:
+            self._state_store.submit([(guild_id, "clear", None)])
+
     async def _ensure_connected(self, ctx) -> GuildPlayer | None:
         """
         Get or create a player for this guild, connecting to the user's voice
@@ -64,12 +207,17 @@ class MusicCog(commands.Cog, name="MusicCog"):
     async def _play_or_queue(
         self, ctx, song: Song, source: AudioSource
     ) -> None:
-        player = await self._ensure_connected(ctx)
+        with tracing.span("ensure_connected"):
+            player = await self._ensure_connected(ctx)
         if not player:
             return
 
         user = f"{ctx.author.name}#{ctx.author.discriminator}"
         if player.is_playing:
+            if song in player.queue:
+                log.info(f"[guild={ctx.guild.id}] Already queued, rejected: {song.title!r} (user={user})")
+                await ctx.send("That song is already in the queue.")
+                return
             if player.queue.is_full():
                 log.warning(f"[guild={ctx.guild.id}] Queue full, rejected: {song.title!r} (user={user})")
                 await ctx.send("The queue is full. Please wait for some songs to finish.")
@@ -78,50 +226,166 @@ class MusicCog(commands.Cog, name="MusicCog"):
             player.queue.add(song)
             position = len(player.queue)
             log.info(f"[guild={ctx.guild.id}] Queued at #{position}: {song.title!r} (user={user})")
+            tracing.event("queued", position=position)
             line = format_song_line(song.title, song.duration, song.artist, song.album)
             embed = discord.Embed(title="Added to Queue", color=discord.Color.blurple())
             embed.add_field(name="\u200b", value=line, inline=False)
             embed.set_footer(text=f"Position: {position}")
             await ctx.send(embed=embed)
+            self._now_playing.refresh(player)
             # If this is the first song in the queue, prefetch it immediately
             if was_empty:
                 player._schedule_prefetch(source)
         else:
             log.info(f"[guild={ctx.guild.id}] Playing immediately: {song.title!r} (user={user})")
             self._player_sources[ctx.guild.id] = source
+            self.register_source(source)
             await player.play_song(song, source, ctx)
-            await send_now_playing(ctx, player, self.bot)
+            # play_song recovers from failures itself; only time requests that actually started
+            if player.current_song and player.current_song.link == song.link:
+                REQUEST_TO_AUDIO_SECONDS.observe(
+                    _request_age(ctx), source=type(source).__name__
+                )
+            await self._now_playing.post(ctx, player)
 
     # ------------------------------------------------------------------
-    # Inactivity loop
+    # Inactivity
     # ------------------------------------------------------------------
 
-    @tasks.loop(seconds=120)
-    async def _inactivity_check(self):
+    async def _on_player_idle(self, guild_id: int) -> None:
+        """Called by the IdleScheduler when a guild's inactivity deadline passes."""
+        player = self.get_player(guild_id)
+        if not player:
+            return
+        # A player that's still playing re-arms its own deadline here
+        if await player.check_inactivity():
+            log.info(f"[guild={guild_id}] Inactive for {INACTIVITY_LIMIT}s, removed player")
+            self._remove_player(guild_id)
+
+    # ------------------------------------------------------------------
+    # Warm-restart persistence
+    # ------------------------------------------------------------------
+
+    def _snapshot_rows(self) -> list[tuple]:
+        """
+        Build the rows to persist this tick: a full state row for players whose
+        structure changed since the last save, and a tiny position row for
+        players that are simply still playing.
+        """
+        rows = []
+        for guild_id, player in list(self._players.items()):
+            source_name = type(self.get_source_for_player(player)).__name__
+            key = player.snapshot_key() + (source_name,)
+            if self._persisted_keys.get(guild_id) != key:
+                state = player.snapshot()
+                state["source"] = source_name
+                rows.append((guild_id, "state", state))
+                self._persisted_keys[guild_id] = key
+            elif player.is_playing:
+                rows.append((guild_id, "position", {"position": float(player.elapsed)}))
+        return rows
+
+    @tasks.loop(seconds=PERSIST_INTERVAL)
+    async def _persist_state(self):
         try:
-            for player in list(self._players.values()):
-                disconnected = await player.check_inactivity()
-                if disconnected:
-                    del self._players[player.guild_id]
+            rows = self._snapshot_rows()
+            if rows:
+                await asyncio.wrap_future(self._state_store.submit(rows))
+            if self._persist_state.current_loop % COMPACT_EVERY == COMPACT_EVERY - 1:
+                await asyncio.get_event_loop().run_in_executor(None, self._state_store.compact)
         except Exception as e:
-            log.error(f"Error in inactivity check loop: {e}", exc_info=True)
+            log.error(f"Error persisting player state: {e}", exc_info=True)
 
-    @_inactivity_check.error
-    async def _inactivity_check_error(self, error):
-        # If the task itself crashes, log it and restart
-        log.error(f"Inactivity check task crashed, restarting: {error}", exc_info=True)
-        self._inactivity_check.restart()
+    async def _restore_players(self) -> None:
+        """Recreate players saved before the last shutdown/crash and resume playback."""
+        loop = asyncio.get_event_loop()
+        states = await loop.run_in_executor(None, self._state_store.load_all)
+        if not states:
+            return
+        log.info(f"Restoring {len(states)} player(s) from saved state")
+        for guild_id, state in states.items():
+            try:
+                await self._restore_player(guild_id, state)
+            except Exception as e:
+                log.error(f"[guild={guild_id}] Failed to restore player: {e}", exc_info=True)
+                self._remove_player(guild_id)
+
+    async def _restore_player(self, guild_id: int, state: dict) -> None:
+        guild = self.bot.get_guild(guild_id)
+        voice_channel = guild.get_channel(state.get("voice_channel_id") or 0) if guild else None
+        text_channel = guild.get_channel(state.get("text_channel_id") or 0) if guild else None
+        current = Song.from_dict(state["current"]) if state.get("current") else None
+        queued = [Song.from_dict(d) for d in state.get("queue", [])]
+
+        if not isinstance(voice_channel, discord.abc.Connectable) or (current is None and not queued):
+            log.info(f"[guild={guild_id}] Saved state not restorable, discarding")
+            self._state_store.submit([(guild_id, "clear", None)])
+            return
+
+        source = self._sources.get(state.get("source"), self._youtube)
+        player = self.get_or_create_player(guild_id)
+        if state.get("filters"):
+            player.filters = FilterSettings(**state["filters"])
+        for song in queued:
+            player.queue.add(song)
+        if text_channel:
+            player.update_activity(text_channel)
+
+        await player.connect(voice_channel)
+        self._player_sources[guild_id] = source
+
+        position = float(state.get("position", 0.0))
+        if current is None:
+            current, position = player.queue.pop_next(), 0.0
+
+        # A still-valid saved URL means the restart doesn't pay for a re-resolve
+        preresolved = not stream_url_expired(current.url)
+        log.info(
+            f"[guild={guild_id}] Restoring {current.title!r} at {position:.0f}s "
+            f"({len(player.queue)} queued, preresolved={preresolved})"
+        )
+        await player.play_song(current, source, text_channel, start_at=position, preresolved=preresolved)
+        if state.get("paused"):
+            player.pause()
+        if text_channel and player.current_song:
+            await self._now_playing.post(text_channel, player)
+
+    async def cog_load(self):
+        # Registered once: routes button presses on every Now Playing message,
+        # including ones sent before a restart
+        self.bot.add_view(self._controls)
+
+    async def cog_before_invoke(self, ctx):
+        if ctx.guild is None:
+            return
+        admission_scope(ctx.guild.id)
+        if self._admission and ctx.command.name in RATE_LIMITED_COMMANDS:
+            self._admission.admit(ctx)
+
+    def cog_unload(self):
+        self._idle.stop()
+        self._now_playing.stop()
+        self._presence.stop()
+        self._audio_tracker.stop()
+        if self._persist_state.is_running():
+            self._persist_state.cancel()
 
     @commands.Cog.listener()
     async def on_ready(self):
-        if not self._inactivity_check.is_running():
-            self._inactivity_check.start()
+        self._idle.start()
+        self._now_playing.start()
+        self._presence.start()
+        self._audio_tracker.start()
+        if self._state_store and not self._restored:
+            self._restored = True
+            await self._restore_players()
+            self._persist_state.start()
 
     # ------------------------------------------------------------------
     # Commands
     # ------------------------------------------------------------------
 
-    @commands.command(name="join")
+    @commands.hybrid_command(name="join")
     async def join(self, ctx):
         """Join the user's current voice channel."""
         player = self.get_or_create_player(ctx.guild.id)
@@ -138,7 +402,8 @@ class MusicCog(commands.Cog, name="MusicCog"):
         player.update_activity(ctx.channel)
         await ctx.send("Connected to the voice channel!")
 
-    @commands.command(name="play")
+    @commands.hybrid_command(name="play")
+    @app_commands.describe(link="YouTube URL or search terms (leave empty to resume)")
     async def play(self, ctx, *, link: str = None):
         """
         Play a song by YouTube URL/search query, or resume if paused.
@@ -148,51 +413,66 @@ class MusicCog(commands.Cog, name="MusicCog"):
             player = self.get_player(ctx.guild.id)
             if player and player.is_paused:
                 player.resume()
+                self._now_playing.refresh(player)
                 await ctx.send("Resumed the music!")
             else:
                 await ctx.send("No music is currently paused to resume.")
             return
 
         log.info(f"[guild={ctx.guild.id}] .play invoked by {ctx.author.name}: {link!r}")
-        loading_msg = await ctx.send("Loading...")
-        try:
-            is_url = link.startswith("http://") or link.startswith("https://")
-            songs = await self._youtube.search(link, limit=1 if is_url else 3)
-            if not songs:
-                log.warning(f"[guild={ctx.guild.id}] No results for: {link!r}")
-                await loading_msg.delete()
-                await ctx.send("Couldn't find anything for that. Try a different search or URL.")
-                return
-
-            if is_url:
-                await loading_msg.delete()
-                await self._play_or_queue(ctx, songs[0], self._youtube)
-            else:
-                for i, song in enumerate(songs):
-                    try:
-                        await loading_msg.delete()
-                        await self._play_or_queue(ctx, song, self._youtube)
-                        return
-                    except Exception as e:
-                        log.warning(
-                            f"[guild={ctx.guild.id}] Result {i + 1} unavailable "
-                            f"({song.title!r}): {e}"
-                        )
-                        continue
-                await ctx.send("Couldn't find an available version of that. Try a different search.")
-
-        except VideoUnavailableError as e:
-            await loading_msg.delete()
-            await ctx.send(str(e))
-        except Exception as e:
-            log.error(f"[guild={ctx.guild.id}] Error in .play ({link!r}): {e}", exc_info=True)
-            await loading_msg.delete()
-            await ctx.send("Something went wrong loading that song. Try again in a moment.")
+        # Slash invocations get a deferred response (no-op for prefix commands)
+        with tracing.trace("play", guild=ctx.guild.id, query=link, request_age=_request_age(ctx)):
+            await ctx.defer()
+            try:
+                is_url = link.startswith("http://") or link.startswith("https://")
+                songs = await self._youtube.search(link, limit=1 if is_url else 3)
+                if not songs:
+                    log.warning(f"[guild={ctx.guild.id}] No results for: {link!r}")
+                    await ctx.send("Couldn't find anything for that. Try a different search or URL.")
+                    return
+                self._recent.add_many(songs)
+
+                if is_url:
+                    await self._play_or_queue(ctx, songs[0], self._youtube)
+                else:
+                    for i, song in enumerate(songs):
+                        try:
+                            await self._play_or_queue(ctx, song, self._youtube)
+                            return
+                        except Exception as e:
+                            log.warning(
+                                f"[guild={ctx.guild.id}] Result {i + 1} unavailable "
+                                f"({song.title!r}): {e}"
+                            )
+                            continue
+                    await ctx.send("Couldn't find an available version of that. Try a different search.")
+
+            except VideoUnavailableError as e:
+                await ctx.send(str(e))
+            except AdmissionRejected as e:
+                await ctx.send(str(e))
+            except DeadlineExceeded as e:
+                log.warning(f"[guild={ctx.guild.id}] .play gave up ({link!r}): {e}")
+                await ctx.send("YouTube is taking too long to respond. Try again in a moment.")
+            except Exception as e:
+                log.error(f"[guild={ctx.guild.id}] Error in .play ({link!r}): {e}", exc_info=True)
+                await ctx.send("Something went wrong loading that song. Try again in a moment.")
+
+    @play.autocomplete("link")
+    async def play_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Suggest recently seen YouTube tracks; answered from memory only."""
+        if current.startswith("http://") or current.startswith("https://"):
+            return []
+        return [
+            app_commands.Choice(name=choice_label(song), value=song.link)
+            for song in self._recent.search(current)
+            if len(song.link) <= MAX_CHOICE_LENGTH
+        ]
 
-    @commands.command(name="search")
+    @commands.hybrid_command(name="search")
     async def search(self, ctx, *, query: str = None):
         """
-        Search YouTube and pick from the top 3 results.
+        Search YouTube and pick from the top results.
         Usage: .search <query>
         """
         if not query:
@@ -200,29 +480,82 @@ class MusicCog(commands.Cog, name="MusicCog"):
             return
 
         log.info(f"[guild={ctx.guild.id}] .search invoked by {ctx.author.name}: {query!r}")
-        searching_msg = await ctx.send("Searching...")
-        try:
-            songs = await self._youtube.search(query, limit=3)
-            await searching_msg.delete()
-            chosen = await show_search_results(ctx, songs, title="YouTube Search Results")
-            if chosen:
-                log.info(f"[guild={ctx.guild.id}] Search selection: {chosen.title!r} (user={ctx.author.name})")
-                await self._play_or_queue(ctx, chosen, self._youtube)
-        except Exception as e:
-            log.error(f"[guild={ctx.guild.id}] Error in .search ({query!r}): {e}", exc_info=True)
-            await searching_msg.delete()
-            await ctx.send("Search failed. Try again in a moment.")
+        with tracing.trace("search", guild=ctx.guild.id, query=query, request_age=_request_age(ctx)):
+            await ctx.defer()
+            try:
+                songs = await self._youtube.search(query, limit=SEARCH_RESULTS)
+                self._recent.add_many(songs)
+                chosen = await show_search_results(ctx, songs, title="YouTube Search Results")
+                if chosen:
+                    log.info(f"[guild={ctx.guild.id}] Search selection: {chosen.title!r} (user={ctx.author.name})")
+                    await self._play_or_queue(ctx, chosen, self._youtube)
+            except AdmissionRejected as e:
+                await ctx.send(str(e))
+            except DeadlineExceeded as e:
+                log.warning(f"[guild={ctx.guild.id}] .search gave up ({query!r}): {e}")
+                await ctx.send("YouTube is taking too long to respond. Try again in a moment.")
+            except Exception as e:
+                log.error(f"[guild={ctx.guild.id}] Error in .search ({query!r}): {e}", exc_info=True)
+                await ctx.send("Search failed. Try again in a moment.")
+
+    @commands.hybrid_command(name="searchall")
+    @app_commands.describe(query="Search terms, looked up on every configured source")
+    async def searchall(self, ctx, *, query: str = None):
+        """
+        Search every source at once (YouTube, Plex, ...) and pick from merged results.
+        Usage: .searchall <query>
+        """
+        if not query:
+            await ctx.send("Please provide a search query.")
+            return
 
-    @commands.command(name="playing")
+        log.info(f"[guild={ctx.guild.id}] .searchall invoked by {ctx.author.name}: {query!r}")
+        with tracing.trace("searchall", guild=ctx.guild.id, query=query, request_age=_request_age(ctx)):
+            await ctx.defer()
+            sources = {
+                type(source).__name__.removesuffix("Source"): source
+                for source in self._sources.values()
+            }
+            origin: dict[int, FederatedResult] = {}  # id(song) -> where it came from
+
+            async def songs_as_they_arrive():
+                async for results, pending in FederatedSearch(sources).stream(query):
+                    for result in results:
+                        origin[id(result.song)] = result
+                    self._recent.add_many(r.song for r in results if r.source is self._youtube)
+                    yield [r.song for r in results], pending
+
+            try:
+                chosen = await show_streaming_results(
+                    ctx,
+                    songs_as_they_arrive(),
+                    title="Search Results",
+                    color=discord.Color.dark_teal(),
+                    tag=lambda song: origin[id(song)].source_name,
+                    searching=tuple(sources),
+                )
+                if chosen:
+                    result = origin[id(chosen)]
+                    log.info(
+                        f"[guild={ctx.guild.id}] Federated selection [{result.source_name}]: "
+                        f"{chosen.title!r} (user={ctx.author.name})"
+                    )
+                    await self._play_or_queue(ctx, chosen, result.source)
+            except Exception as e:
+                log.error(f"[guild={ctx.guild.id}] Error in .searchall ({query!r}): {e}", exc_info=True)
+                await ctx.send("Search failed. Try again in a moment.")
+
+    @commands.hybrid_command(name="playing")
     async def playing(self, ctx):
         """Show the currently playing song."""
         player = self.get_player(ctx.guild.id)
         if not player or not player.current_song:
             await ctx.send("No song is currently playing.")
             return
-        await send_now_playing(ctx, player, self.bot)
+        # Re-post at the bottom of the channel; the old live message is retired
+        await self._now_playing.post(ctx, player)
 
-    @commands.command(name="queue")
+    @commands.hybrid_command(name="queue")
     async def queue(self, ctx):
         """Show the current queue."""
         player = self.get_player(ctx.guild.id)
@@ -263,7 +596,7 @@ class MusicCog(commands.Cog, name="MusicCog"):
 
         await ctx.send(embed=embed)
 
-    @commands.command(name="clear")
+    @commands.hybrid_command(name="clear")
     async def clear(self, ctx):
         """Clear the queue."""
         player = self.get_player(ctx.guild.id)
@@ -271,9 +604,10 @@ class MusicCog(commands.Cog, name="MusicCog"):
             await ctx.send("There is no queue to clear.")
             return
         player.queue.clear()
+        self._now_playing.refresh(player)
         await ctx.send("Queue cleared!")
 
-    @commands.command(name="remove")
+    @commands.hybrid_command(name="remove")
     async def remove(self, ctx, position: int = 0):
         """Remove a song from the queue by position. Usage: .remove <position>"""
         player = self.get_player(ctx.guild.id)
@@ -282,12 +616,13 @@ class MusicCog(commands.Cog, name="MusicCog"):
             return
         removed = player.queue.remove_at(position)
         if removed:
+            self._now_playing.refresh(player)
             line = format_song_line(removed.title, removed.duration)
             await ctx.send(f"Removed: **{line}** from the queue.")
         else:
             await ctx.send("Invalid position. Please provide a valid number within the queue.")
 
-    @commands.command(name="playqueue")
+    @commands.hybrid_command(name="playqueue")
     async def playqueue(self, ctx, position: int = 0):
         """Jump to a specific song in the queue. Usage: .playqueue <position>"""
         player = self.get_player(ctx.guild.id)
@@ -303,40 +638,39 @@ class MusicCog(commands.Cog, name="MusicCog"):
                 source = self.get_source_for_player(player)
                 await player.play_song(song, source, ctx)
                 player.queue.pop_next()  # remove it since we played it directly
-                await send_now_playing(ctx, player, self.bot)
+                self._now_playing.refresh(player)
         else:
             await ctx.send("Invalid position. Please provide a valid number within the queue.")
 
-    @commands.command(name="pause")
+    @commands.hybrid_command(name="pause")
     async def pause(self, ctx):
         """Pause the currently playing song."""
         player = self.get_player(ctx.guild.id)
         if player and player.pause():
+            self._now_playing.refresh(player)
             await ctx.send("Music paused!")
         else:
             await ctx.send("Nothing is currently playing.")
 
-    @commands.command(name="resume")
+    @commands.hybrid_command(name="resume")
     async def resume(self, ctx):
         """Resume the paused song."""
         player = self.get_player(ctx.guild.id)
         if player and player.resume():
+            self._now_playing.refresh(player)
             await ctx.send("Music resumed!")
         else:
             await ctx.send("Nothing is currently paused.")
 
-    @commands.command(name="stop")
+    @commands.hybrid_command(name="stop")
     async def stop(self, ctx):
         """Stop playback and disconnect."""
-        player = self.get_player(ctx.guild.id)
-        if player:
-            await player.disconnect()
-            del self._players[ctx.guild.id]
+        if await self.stop_player(ctx.guild.id):
             await ctx.send("Music stopped and disconnected.")
         else:
             await ctx.send("I'm not connected to a voice channel.")
 
-    @commands.command(name="skip")
+    @commands.hybrid_command(name="skip")
     async def skip(self, ctx):
         """Skip the current song."""
         player = self.get_player(ctx.guild.id)
@@ -354,7 +688,7 @@ class MusicCog(commands.Cog, name="MusicCog"):
             await player.skip()
             await ctx.send("Song skipped, now playing next in the queue.")
 
-    @commands.command(name="seek")
+    @commands.hybrid_command(name="seek")
     async def seek(self, ctx, seconds: int):
         """
         Seek forward or backward in the current song.
@@ -374,15 +708,61 @@ class MusicCog(commands.Cog, name="MusicCog"):
             else:
                 await ctx.send("Cannot seek beyond the length of the song.")
         elif int(new_pos) == 0:
+            self._now_playing.refresh(player)
             await ctx.send("Restarting song.")
         else:
+            self._now_playing.refresh(player)
             await ctx.send(f"Seeked to {format_time(int(new_pos))}.")
 
-    @commands.command(name="commands")
+    async def _set_filter(self, ctx, name: str, value, valid: tuple, describe) -> None:
+        """Shared body of .volume/.bass/.speed: show the setting, or validate and apply a new one."""
+        player = self.get_player(ctx.guild.id)
+        if not player or not player.is_connected:
+            await ctx.send("I'm not connected to a voice channel.")
+            return
+        if value is None:
+            await ctx.send(f"{name.capitalize()} is {describe(getattr(player.filters, name))}.")
+            return
+        low, high = valid
+        if not low <= value <= high:
+            await ctx.send(f"{name.capitalize()} must be between {low:g} and {high:g}.")
+            return
+        player.set_filters(**{name: value})
+        await ctx.send(f"{name.capitalize()} set to {describe(value)}.")
+
+    @commands.hybrid_command(name="volume")
+    @app_commands.describe(percent="0-200 (leave empty to show the current volume)")
+    async def volume(self, ctx, percent: int = None):
+        """
+        Show or set the playback volume, applied without interrupting the song.
+        Usage: .volume [0-200]
+        """
+        await self._set_filter(ctx, "volume", percent, VOLUME_RANGE, lambda v: f"{v}%")
+
+    @commands.hybrid_command(name="bass")
+    @app_commands.describe(db="Boost in dB, 0-20 (0 turns it off)")
+    async def bass(self, ctx, db: float = None):
+        """
+        Show or set the bass boost.
+        Usage: .bass [0-20]
+        """
+        await self._set_filter(ctx, "bass", db, BASS_RANGE, lambda v: f"+{v:g} dB" if v else "off")
+
+    @commands.hybrid_command(name="speed")
+    @app_commands.describe(factor="Playback speed, 0.5-2.0 (pitch is kept)")
+    async def speed(self, ctx, factor: float = None):
+        """
+        Show or set the playback speed.
+        Usage: .speed [0.5-2.0]
+        """
+        await self._set_filter(ctx, "speed", factor, SPEED_RANGE, lambda v: f"{v:g}x")
+
+    @commands.hybrid_command(name="commands")
     async def commands_list(self, ctx):
         """Show all available commands."""
         embed = discord.Embed(title="Available Commands", color=discord.Color.blurple())
         command_list = [
+            ("**.bass [dB]**",          "Show or set the bass boost (0-20 dB)"),
             ("**.clear**",              "Clear the entire queue"),
             ("**.commands**",           "Show this list of commands"),
             ("**.join**",               "Join your current voice channel"),
@@ -396,10 +776,14 @@ class MusicCog(commands.Cog, name="MusicCog"):
             ("**.remove <pos>**",       "Remove a song from the queue by position"),
             ("**.resume**",             "Resume the paused song"),
             ("**.search <query>**",     "Search YouTube and pick from results"),
+            ("**.searchall <query>**",  "Search YouTube and Plex together, Plex copies first"),
             ("**.seek <seconds>**",     "Seek forward/backward in the current song"),
             ("**.skip**",               "Skip the current song"),
+            ("**.speed [factor]**",     "Show or set the playback speed (0.5-2.0)"),
             ("**.stop**",               "Stop and disconnect"),
+            ("**.volume [percent]**",   "Show or set the volume (0-200%)"),
         ]
         for name, description in command_list:
             embed.add_field(name=name, value=description, inline=False)
+        embed.set_footer(text="Every command is also available as a / slash command.")
         await ctx.send(embed=embed)
\ No newline at end of file
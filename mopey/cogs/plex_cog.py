@@ -5,27 +5,72 @@ Completely separate from MusicCog. Delegates play/queue logic back
 to MusicCog so we don't duplicate it.
 """
 
+import asyncio
+
+from discord import app_commands
 from discord.ext import commands
 
+from ..core.admission import AdmissionController, scope as admission_scope
 from ..core.sources import PlexSource
+from ..core.track_index import TrackIndex, choice_label
 from ..ui.search_menu import show_search_results
+from ..utils import tracing
 from ..utils.log import get_logger
 import discord
 
 log = get_logger(__name__)
 
+PLEX_SEARCH_RESULTS = 10  # Plex searches are cheap; the picker pages through these
+PLEX_INDEX_SIZE = 50_000  # library tracks kept in memory for /plex autocomplete
+RATE_LIMITED_COMMANDS = {"plex", "plexsearch"}
+
 
 class PlexCog(commands.Cog, name="PlexCog"):
 
-    def __init__(self, bot: commands.Bot, plex: PlexSource):
+    def __init__(self, bot: commands.Bot, plex: PlexSource, admission: AdmissionController | None = None):
         self.bot = bot
         self._plex = plex
+        self._admission = admission
+        # Local copy of the library so /plex autocomplete never waits on Plex
+        self._index = TrackIndex(max_size=PLEX_INDEX_SIZE)
+        self._index_task: asyncio.Task | None = None
 
     def _music_cog(self):
         """Get the MusicCog to delegate play/queue logic."""
         return self.bot.cogs.get("MusicCog")
 
-    @commands.command(name="plex")
+    async def cog_load(self):
+        # Let MusicCog hand Plex players their source back after a restart
+        music = self._music_cog()
+        if music:
+            music.register_source(self._plex)
+
+    def cog_unload(self):
+        if self._index_task:
+            self._index_task.cancel()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Not in cog_load: listing tracks imports plexapi and connects to Plex,
+        # which shouldn't hold up logging in
+        if self._index_task is None:
+            self._index_task = asyncio.ensure_future(self._load_index())
+
+    async def cog_before_invoke(self, ctx):
+        if ctx.guild is None:
+            return
+        admission_scope(ctx.guild.id)
+        if self._admission and ctx.command.name in RATE_LIMITED_COMMANDS:
+            self._admission.admit(ctx)
+
+    async def _load_index(self) -> None:
+        try:
+            self._index.add_many(await self._plex.list_tracks(PLEX_INDEX_SIZE))
+            log.info(f"Plex autocomplete index ready ({len(self._index)} tracks)")
+        except Exception as e:
+            log.warning(f"Couldn't build Plex autocomplete index: {e}")
+
+    @commands.hybrid_command(name="plex")
     async def plex(self, ctx, *, query: str = None):
         """
         Play the first Plex result for a query.
@@ -36,28 +81,39 @@ class PlexCog(commands.Cog, name="PlexCog"):
             return
 
         log.info(f"[guild={ctx.guild.id}] .plex invoked by {ctx.author.name}: {query!r}")
-        await ctx.send(f"Searching Plex for '{query}'...")
-        try:
-            songs = await self._plex.search(query, limit=1)
-            if not songs:
-                await ctx.send("No results found on Plex for that query.")
-                return
+        with tracing.trace("plex", guild=ctx.guild.id, query=query):
+            await ctx.defer()
+            try:
+                # An autocomplete pick names an indexed track exactly — no Plex round trip
+                picked = self._index.lookup(query)
+                songs = [picked] if picked else await self._plex.search(query, limit=1)
+                if not songs:
+                    await ctx.send("No results found on Plex for that query.")
+                    return
+
+                music = self._music_cog()
+                if not music:
+                    await ctx.send("Music system is unavailable.")
+                    return
 
-            music = self._music_cog()
-            if not music:
-                await ctx.send("Music system is unavailable.")
-                return
+                await music._play_or_queue(ctx, songs[0], self._plex)
 
-            await music._play_or_queue(ctx, songs[0], self._plex)
+            except Exception as e:
+                log.error(f"[guild={ctx.guild.id}] Error in .plex ({query!r}): {e}", exc_info=True)
+                await ctx.send("Couldn't reach Plex. Try again in a moment.")
 
-        except Exception as e:
-            log.error(f"[guild={ctx.guild.id}] Error in .plex ({query!r}): {e}", exc_info=True)
-            await ctx.send("Couldn't reach Plex. Try again in a moment.")
+    @plex.autocomplete("query")
+    async def plex_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Suggest library tracks from the in-memory index."""
+        return [
+            app_commands.Choice(name=label, value=label)
+            for label in map(choice_label, self._index.search(current))
+        ]
 
-    @commands.command(name="plexsearch")
+    @commands.hybrid_command(name="plexsearch")
     async def plexsearch(self, ctx, *, query: str = None):
         """
-        Search Plex and pick from the top 3 results.
+        Search Plex and pick from the top results.
         Usage: .plexsearch <query>
         """
         if not query:
@@ -65,23 +121,25 @@ class PlexCog(commands.Cog, name="PlexCog"):
             return
 
         log.info(f"[guild={ctx.guild.id}] .plexsearch invoked by {ctx.author.name}: {query!r}")
-        await ctx.send("Searching Plex...")
-        try:
-            songs = await self._plex.search(query, limit=3)
-            chosen = await show_search_results(
-                ctx,
-                songs,
-                title="Plex Search Results",
-                color=discord.Color.dark_gold(),
-            )
-            if chosen:
-                log.info(f"[guild={ctx.guild.id}] Plex search selection: {chosen.title!r} (user={ctx.author.name})")
-                music = self._music_cog()
-                if not music:
-                    await ctx.send("Music system is unavailable.")
-                    return
-                await music._play_or_queue(ctx, chosen, self._plex)
-
-        except Exception as e:
-            log.error(f"[guild={ctx.guild.id}] Error in .plexsearch ({query!r}): {e}", exc_info=True)
-            await ctx.send("Plex search failed. Try again in a moment.")
\ No newline at end of file
+        with tracing.trace("plexsearch", guild=ctx.guild.id, query=query):
+            await ctx.defer()
+            try:
+                songs = await self._plex.search(query, limit=PLEX_SEARCH_RESULTS)
+                self._index.add_many(songs)
+                chosen = await show_search_results(
+                    ctx,
+                    songs,
+                    title="Plex Search Results",
+                    color=discord.Color.dark_gold(),
+                )
+                if chosen:
+                    log.info(f"[guild={ctx.guild.id}] Plex search selection: {chosen.title!r} (user={ctx.author.name})")
+                    music = self._music_cog()
+                    if not music:
+                        await ctx.send("Music system is unavailable.")
+                        return
+                    await music._play_or_queue(ctx, chosen, self._plex)
+
+            except Exception as e:
+                log.error(f"[guild={ctx.guild.id}] Error in .plexsearch ({query!r}): {e}", exc_info=True)
+                await ctx.send("Plex search failed. Try again in a moment.")
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Admission control for expensive commands and yt-dlp extraction.
+
+Two layers, both owned by one AdmissionController:
+
+  Rate limits (fast rejection) — per-user and per-guild token buckets
+  checked before .play/.search/... run. Over the limit, the command is
+  rejected immediately with AdmissionRejected, telling the user when to
+  retry, rather than queueing work nobody will wait for.
+
+  Extraction budget (fair queueing) — at most `max_extractions` yt-dlp
+  jobs run at once, so a burst can't occupy every executor thread. Callers
+  over the budget wait in per-guild FIFOs served round-robin across guilds,
+  so one busy guild can't starve the others. Playback work (resolving the
+  song about to play, prefetching the next) is served before user searches
+  so transitions stay smooth under load. A guild with too many waiters
+  already gets AdmissionRejected instead of another place in line.
+
+Who is asking is carried in a contextvar: cogs call scope(guild_id) before
+running a command, GuildPlayer calls scope(guild_id, playback=True) before
+resolving, and run_extraction() reads it — so sources don't need a
+guild parameter threaded through every call.
+"""
+
+import asyncio
+import contextvars
+import math
+from collections import OrderedDict, deque
+from typing import Callable, Hashable, Optional, TypeVar
+
+from discord.ext import commands
+
+from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
+from ..utils.ratelimit import TokenBucket
+
+log = get_logger(__name__)
+
+T = TypeVar("T")
+
+USER_RATE = 1 / 6            # sustained: one expensive command per 6 s per user...
+USER_BURST = 5               # ...after a burst of 5
+GUILD_RATE = 0.5             # one every 2 s per guild
+GUILD_BURST = 15
+MAX_EXTRACTIONS = 4          # concurrent yt-dlp jobs for the whole process
+MAX_WAITING_PER_GUILD = 3    # queued extractions per guild before rejecting
+PRUNE_EVERY = 1_000          # checks between sweeps of idle buckets
+
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    "mopey_admission_rejections_total", "Requests rejected by admission control", ["reason"]
+)
+EXTRACTION_WAIT_SECONDS = REGISTRY.histogram(
+    "mopey_extraction_wait_seconds", "Time queued for an extraction slot", ["kind"]
+)
+
+# (guild id or None, is playback work)
+_scope: contextvars.ContextVar[tuple[Optional[int], bool]] = contextvars.ContextVar(
+    "mopey_admission_scope", default=(None, False)
+)
+
+
+def scope(guild_id: Optional[int], playback: bool = False) -> None:
+    """Attribute extractions started from the current task to `guild_id`."""
+    _scope.set((guild_id, playback))
+
+
+class AdmissionRejected(commands.CheckFailure):
+    """A request refused by admission control; `str()` is a user-facing message."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ---------------------------------------------------------------------------
+# Fair extraction gate
+# ---------------------------------------------------------------------------
+
+class FairGate:
+    """
+    A counting semaphore whose waiters are served playback-first, then
+    round-robin across keys (guilds), FIFO within a key.
+    """
+
+    def __init__(self, limit: int, max_waiting_per_key: int):
+        self.limit = limit
+        self.max_waiting_per_key = max_waiting_per_key
+        self.active = 0
+        self._playback: deque[asyncio.Future] = deque()
+        self._waiting: OrderedDict[Hashable, deque[asyncio.Future]] = OrderedDict()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._playback) + sum(len(q) for q in self._waiting.values())
+
+    async def acquire(self, key: Hashable, playback: bool = False) -> None:
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            return
+        if playback:
+            queue = self._playback
+        else:
+            queue = self._waiting.get(key)
+            if queue is None:
+                queue = self._waiting[key] = deque()
+            if len(queue) >= self.max_waiting_per_key:
+                ADMISSION_REJECTIONS.inc(reason="extraction_queue")
+                raise AdmissionRejected("Too many searches are already waiting in this server — try again shortly.")
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await waiter   # release() hands its slot over by resolving this
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()   # the slot arrived as we were cancelled; pass it on
+            else:
+                self._discard(queue, waiter, key)
+            raise
+
+    def release(self) -> None:
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(None)   # the slot moves to the waiter; `active` is unchanged
+        else:
+            self.active -= 1
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        while self._playback:
+            waiter = self._playback.popleft()
+            if not waiter.done():
+                return waiter
+        while self._waiting:
+            key, queue = next(iter(self._waiting.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._waiting.move_to_end(key)   # this guild goes to the back of the round
+            else:
+                del self._waiting[key]
+            if not waiter.done():
+                return waiter
+        return None
+
+    def _discard(self, queue: deque, waiter: asyncio.Future, key: Hashable) -> None:
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if queue is not self._playback and not queue:
+            self._waiting.pop(key, None)
+
+
+# ---------------------------------------------------------------------------
+# Controller
+# ---------------------------------------------------------------------------
+
+class AdmissionController:
+
+    def __init__(
+        self,
+        user_rate: float = USER_RATE,
+        user_burst: float = USER_BURST,
+        guild_rate: float = GUILD_RATE,
+        guild_burst: float = GUILD_BURST,
+        max_extractions: int = MAX_EXTRACTIONS,
+        max_waiting_per_guild: int = MAX_WAITING_PER_GUILD,
+    ):
+        self._user_rate, self._user_burst = user_rate, user_burst
+        self._guild_rate, self._guild_burst = guild_rate, guild_burst
+        self._users: dict[int, TokenBucket] = {}
+        self._guilds: dict[int, TokenBucket] = {}
+        self._checks = 0
+        self.gate = FairGate(max_extractions, max_waiting_per_guild)
+        REGISTRY.gauge(
+            "mopey_extractions", "yt-dlp extraction slots", ["state"]
+        ).set_callback(lambda: {("active",): self.gate.active, ("waiting",): self.gate.waiting})
+
+    def admit(self, ctx: commands.Context) -> None:
+        """
+        Rate-limit a command invocation (call from cog_before_invoke, once
+        arguments are parsed). Invocations without arguments — `.play` to
+        resume — aren't expensive and aren't charged.
+        """
+        if ctx.guild is not None and any(ctx.kwargs.values()):
+            self.check(ctx.guild.id, ctx.author.id)
+
+    def check(self, guild_id: int, user_id: int) -> None:
+        """Spend one token from the user's and the guild's buckets, or raise AdmissionRejected."""
+        self._checks += 1
+        if self._checks % PRUNE_EVERY == 0:
+            self._prune()
+
+        user = self._users.get(user_id)
+        if user is None:
+            user = self._users[user_id] = TokenBucket(self._user_rate, self._user_burst)
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = TokenBucket(self._guild_rate, self._guild_burst)
+
+        # Check both before spending either, so a rejection costs nothing
+        user_wait, guild_wait = user.delay(), guild.delay()
+        if user_wait > 0:
+            ADMISSION_REJECTIONS.inc(reason="user_rate")
+            log.info(f"[guild={guild_id}] Rate limited user {user_id} ({user_wait:.1f}s)")
+            raise AdmissionRejected(f"You're going a bit fast — try again in {math.ceil(user_wait)}s.", user_wait)
+        if guild_wait > 0:
+            ADMISSION_REJECTIONS.inc(reason="guild_rate")
+            log.info(f"[guild={guild_id}] Rate limited guild ({guild_wait:.1f}s)")
+            raise AdmissionRejected(f"This server is sending a lot of requests — try again in {math.ceil(guild_wait)}s.", guild_wait)
+        user.try_acquire()
+        guild.try_acquire()
+
+    async def run_extraction(
+        self, fn: Callable[[], T], kind: str = "extract", on_slot: Optional[Callable[[], None]] = None
+    ) -> T:
+        """
+        Run blocking `fn` in the default executor once an extraction slot is
+        free, queueing fairly for it; `on_slot` is called when it's granted.
+        The slot is held until the thread finishes — even if the caller is
+        cancelled (a hedge loser) and stops waiting — so the budget counts
+        threads actually busy in yt-dlp.
+        """
+        guild_id, playback = _scope.get()
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        await self.gate.acquire(guild_id, playback)
+        EXTRACTION_WAIT_SECONDS.observe(loop.time() - queued_at, kind="playback" if playback else kind)
+        try:
+            if on_slot is not None:
+                on_slot()
+            future = loop.run_in_executor(None, fn)
+        except BaseException:
+            self.gate.release()
+            raise
+        future.add_done_callback(self._extraction_done)
+        return await asyncio.shield(future)
+
+    def _extraction_done(self, future: asyncio.Future) -> None:
+        self.gate.release()
+        if not future.cancelled():
+            future.exception()   # retrieved, in case the caller stopped waiting
+
+    def _prune(self) -> None:
+        """Forget buckets that have refilled completely; they'd be recreated identical."""
+        for buckets in (self._users, self._guilds):
+            for key in [k for k, bucket in buckets.items() if bucket.is_full()]:
+                del buckets[key]
@@ -0,0 +1,66 @@
+"""
+TracedAudio — a pass-through discord.AudioSource that reports when the
+first Opus packet actually leaves for Discord, and how every packet after
+it keeps time.
+
+voice_client.play() returns as soon as the AudioPlayer thread starts; the
+audio the user hears begins only when that thread reads the first packet
+from ffmpeg. Wrapping the source lets the play trace end at that moment
+rather than at the play() call. read() runs on the AudioPlayer thread, so
+this class only touches the span it was given, never the event loop.
+
+discord.py calls cleanup() on that thread when playback ends or is
+stopped; `on_cleanup` lets the owner route that through its AudioTracker.
+
+Given a StreamTiming, each read is timed and reported to it (see
+packet_timing.py): two perf_counter() calls and some arithmetic per 20 ms.
+"""
+
+from time import perf_counter
+from typing import Callable, Optional
+
+import discord
+
+from .packet_timing import StreamTiming
+from ..utils.tracing import Span
+
+
+class TracedAudio(discord.AudioSource):
+
+    def __init__(
+        self,
+        inner: discord.AudioSource,
+        span: Optional[Span] = None,
+        on_cleanup: Optional[Callable[[], None]] = None,
+        timing: Optional[StreamTiming] = None,
+    ):
+        self.inner = inner
+        self._span = span
+        self._on_cleanup = on_cleanup or inner.cleanup
+        self._timing = timing
+
+    def read(self) -> bytes:
+        started = perf_counter()
+        data = self.inner.read()
+        if self._timing is not None:
+            self._timing.packet(started, perf_counter() - started, len(data))
+        if self._span is not None:
+            if data:
+                self._span.event("first_opus_packet", bytes=len(data))
+                self._span.end()
+            else:
+                self._span.end(error="no_audio")
+            self._span = None
+        return data
+
+    def is_opus(self) -> bool:
+        return self.inner.is_opus()
+
+    def cleanup(self) -> None:
+        if self._span is not None:
+            self._span.end(error="stopped_before_audio")
+            self._span = None
+        if self._timing is not None:
+            self._timing.close()
+            self._timing = None
+        self._on_cleanup()
@@ -0,0 +1,194 @@
+"""
+AudioTracker — owns the lifecycle of every ffmpeg-backed audio object.
+
+Each FFmpegOpusAudio is an ffmpeg process plus its pipes. Dropping the
+Python reference doesn't end the process, so any path that forgets to call
+cleanup() — a discarded prefetch, a play() that raised, a seek racing the
+old stream's teardown — leaves a zombie ffmpeg behind. Over days of uptime
+those add up.
+
+Every audio object is registered here when it's spawned, with the
+GuildPlayer that owns it, and moves through
+
+    created ──▶ playing ──▶ released
+        └──────────────────────▲
+
+release() is the only way out: it calls cleanup() exactly once, from
+whichever thread gets there first (the event loop discarding a prefetch,
+or discord.py's AudioPlayer thread finishing a track), and is a no-op
+after that.
+
+A periodic audit asks each owner which audio objects it still references
+(GuildPlayer.owned_audio()). Anything registered but not referenced —
+because its owner was garbage-collected or because a code path lost it —
+is logged as a leak and released.
+
+There's one tracker per process, TRACKER: every GuildPlayer registers
+with it, MusicCog starts and stops its audit, and the process-wide gauges
+report it.
+"""
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Optional
+
+from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
+
+log = get_logger(__name__)
+
+CREATED = "created"
+PLAYING = "playing"
+RELEASED = "released"
+
+AUDIT_INTERVAL = 60   # seconds between leak audits
+LEAK_GRACE = 30       # seconds an object may go unreferenced (between spawn and hand-off)
+
+AUDIO_RELEASES = REGISTRY.counter(
+    "mopey_audio_releases_total", "Audio objects cleaned up, by why", ["reason"]
+)
+AUDIO_LEAKS = REGISTRY.counter(
+    "mopey_audio_leaks_total", "Audio objects found unreferenced by the audit and reaped", ["why"]
+)
+
+
+@dataclass(slots=True)
+class _Record:
+    audio: Any
+    owner: "weakref.ref"
+    guild_id: Optional[int]
+    kind: str
+    state: str
+    since: float
+
+
+class AudioTracker:
+
+    def __init__(self, audit_interval: float = AUDIT_INTERVAL):
+        self._audit_interval = audit_interval
+        self._records: dict[int, _Record] = {}   # id(audio) -> record
+        self._lock = threading.Lock()            # release() runs on AudioPlayer threads too
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Transitions
+    # ------------------------------------------------------------------
+
+    def register(self, audio: Any, owner: Any, kind: str) -> None:
+        """Track a freshly spawned `audio`, owned by `owner` (a GuildPlayer)."""
+        record = _Record(
+            audio=audio,
+            owner=weakref.ref(owner),
+            guild_id=getattr(owner, "guild_id", None),
+            kind=kind,
+            state=CREATED,
+            since=monotonic(),
+        )
+        with self._lock:
+            self._records[id(audio)] = record
+
+    def playing(self, audio: Any) -> None:
+        """`audio` has been handed to a voice client."""
+        with self._lock:
+            record = self._records.get(id(audio))
+            if record is not None and record.state == CREATED:
+                record.state = PLAYING
+                record.since = monotonic()
+
+    def release(self, audio: Any, reason: str) -> None:
+        """Clean `audio` up, once. Safe from any thread, and for untracked or None audio."""
+        if audio is None:
+            return
+        with self._lock:
+            record = self._records.pop(id(audio), None)
+        if record is None or record.audio is not audio:
+            return
+        record.state = RELEASED
+        AUDIO_RELEASES.inc(reason=reason)
+        try:
+            audio.cleanup()
+        except Exception as e:
+            log.warning(f"[guild={record.guild_id}] Cleanup of {record.kind} audio failed: {e}")
+
+    def state(self, audio: Any) -> str:
+        with self._lock:
+            record = self._records.get(id(audio))
+        return record.state if record is not None and record.audio is audio else RELEASED
+
+    # ------------------------------------------------------------------
+    # Audit
+    # ------------------------------------------------------------------
+
+    def audit(self) -> int:
+        """Release every tracked object its owner no longer references. Returns how many."""
+        now = monotonic()
+        with self._lock:
+            records = list(self._records.values())
+        leaked = []
+        for record in records:
+            owner = record.owner()
+            if owner is None:
+                leaked.append((record, "owner_gone"))
+            elif now - record.since > LEAK_GRACE and not any(a is record.audio for a in owner.owned_audio()):
+                leaked.append((record, "unreferenced"))
+        for record, why in leaked:
+            log.warning(
+                f"[guild={record.guild_id}] Reaping leaked {record.kind} audio "
+                f"({why}, {record.state} for {now - record.since:.0f}s)"
+            )
+            AUDIO_LEAKS.inc(why=why)
+            self.release(record.audio, "leak")
+        return len(leaked)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._audit_interval)
+            try:
+                self.audit()
+            except Exception as e:
+                log.error(f"Audio leak audit failed: {e}", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def counts(self) -> dict:
+        """{(state,): number of tracked objects} for the live states."""
+        with self._lock:
+            states = [record.state for record in self._records.values()]
+        return {(state,): states.count(state) for state in (CREATED, PLAYING)}
+
+    def running_processes(self) -> int:
+        with self._lock:
+            audios = [record.audio for record in self._records.values()]
+        running = 0
+        for audio in audios:
+            process = getattr(audio, "_process", None)
+            if process is not None and hasattr(process, "poll") and process.poll() is None:
+                running += 1
+        return running
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+TRACKER = AudioTracker()
+
+REGISTRY.gauge(
+    "mopey_audio_objects", "Tracked audio objects by lifecycle state", ["state"], callback=TRACKER.counts
+)
+REGISTRY.gauge(
+    "mopey_ffmpeg_processes", "Running ffmpeg processes", callback=lambda: {(): TRACKER.running_processes()}
+)
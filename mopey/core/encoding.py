@@ -0,0 +1,89 @@
+"""
+Opus encoding profiles: how hard ffmpeg works for each stream.
+
+Discord voice channels carry 8-384 kbps depending on the server's boost
+level, and anything encoded above the channel's bitrate is wasted CPU and
+upload bandwidth. choose_profile() picks, per stream:
+
+  bitrate     — the channel's bitrate, capped at MAX_BITRATE (source audio
+                from YouTube/Plex rarely has more to give)
+  complexity  — libopus compression_level, lowered as host load rises;
+                quality loss is slight, CPU saving is large
+  cutoff      — audio bandwidth, narrowed at low bitrates so the bits go to
+                the frequencies listeners actually hear
+
+Frame size stays at 20 ms: discord.py's AudioPlayer sends one packet every
+20 ms, so longer frames would play fast.
+
+Profiles are chosen at track boundaries (play, prefetch, seek) — never
+mid-stream — so a channel bitrate change or a move to another channel takes
+effect with the next track.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_BITRATE = 128   # kbps, discord.py's own default; used when the channel's is unknown
+MIN_BITRATE = 8
+MAX_BITRATE = 160
+
+# (load per CPU below which it applies, libopus compression_level)
+COMPLEXITY_BY_LOAD = (
+    (0.5, 10),
+    (0.8, 8),
+    (1.2, 5),
+)
+OVERLOADED_COMPLEXITY = 2
+
+# (bitrate up to which it applies, cutoff Hz): libopus accepts 4000/6000/8000/12000/20000
+CUTOFF_BY_BITRATE = (
+    (16, 6000),
+    (24, 8000),
+    (48, 12000),
+)
+FULLBAND_CUTOFF = 20000
+
+
+@dataclass(frozen=True, slots=True)
+class EncodingProfile:
+    bitrate: int      # kbps
+    complexity: int   # libopus compression_level, 0-10
+    cutoff: int       # Hz
+
+    def apply(self, options: dict) -> dict:
+        """FFmpegOpusAudio kwargs (`before_options`/`options`) with this profile added."""
+        return {
+            **options,
+            "bitrate": self.bitrate,
+            "options": f"{options.get('options', '')} -compression_level {self.complexity} -cutoff {self.cutoff}",
+        }
+
+    def describe(self) -> str:
+        return f"{self.bitrate} kbps, complexity {self.complexity}, cutoff {self.cutoff // 1000} kHz"
+
+
+def host_load() -> Optional[float]:
+    """1-minute load average per CPU, or None where the OS doesn't report one."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def choose_profile(channel_bitrate: Optional[int], load: Optional[float]) -> EncodingProfile:
+    """
+    The profile for a stream to a channel of `channel_bitrate` bits/s
+    (discord.VoiceChannel.bitrate) on a host at `load` per CPU.
+    """
+    if channel_bitrate:
+        bitrate = max(MIN_BITRATE, min(MAX_BITRATE, channel_bitrate // 1000))
+    else:
+        bitrate = DEFAULT_BITRATE
+
+    complexity = COMPLEXITY_BY_LOAD[0][1]
+    if load is not None:
+        complexity = next((level for limit, level in COMPLEXITY_BY_LOAD if load < limit), OVERLOADED_COMPLEXITY)
+
+    cutoff = next((hz for limit, hz in CUTOFF_BY_BITRATE if bitrate <= limit), FULLBAND_CUTOFF)
+    return EncodingProfile(bitrate=bitrate, complexity=complexity, cutoff=cutoff)
@@ -0,0 +1,142 @@
+"""
+Federated search — one query against every configured AudioSource at once.
+
+All sources are searched concurrently under a single deadline. stream()
+yields the merged, ranked result list each time another source answers,
+so the picker can show YouTube results while Plex is still searching (or
+the other way round) instead of waiting for the slowest backend.
+
+Ranking: each result scores by how many query words appear in its
+artist/title/album, plus a bonus for preferred sources — local Plex copies
+by default, since they stream from the LAN with no extraction step. Results
+that are the same track on several sources (by normalised "artist title")
+are collapsed to the best-scoring copy.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+from typing import AsyncIterator
+
+from .song import Song
+from .sources import AudioSource, normalise_title, title_words
+from ..utils import tracing
+from ..utils.log import get_logger
+
+log = get_logger(__name__)
+
+FEDERATED_DEADLINE = 8.0     # seconds before slow sources are dropped from the results
+PER_SOURCE_LIMIT = 5
+PREFERRED_BONUS = 0.25       # enough to lift a Plex copy over an equally relevant YouTube hit
+POSITION_PENALTY = 0.01      # keeps each source's own relevance order among equal scores
+
+
+@dataclass(slots=True)
+class FederatedResult:
+    song: Song
+    source: AudioSource
+    source_name: str
+    score: float
+
+
+def _dedupe_key(song: Song) -> str:
+    return normalise_title(f"{song.artist} {song.title}" if song.artist else song.title)
+
+
+def _relevance(query_words: list[str], song: Song) -> float:
+    if not query_words:
+        return 0.0
+    words = title_words(song.artist, song.title, song.album)
+    return sum(1 for word in query_words if word in words) / len(query_words)
+
+
+def rank(
+    query: str,
+    results: dict[str, list[Song]],
+    sources: dict[str, AudioSource],
+    preferred: tuple[str, ...] = (),
+) -> list[FederatedResult]:
+    """Merge per-source results into one deduplicated list, best first."""
+    query_words = normalise_title(query).split()
+    scored = []
+    for name, songs in results.items():
+        bonus = PREFERRED_BONUS if name in preferred else 0.0
+        for position, song in enumerate(songs):
+            score = _relevance(query_words, song) + bonus - position * POSITION_PENALTY
+            scored.append(FederatedResult(song, sources[name], name, score))
+    scored.sort(key=lambda result: result.score, reverse=True)
+
+    merged, seen = [], set()
+    for result in scored:
+        key = _dedupe_key(result.song)
+        if key and key in seen:
+            continue
+        seen.add(key)
+        merged.append(result)
+    return merged
+
+
+class FederatedSearch:
+
+    def __init__(
+        self,
+        sources: dict[str, AudioSource],
+        preferred: tuple[str, ...] = ("Plex",),
+        deadline: float = FEDERATED_DEADLINE,
+        per_source_limit: int = PER_SOURCE_LIMIT,
+    ):
+        """`sources` maps a display name (e.g. 'YouTube', 'Plex') to its source."""
+        self._sources = sources
+        self._preferred = preferred
+        self._deadline = deadline
+        self._limit = per_source_limit
+
+    async def stream(self, query: str) -> AsyncIterator[tuple[list[FederatedResult], list[str]]]:
+        """
+        Yield (ranked results so far, names of sources still searching) after
+        each source answers. Sources still running at the deadline are
+        cancelled and the final yield has an empty pending list.
+        """
+        started = perf_counter()
+        tasks = {
+            asyncio.ensure_future(self._search(name, source, query)): name
+            for name, source in self._sources.items()
+        }
+        results: dict[str, list[Song]] = {}
+        try:
+            while len(results) < len(tasks):
+                remaining = self._deadline - (perf_counter() - started)
+                pending = [task for task in tasks if not task.done()]
+                done, _ = await asyncio.wait(
+                    pending, timeout=max(0.0, remaining), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    late = [tasks[task] for task in pending]
+                    log.warning(f"Federated search {query!r}: no answer from {', '.join(late)} within {self._deadline:g}s")
+                    break
+                for task in done:
+                    results[tasks[task]] = task.result()
+                still = [name for task, name in tasks.items() if not task.done()]
+                yield rank(query, results, self._sources, self._preferred), still
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        if len(results) < len(tasks):
+            yield rank(query, results, self._sources, self._preferred), []
+
+    async def _search(self, name: str, source: AudioSource, query: str) -> list[Song]:
+        """One source's results; failures count as no results."""
+        try:
+            with tracing.span("federated_search", source=name):
+                return await source.search(query, limit=self._limit)
+        except Exception as e:
+            log.warning(f"Federated search: {name} failed for {query!r}: {e}")
+            return []
+
+    async def search(self, query: str) -> list[FederatedResult]:
+        """The final ranked list, without streaming."""
+        final: list[FederatedResult] = []
+        async for final, _ in self.stream(query):
+            pass
+        return final
@@ -0,0 +1,134 @@
+"""
+Live audio filters: volume, bass boost and speed, changed without
+respawning ffmpeg.
+
+Every stream's ffmpeg runs the same filter chain, with each filter given a
+stable instance name:
+
+    volume@vol=0.25, bass@bass=g=0, atempo@tempo=1, aresample=...
+
+so a running ffmpeg can be retargeted through its interactive command
+interface: writing `c` followed by `volume@vol -1 volume 0.5` to its stdin
+sends the `volume` command to that filter instance immediately. No new
+process, no new HTTP stream, no silence. ffmpeg polls stdin about every
+100 ms, but it encodes ahead of playback, so a change is heard once the
+already-encoded audio in the pipe has played (typically a few seconds).
+The volume filter also carries the track's loudness normalisation gain
+(see loudness.py), so that is retargeted the same way.
+
+FilteredAudio is the FFmpegOpusAudio that keeps ffmpeg's stdin open for
+this and remembers the settings its process is running with, so
+apply(settings) sends only what differs. Filter strings are built once per
+distinct FilterSettings and cached; every track, prefetch and seek with the
+same settings reuses them.
+"""
+
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import discord
+
+from ..utils.log import get_logger
+
+log = get_logger(__name__)
+
+BASE_GAIN = 0.25          # ffmpeg gain at 100% volume; source audio is mastered loud
+VOLUME_RANGE = (0, 200)   # percent
+BASS_RANGE = (0, 20)      # dB boost around BASS_FREQUENCY
+BASS_FREQUENCY = 100      # Hz
+SPEED_RANGE = (0.5, 2.0)  # atempo handles 0.5-100 per instance; beyond 2x sounds broken anyway
+
+# Always last: inserts/drops samples to correct clock drift rather than
+# letting playback speed up or slow down
+_RESAMPLE = "aresample=48000:async=1000:first_pts=0"
+
+
+@dataclass(frozen=True, slots=True)
+class FilterSettings:
+    volume: int = 100     # percent
+    bass: float = 0.0     # dB
+    speed: float = 1.0    # tempo factor, pitch preserved
+    track_gain: float = 0.0  # dB, loudness normalisation for the current track (set by the player)
+
+    @property
+    def gain(self) -> float:
+        return BASE_GAIN * self.volume / 100 * 10 ** (self.track_gain / 20)
+
+
+@lru_cache(maxsize=128)
+def filter_chain(settings: FilterSettings) -> str:
+    """The -af filter chain for `settings`, with named instances apply() can address."""
+    return ",".join((
+        f"volume@vol={settings.gain:g}",
+        f"bass@bass=g={settings.bass:g}:f={BASS_FREQUENCY}",
+        f"atempo@tempo={settings.speed:g}",
+        _RESAMPLE,
+    ))
+
+
+@lru_cache(maxsize=128)
+def ffmpeg_options(options: str, settings: FilterSettings) -> str:
+    """Output `options` with the filter chain for `settings` appended."""
+    return f'{options} -af "{filter_chain(settings)}"'
+
+
+def commands_between(old: FilterSettings, new: FilterSettings) -> list[str]:
+    """ffmpeg filter commands (`target time command arg`) turning `old` into `new`."""
+    commands = []
+    if new.gain != old.gain:
+        commands.append(f"volume@vol -1 volume {new.gain:g}")
+    if new.bass != old.bass:
+        commands.append(f"bass@bass -1 g {new.bass:g}")
+    if new.speed != old.speed:
+        commands.append(f"atempo@tempo -1 tempo {new.speed:g}")
+    return commands
+
+
+class FilteredAudio(discord.FFmpegOpusAudio):
+    """
+    FFmpegOpusAudio whose filters can be changed while it plays.
+    `options` must already contain ffmpeg_options(..., settings).
+    """
+
+    def __init__(self, source: str, *, settings: FilterSettings, **kwargs):
+        self.settings = settings
+        self._commands: Optional[object] = None  # ffmpeg's stdin, once spawned
+        super().__init__(source, **kwargs)
+
+    def _spawn_process(self, args, **subprocess_kwargs) -> subprocess.Popen:
+        # discord.py gives ffmpeg no stdin unless it's piping audio in;
+        # we need it open to send filter commands
+        subprocess_kwargs["stdin"] = subprocess.PIPE
+        process = super()._spawn_process(args, **subprocess_kwargs)
+        self._commands = process.stdin
+        return process
+
+    def apply(self, settings: FilterSettings) -> bool:
+        """
+        Retarget the running filters to `settings`. Returns False if ffmpeg
+        can't take commands any more (it has exited); the caller's next
+        spawn will pick the settings up instead.
+        """
+        commands = commands_between(self.settings, settings)
+        if not commands:
+            return True
+        try:
+            # Small writes into a pipe ffmpeg drains every ~100 ms: never blocks in practice
+            self._commands.write("".join(f"c{command}\n" for command in commands).encode())
+            self._commands.flush()
+        except (AttributeError, OSError, ValueError) as e:
+            log.debug("Couldn't send filter commands to ffmpeg: %s", e)
+            return False
+        self.settings = settings
+        return True
+
+    def cleanup(self) -> None:
+        if self._commands is not None:
+            try:
+                self._commands.close()
+            except OSError:
+                pass
+            self._commands = None
+        super().cleanup()
@@ -0,0 +1,142 @@
+"""
+Hedged, deadline-bounded async calls.
+
+    result = await hedged(
+        "resolve",
+        primary=lambda: extract(primary_client),
+        alternates={"alt_client": lambda: extract(other_client),
+                    "plex": lambda: match_on_plex(song)},
+        hedge_after=3.0,
+        deadline=15.0,
+    )
+
+The primary attempt starts immediately. If it hasn't finished after
+`hedge_after` seconds, or fails before then, every alternate is launched
+alongside it. The first attempt to succeed wins and the rest are cancelled.
+If nothing succeeds within `deadline`, DeadlineExceeded is raised. When every
+attempt fails, the primary's exception is re-raised, so callers see the same
+errors as before.
+
+If the primary may first wait for capacity (an extraction slot, see
+admission.py), pass `primary_started`: an Event the primary sets once it's
+actually running. `hedge_after` then counts from that moment, so time spent
+queued doesn't launch hedges that would only queue behind it.
+
+Cancelling an attempt that's blocked in an executor thread (yt-dlp) only
+abandons its result — the thread runs to completion in the background —
+but the caller is no longer held up by it.
+"""
+
+import asyncio
+from time import perf_counter
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from ..utils import tracing
+from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
+
+log = get_logger(__name__)
+
+T = TypeVar("T")
+
+HEDGED_CALLS = REGISTRY.counter(
+    "mopey_hedged_calls_total", "Deadline-bounded source calls", ["op"]
+)
+HEDGES_LAUNCHED = REGISTRY.counter(
+    "mopey_hedges_launched_total", "Calls whose primary was slow or failed, so alternates ran", ["op"]
+)
+HEDGE_WINNERS = REGISTRY.counter(
+    "mopey_hedge_winner_total", "Which attempt produced the result", ["op", "winner"]
+)
+DEADLINES_EXCEEDED = REGISTRY.counter(
+    "mopey_deadline_exceeded_total", "Calls that hit their deadline with no result", ["op"]
+)
+
+
+class DeadlineExceeded(Exception):
+    """No attempt produced a result before the call's deadline."""
+
+    def __init__(self, op: str, deadline: float):
+        super().__init__(f"{op} did not finish within {deadline:g}s")
+        self.op = op
+        self.deadline = deadline
+
+
+async def hedged(
+    op: str,
+    primary: Callable[[], Awaitable[T]],
+    alternates: Optional[dict[str, Callable[[], Awaitable[T]]]] = None,
+    hedge_after: Optional[float] = None,
+    deadline: Optional[float] = None,
+    primary_started: Optional[asyncio.Event] = None,
+) -> T:
+    """Run `primary`, hedged by `alternates` after `hedge_after` seconds, within `deadline`."""
+    HEDGED_CALLS.inc(op=op)
+    started = perf_counter()
+    alternates = alternates or {}
+    tasks: dict[asyncio.Future, str] = {asyncio.ensure_future(primary()): "primary"}
+    errors: dict[str, BaseException] = {}
+    hedging = bool(alternates) and hedge_after is not None   # alternates not launched yet
+    deadline_at = None if deadline is None else started + deadline
+    # Absolute time the alternates launch; armed once the primary has started
+    hedge_at = started + hedge_after if hedging and primary_started is None else None
+    start_wait = asyncio.ensure_future(primary_started.wait()) if hedging and primary_started is not None else None
+
+    def remaining(until: Optional[float]) -> Optional[float]:
+        return None if until is None else max(0.0, until - perf_counter())
+
+    def launch_alternates(reason: str) -> None:
+        nonlocal hedging, hedge_at
+        hedging, hedge_at = False, None
+        HEDGES_LAUNCHED.inc(op=op)
+        tracing.event("hedge", op=op, reason=reason)
+        log.debug("Hedging %s after %.1fs (%s): launching %s", op, perf_counter() - started, reason, list(alternates))
+        for name, factory in alternates.items():
+            tasks[asyncio.ensure_future(factory())] = name
+
+    try:
+        while True:
+            if hedging and hedge_at is None and start_wait.done():
+                hedge_at = perf_counter() + hedge_after
+            pending = [task for task in tasks if not task.done()]
+            if not pending:
+                if hedging:
+                    launch_alternates("primary failed")
+                    continue
+                raise errors.get("primary") or next(iter(errors.values()))
+
+            timeouts = [t for t in (remaining(deadline_at), remaining(hedge_at)) if t is not None]
+            waits = pending + [start_wait] if hedging and hedge_at is None else pending
+            done, _ = await asyncio.wait(
+                waits, timeout=min(timeouts) if timeouts else None, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                if task is start_wait:
+                    continue
+                name = tasks[task]
+                if task.cancelled():
+                    continue
+                if task.exception() is None:
+                    HEDGE_WINNERS.inc(op=op, winner=name)
+                    if name != "primary":
+                        log.info(f"{op} served by hedge {name!r} after {perf_counter() - started:.1f}s")
+                    return task.result()
+                errors[name] = task.exception()
+
+            if deadline_at is not None and remaining(deadline_at) <= 0:
+                DEADLINES_EXCEEDED.inc(op=op)
+                tracing.event("deadline_exceeded", op=op)
+                raise DeadlineExceeded(op, deadline)
+            if hedging and ("primary" in errors or (hedge_at is not None and remaining(hedge_at) <= 0)):
+                launch_alternates("primary failed" if "primary" in errors else "primary slow")
+    finally:
+        if start_wait is not None and not start_wait.done():
+            start_wait.cancel()
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        # Losers' exceptions are expected; retrieve them so asyncio doesn't warn
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                task.exception()
@@ -0,0 +1,116 @@
+"""
+IdleScheduler — event-driven inactivity deadlines for many guilds.
+
+Replaces a periodic scan over every player. Each key (a guild id) has one
+deadline; refreshing it on activity is a single dict write, O(1). A heap of
+(deadline, generation, key) entries drives a single sleeping task that wakes
+exactly when the earliest deadline is due.
+
+Refreshes don't touch the heap: when an entry pops whose key has since been
+pushed further out, it is re-armed at the new deadline instead of firing
+(lazy re-insertion). A generation number per registration makes entries
+left behind by cancel() harmless.
+"""
+
+import asyncio
+import heapq
+import itertools
+from time import monotonic
+from typing import Awaitable, Callable, Hashable, Optional
+
+from ..utils.log import get_logger
+
+log = get_logger(__name__)
+
+
+class IdleScheduler:
+
+    def __init__(self, timeout: float, on_idle: Callable[[Hashable], Awaitable[None]]):
+        self.timeout = timeout
+        self._on_idle = on_idle
+        self._deadlines: dict[Hashable, tuple[float, int]] = {}  # key -> (deadline, generation)
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._generations = itertools.count()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def touch(self, key: Hashable) -> None:
+        """Register `key`, or push its deadline back to `timeout` from now."""
+        deadline = monotonic() + self.timeout
+        entry = self._deadlines.get(key)
+        if entry is not None:
+            self._deadlines[key] = (deadline, entry[1])
+            return
+        generation = next(self._generations)
+        self._deadlines[key] = (deadline, generation)
+        heapq.heappush(self._heap, (deadline, generation, key))
+        self._wake.set()
+
+    def cancel(self, key: Hashable) -> None:
+        """Stop tracking `key`. Its heap entry is discarded when it surfaces."""
+        self._deadlines.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._wait_for_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"Error in idle scheduler: {e}", exc_info=True)
+
+    async def _wait_for_next(self) -> None:
+        if not self._heap:
+            self._wake.clear()
+            await self._wake.wait()
+            return
+
+        deadline, generation, key = self._heap[0]
+        delay = deadline - monotonic()
+        if delay > 0:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        heapq.heappop(self._heap)
+        entry = self._deadlines.get(key)
+        if entry is None or entry[1] != generation:
+            return  # cancelled (and possibly re-registered under a new generation)
+        if entry[0] > deadline:
+            heapq.heappush(self._heap, (entry[0], generation, key))  # refreshed since
+            return
+
+        del self._deadlines[key]
+        asyncio.ensure_future(self._fire(key))
+
+    async def _fire(self, key: Hashable) -> None:
+        try:
+            await self._on_idle(key)
+        except Exception as e:
+            log.error(f"Idle callback failed for {key!r}: {e}", exc_info=True)
@@ -0,0 +1,225 @@
+"""
+Loudness normalisation from measurements taken once per track.
+
+Tracks from YouTube and Plex are mastered anywhere from whisper-quiet to
+brick-walled, and one fixed gain can't suit them all. Running ffmpeg's
+two-pass `loudnorm` on every play would double the decoding work, so
+instead:
+
+  - the first time a track plays, LoudnessNormaliser.measure() runs one
+    background ffmpeg over its stream (first pass of loudnorm only: it
+    measures and outputs nothing) at low concurrency;
+  - the resulting gain — what brings the track to TARGET_LUFS, held back so
+    its true peak stays below PEAK_CEILING — is saved in a LoudnessStore
+    keyed by the track's source ID;
+  - on every later play, gain_for() answers from memory and the player
+    folds the gain into the volume filter it already runs. Zero extra cost.
+
+A track whose measurement finishes while it's still playing has its gain
+applied live (see GuildPlayer._measure_loudness).
+"""
+
+import asyncio
+import json
+import math
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from .filters import BASE_GAIN
+from .song import Song
+from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
+
+log = get_logger(__name__)
+
+DEFAULT_LOUDNESS_PATH = "mopey_loudness.db"
+
+# Typical of the loud masters BASE_GAIN was tuned by ear for, so average
+# tracks play about as loud as before and only the outliers move
+TARGET_LUFS = -9.0
+PEAK_CEILING = -1.0         # dBTP after all gain, BASE_GAIN included
+MAX_BOOST = 12.0            # dB; near-silent intros shouldn't become jet engines
+MAX_CUT = -12.0
+MAX_CONCURRENT_ANALYSES = 1
+ANALYSIS_TIMEOUT = 180      # seconds before an analysis is abandoned
+ANALYSE_FIRST_SECONDS = 600 # long mixes: the first 10 minutes are representative enough
+
+LOUDNESS_ANALYSES = REGISTRY.counter(
+    "mopey_loudness_analyses_total", "Background loudness measurements", ["result"]
+)
+LOUDNESS_LOOKUPS = REGISTRY.counter(
+    "mopey_loudness_lookups_total", "Track gain lookups at play time", ["result"]
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS track_loudness (
+    track_key    TEXT PRIMARY KEY,
+    integrated   REAL NOT NULL,
+    true_peak    REAL NOT NULL,
+    measured_at  REAL NOT NULL
+);
+"""
+
+_ANALYSIS_ARGS = (
+    "-hide_banner", "-nostdin", "-nostats",
+    "-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5",
+)
+
+
+def track_key(link: str) -> str:
+    """
+    Stable ID for a track across resolves: the video ID for YouTube, the
+    URL minus its query (access token) for anything else, e.g. Plex parts.
+    """
+    parsed = urlparse(link)
+    host = parsed.netloc.lower()
+    if host.endswith("youtu.be"):
+        return f"youtube:{parsed.path.lstrip('/')}"
+    if "youtube" in host:
+        video = parse_qs(parsed.query).get("v")
+        if video:
+            return f"youtube:{video[0]}"
+    return f"{host}{parsed.path}" if host else link
+
+
+def gain_for_measurement(integrated: float, true_peak: float) -> float:
+    """dB of gain bringing a track measured at `integrated` LUFS / `true_peak` dBTP to target."""
+    gain = TARGET_LUFS - integrated
+    headroom = PEAK_CEILING - (true_peak + 20 * math.log10(BASE_GAIN))
+    return max(MAX_CUT, min(gain, headroom, MAX_BOOST))
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class LoudnessStore:
+    """
+    Persistent track_key -> (integrated LUFS, true peak dBTP). The whole
+    table is held in memory (a few dozen bytes per track) so lookups at play
+    time never touch the disk; writes go to SQLite on a writer thread.
+    """
+
+    def __init__(self, path: str = DEFAULT_LOUDNESS_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._measurements: dict[str, tuple[float, float]] = {
+            key: (integrated, peak)
+            for key, integrated, peak in self._conn.execute(
+                "SELECT track_key, integrated, true_peak FROM track_loudness"
+            )
+        }
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mopey-loudness")
+        log.info(f"Loudness store opened: {path} ({len(self._measurements)} track(s))")
+
+    def get(self, key: str) -> Optional[tuple[float, float]]:
+        return self._measurements.get(key)
+
+    def put(self, key: str, integrated: float, true_peak: float) -> None:
+        self._measurements[key] = (integrated, true_peak)
+        self._writer.submit(self._write, key, integrated, true_peak)
+
+    def _write(self, key: str, integrated: float, true_peak: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO track_loudness VALUES (?, ?, ?, ?)",
+                (key, integrated, true_peak, time()),
+            )
+
+    def __len__(self) -> int:
+        return len(self._measurements)
+
+    def close(self) -> None:
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+class LoudnessNormaliser:
+
+    def __init__(
+        self,
+        store: LoudnessStore,
+        executable: str = "ffmpeg",
+        max_concurrent: int = MAX_CONCURRENT_ANALYSES,
+    ):
+        self._store = store
+        self._executable = executable
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def gain_for(self, song: Song) -> Optional[float]:
+        """The track's normalisation gain in dB, or None if it hasn't been measured yet."""
+        measured = self._store.get(track_key(song.link))
+        LOUDNESS_LOOKUPS.inc(result="hit" if measured else "miss")
+        return gain_for_measurement(*measured) if measured else None
+
+    async def measure(self, song: Song) -> Optional[float]:
+        """
+        Measure `song` (resolved) unless already known or in progress, and
+        return its gain in dB — None if the analysis failed. Concurrent
+        calls for the same track share one analysis.
+        """
+        key = track_key(song.link)
+        measured = self._store.get(key)
+        if measured:
+            return gain_for_measurement(*measured)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._analyse(key, song))
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _analyse(self, key: str, song: Song) -> Optional[float]:
+        async with self._slots:
+            try:
+                integrated, true_peak = await asyncio.wait_for(self._run_ffmpeg(song.url), ANALYSIS_TIMEOUT)
+            except asyncio.TimeoutError:
+                LOUDNESS_ANALYSES.inc(result="timeout")
+                log.warning(f"Loudness analysis timed out for {song.title!r}")
+                return None
+            except Exception as e:
+                LOUDNESS_ANALYSES.inc(result="error")
+                log.warning(f"Loudness analysis failed for {song.title!r}: {e}")
+                return None
+        LOUDNESS_ANALYSES.inc(result="ok")
+        self._store.put(key, integrated, true_peak)
+        gain = gain_for_measurement(integrated, true_peak)
+        log.info(f"Loudness of {song.title!r}: {integrated:.1f} LUFS, peak {true_peak:.1f} dBTP → gain {gain:+.1f} dB")
+        return gain
+
+    async def _run_ffmpeg(self, url: str) -> tuple[float, float]:
+        """(integrated LUFS, true peak dBTP) from loudnorm's measuring pass."""
+        process = await asyncio.create_subprocess_exec(
+            self._executable, *_ANALYSIS_ARGS,
+            "-t", str(ANALYSE_FIRST_SECONDS), "-i", url,
+            "-vn", "-threads", "1",
+            "-af", "loudnorm=print_format=json", "-f", "null", "-",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with {process.returncode}")
+        # loudnorm prints its measurements as the last JSON object on stderr
+        text = stderr.decode(errors="replace")
+        report = json.loads(text[text.rindex("{"):text.rindex("}") + 1])
+        integrated, true_peak = float(report["input_i"]), float(report["input_tp"])
+        if not math.isfinite(integrated):
+            raise ValueError("track is silent")
+        return integrated, true_peak
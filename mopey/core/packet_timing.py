@@ -0,0 +1,301 @@
+"""
+Per-packet send timing for every guild's audio stream.
+
+discord.py's AudioPlayer thread reads one Opus packet every 20 ms and
+sends it. If the reads arrive late, Discord's jitter buffer runs dry and
+the listener hears a stutter; when the thread catches up it sends the
+backlog in a burst, and clients play the burst back sped up. The
+`aresample=async=1000` in every filter chain (see filters.py) is there for
+drift inside ffmpeg, but nothing showed whether the packets themselves
+keep time. TracedAudio reports each read here, and for each guild this
+module keeps:
+
+  intervals   — time between consecutive reads; on time is ~20 ms
+  late        — reads more than LATE_AFTER behind the AudioPlayer's schedule
+  bursts      — reads less than BURST_BELOW after the previous one (catching up)
+  underruns   — reads that blocked on ffmpeg for over UNDERRUN_AFTER: it
+                hadn't produced the packet yet
+  buffer      — audio already waiting in ffmpeg's stdout pipe (FIONREAD),
+                sampled every DEPTH_EVERY packets; a lower bound, since the
+                reader holds a little more in its own buffer
+  drift       — over each DRIFT_WINDOW packets, how far wall time ran ahead
+                of (positive: sending slow) or behind (negative: sending
+                fast) the audio sent. Over DRIFT_LIMIT, the guild is flagged
+                and logged.
+
+Intervals and buffer depth go into process-wide Prometheus histograms and
+into small per-guild rolling histograms covering the last one to two
+ROLLING_PERIODs, served as JSON on /playback when the metrics endpoint is
+on.
+
+Everything here runs on AudioPlayer threads except snapshot(), so each
+PacketClock takes its own lock; at 50 packets a second that's negligible.
+"""
+
+import json
+import sys
+import threading
+import weakref
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Optional
+
+try:
+    import fcntl
+    import termios
+except ImportError:  # Windows: no FIONREAD on pipes, buffer depth isn't reported
+    fcntl = termios = None
+
+from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY, ROUTES
+
+log = get_logger(__name__)
+
+FRAME_SECONDS = 0.02       # discord.py's AudioPlayer sends one 20 ms packet per loop
+LATE_AFTER = 0.01          # seconds behind schedule before a packet counts as late
+BURST_BELOW = 0.01         # seconds since the previous read below which it's a catch-up burst
+UNDERRUN_AFTER = 0.01      # seconds blocked in read() before it counts as an underrun
+DEPTH_EVERY = 25           # packets between pipe depth samples (twice a second)
+DRIFT_WINDOW = 1500        # packets per drift measurement (30 s of audio)
+DRIFT_LIMIT = 0.01         # |drift| above which a guild is flagged (1%, ~0.3 s per window)
+ROLLING_PERIOD = 60.0      # seconds per rolling histogram generation
+
+INTERVAL_BUCKETS = (0.005, 0.01, 0.015, 0.019, 0.021, 0.025, 0.03, 0.04, 0.06, 0.1, 0.25, 1.0)
+BUFFER_BUCKETS = (0.0, 0.02, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+PACKET_INTERVAL_SECONDS = REGISTRY.histogram(
+    "mopey_packet_interval_seconds", "Time between consecutive Opus packet reads",
+    buckets=INTERVAL_BUCKETS,
+)
+AUDIO_BUFFER_SECONDS = REGISTRY.histogram(
+    "mopey_audio_buffer_seconds", "Audio waiting in ffmpeg's output pipe when sampled",
+    buckets=BUFFER_BUCKETS,
+)
+AUDIO_PACKETS = REGISTRY.counter(
+    "mopey_audio_packets_total", "Opus packets read for sending, by timing", ["timing"]
+)
+AUDIO_UNDERRUNS = REGISTRY.counter(
+    "mopey_audio_underruns_total", "Packet reads that had to wait for ffmpeg"
+)
+DRIFT_FLAGS = REGISTRY.counter(
+    "mopey_playback_drift_flags_total", "Drift windows over the limit", ["direction"]
+)
+
+# Every live clock, for /playback and the drifting-guilds gauge
+_clocks: "weakref.WeakValueDictionary[int, PacketClock]" = weakref.WeakValueDictionary()
+
+
+def pipe_depth(audio: Any) -> Optional[int]:
+    """Bytes waiting in `audio`'s ffmpeg stdout pipe, or None if it can't be read."""
+    stdout = getattr(audio, "_stdout", None)
+    if fcntl is None or stdout is None:
+        return None
+    try:
+        buffer = bytearray(4)
+        fcntl.ioctl(stdout.fileno(), termios.FIONREAD, buffer)
+    except (OSError, ValueError):
+        return None
+    return int.from_bytes(buffer, sys.byteorder)
+
+
+class RollingHistogram:
+    """
+    Bucket counts over the last one to two `period`s: two generations,
+    the older dropped each time the newer turns `period` old.
+    """
+    __slots__ = ("buckets", "period", "_current", "_previous", "_rotated")
+
+    def __init__(self, buckets: tuple, period: float = ROLLING_PERIOD):
+        self.buckets = buckets
+        self.period = period
+        self._current = [0] * (len(buckets) + 1)
+        self._previous = [0] * (len(buckets) + 1)
+        self._rotated = perf_counter()
+
+    def _rotate(self, now: float) -> None:
+        age = now - self._rotated
+        if age < self.period:
+            return
+        self._previous = self._current if age < 2 * self.period else [0] * len(self._current)
+        self._current = [0] * len(self._current)
+        self._rotated = now
+
+    def observe(self, value: float, now: float) -> None:
+        self._rotate(now)
+        self._current[bisect_left(self.buckets, value)] += 1
+
+    def counts(self, now: float) -> dict:
+        """{upper bound: count}, non-cumulative, "+Inf" last; empty buckets left out."""
+        self._rotate(now)
+        labels = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        return {
+            label: new + old
+            for label, new, old in zip(labels, self._current, self._previous)
+            if new + old
+        }
+
+
+# ---------------------------------------------------------------------------
+# Per-guild clock
+# ---------------------------------------------------------------------------
+
+class PacketClock:
+    """One guild's packet timing, across every stream it plays."""
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self._lock = threading.Lock()
+        self._epoch = 0            # bumped by resync(); streams re-anchor when it changes
+        self._current: Optional["StreamTiming"] = None
+        self.packets = 0
+        self.late = 0
+        self.bursts = 0
+        self.underruns = 0
+        self.drift: Optional[float] = None   # last complete window's drift ratio
+        self.drifting = False
+        self.intervals = RollingHistogram(INTERVAL_BUCKETS)
+        self.buffer = RollingHistogram(BUFFER_BUCKETS)
+        _clocks[guild_id] = self
+
+    def stream(self, audio: Any) -> "StreamTiming":
+        """Timing for a stream about to be handed to the voice client."""
+        timing = StreamTiming(self, audio)
+        self._current = timing
+        return timing
+
+    def resync(self) -> None:
+        """Playback was paused or resumed: the gap until the next read isn't lateness."""
+        self._epoch += 1
+
+    def _window(self, drift: float) -> None:
+        flagged = abs(drift) > DRIFT_LIMIT
+        with self._lock:
+            was, self.drift, self.drifting = self.drifting, drift, flagged
+        if flagged:
+            direction = "slow" if drift > 0 else "fast"
+            DRIFT_FLAGS.inc(direction=direction)
+            if not was:
+                log.warning(
+                    f"[guild={self.guild_id}] Playback clock drifting {direction}: "
+                    f"{drift * 100:+.1f}% over the last {DRIFT_WINDOW * FRAME_SECONDS:.0f}s "
+                    f"(late={self.late}, bursts={self.bursts}, underruns={self.underruns})"
+                )
+        elif was:
+            log.info(f"[guild={self.guild_id}] Playback clock back in time ({drift * 100:+.2f}%)")
+
+    def _ended(self, timing: "StreamTiming") -> None:
+        with self._lock:
+            if self._current is timing:
+                self._current = None
+                self.drifting = False
+
+    def snapshot(self) -> dict:
+        now = perf_counter()
+        with self._lock:
+            return {
+                "guild": self.guild_id,
+                "playing": self._current is not None,
+                "packets": self.packets,
+                "late": self.late,
+                "bursts": self.bursts,
+                "underruns": self.underruns,
+                "drift": self.drift,
+                "drifting": self.drifting,
+                "intervals": self.intervals.counts(now),
+                "buffer_seconds": self.buffer.counts(now),
+            }
+
+
+class StreamTiming:
+    """
+    One voice_client.play()'s reads. Lives on its AudioPlayer thread;
+    discord.py schedules packet n at start + n * 20 ms, so that's the
+    schedule lateness is measured against.
+    """
+    __slots__ = (
+        "_clock", "_audio", "_epoch", "_anchor", "_sent", "_last", "_reads", "_bytes",
+        "_window_start", "_window_packets",
+    )
+
+    def __init__(self, clock: PacketClock, audio: Any):
+        self._clock = clock
+        self._audio = audio
+        self._epoch = clock._epoch
+        self._anchor: Optional[float] = None
+        self._sent = 0
+        self._last = 0.0
+        self._reads = 0
+        self._bytes = 0
+        self._window_start = 0.0
+        self._window_packets = 0
+
+    def _restart(self, now: float) -> None:
+        self._anchor = self._last = self._window_start = now
+        self._sent = self._window_packets = 0
+        self._epoch = self._clock._epoch
+
+    def packet(self, started: float, read_seconds: float, size: int) -> None:
+        """A read that began at `started`, blocked `read_seconds` and returned `size` bytes."""
+        if not size:
+            return
+        clock = self._clock
+        self._reads += 1
+        self._bytes += size
+        if self._anchor is None or self._epoch != clock._epoch:
+            self._restart(started)
+            return
+
+        interval = started - self._last
+        self._last = started
+        self._sent += 1
+        behind = started - (self._anchor + self._sent * FRAME_SECONDS)
+        if behind > LATE_AFTER:
+            timing = "late"
+        elif interval < BURST_BELOW:
+            timing = "burst"
+        else:
+            timing = "on_time"
+        underrun = read_seconds > UNDERRUN_AFTER
+        depth = pipe_depth(self._audio) if self._sent % DEPTH_EVERY == 0 else None
+        buffered = depth / (self._bytes / self._reads) * FRAME_SECONDS if depth is not None else None
+
+        PACKET_INTERVAL_SECONDS.observe(interval)
+        AUDIO_PACKETS.inc(timing=timing)
+        if underrun:
+            AUDIO_UNDERRUNS.inc()
+        if buffered is not None:
+            AUDIO_BUFFER_SECONDS.observe(buffered)
+        with clock._lock:
+            clock.packets += 1
+            clock.late += timing == "late"
+            clock.bursts += timing == "burst"
+            clock.underruns += underrun
+            clock.intervals.observe(interval, started)
+            if buffered is not None:
+                clock.buffer.observe(buffered, started)
+
+        self._window_packets += 1
+        if self._window_packets >= DRIFT_WINDOW:
+            audio_time = self._window_packets * FRAME_SECONDS
+            clock._window((started - self._window_start - audio_time) / audio_time)
+            self._window_start = started
+            self._window_packets = 0
+
+    def close(self) -> None:
+        self._clock._ended(self)
+        self._audio = None
+
+
+def _drifting_guilds() -> dict:
+    return {(): sum(1 for clock in list(_clocks.values()) if clock.drifting)}
+
+
+REGISTRY.gauge(
+    "mopey_playback_drifting_guilds", "Guilds whose last drift window was over the limit",
+    callback=_drifting_guilds,
+)
+
+ROUTES["/playback"] = lambda: (
+    "application/json",
+    json.dumps([clock.snapshot() for clock in list(_clocks.values())]),
+)
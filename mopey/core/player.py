@@ -9,22 +9,58 @@ Responsibilities:
   - Queue management (delegates to SongQueue)
   - Playback (play, pause, resume, stop, skip, seek)
   - Tracking current song and start time
-  - Inactivity timeout
+  - Inactivity timeout (deadlines are kept by an IdleScheduler)
 """
 
 import asyncio
-from time import time
-from typing import Optional
+from dataclasses import asdict, replace
+from time import time, monotonic, perf_counter
+from typing import Awaitable, Callable, Optional
 
 import discord
-
-from .queue import SongQueue
+from discord.ext import commands
+
+from . import admission
+from .audio import TracedAudio
+from .audio_tracker import AudioTracker, CREATED, TRACKER
+from .packet_timing import PacketClock
+from .encoding import EncodingProfile, choose_profile, host_load
+from .filters import FilterSettings, FilteredAudio, ffmpeg_options
+from .idle import IdleScheduler
+from .loudness import LoudnessNormaliser
+from .presence import PresenceManager
+from .queue import SongQueue, MAX_QUEUE_SIZE
+from .seek_index import RangeSeeker, SeekIndex, MIN_INDEXED_DURATION
 from .song import Song
 from .sources import AudioSource
+from ..utils import tracing
 from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
 
 log = get_logger(__name__)
 
+FFMPEG_SPAWN_SECONDS = REGISTRY.histogram(
+    "mopey_ffmpeg_spawn_seconds", "Time to spawn an FFmpegOpusAudio", ["kind"]
+)
+VOICE_CONNECT_SECONDS = REGISTRY.histogram(
+    "mopey_voice_connect_seconds", "Time to connect to a voice channel"
+)
+PLAY_START_SECONDS = REGISTRY.histogram(
+    "mopey_play_start_seconds", "play_song() call to voice_client.play()", ["path"]
+)
+PREFETCH_LOOKUPS = REGISTRY.counter(
+    "mopey_prefetch_lookups_total", "Whether play_song found the song prefetched", ["result"]
+)
+ENCODED_STREAMS = REGISTRY.counter(
+    "mopey_encoded_streams_total", "ffmpeg streams started, by Opus bitrate and complexity", ["bitrate", "complexity"]
+)
+SEEKS = REGISTRY.counter(
+    "mopey_seeks_total", "Seeks, by how the new position was reached", ["method"]
+)
+PLAY_FAILURES = REGISTRY.counter(
+    "mopey_play_failures_total", "Songs that failed to start or died mid-stream", ["stage"]
+)
+
 INACTIVITY_LIMIT = 600  # seconds (10 minutes)
 
 # Before-input options (passed to FFmpeg before the -i flag):
@@ -41,12 +77,10 @@ _FFMPEG_BEFORE = (
 
 # Output options:
 # - vn: no video
-# - af: volume + aresample with async mode — this is the key fix for speed-ups.
-#   aresample=async=1 tells FFmpeg to insert/drop samples to correct for clock
-#   drift rather than speeding up or slowing down the audio stream.
+# - the -af filter chain (volume, bass, speed, aresample) is appended per
+#   stream from the player's FilterSettings; see filters.py
 _FFMPEG_AFTER = (
     "-vn "
-    '-af "volume=0.25,aresample=48000:async=1000:first_pts=0" '
     "-bufsize 512k"
 )
 
@@ -69,19 +103,52 @@ def _ffmpeg_options_with_seek(position: float) -> dict:
     }
 
 
+def _ffmpeg_options_from_index(trim: float) -> dict:
+    """
+    Options for a stream spliced at an index point (see seek_index.py).
+    ffmpeg already starts its timestamps at zero there, so only `trim`
+    output seconds are dropped to land on the target.
+    """
+    return {
+        "before_options": "-probesize 32768 -analyzeduration 0",
+        "options": f"{_FFMPEG_AFTER} -ss {trim:.3f}",
+    }
+
+
+def _cleanup_spawned(spawn: asyncio.Future) -> None:
+    """Done-callback ending an ffmpeg whose spawn nobody waited for."""
+    if not spawn.cancelled() and spawn.exception() is None:
+        spawn.result().cleanup()
+
+
 class GuildPlayer:
 
-    def __init__(self, guild_id: int, bot: discord.ext.commands.Bot):
+    def __init__(
+        self,
+        guild_id: int,
+        bot: commands.Bot,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        idle: Optional[IdleScheduler] = None,
+        on_track_change: Optional[Callable[["GuildPlayer"], Awaitable[None]]] = None,
+        presence: Optional[PresenceManager] = None,
+        loudness: Optional[LoudnessNormaliser] = None,
+        seeker: Optional[RangeSeeker] = None,
+        tracker: Optional[AudioTracker] = None,
+    ):
         self.guild_id = guild_id
         self.bot = bot
 
-        self.queue = SongQueue()
+        self.queue = SongQueue(max_size=max_queue_size)
         self.current_song: Optional[Song] = None
         self.start_time: float = 0.0
         self._seek_position: float = 0.0  # playback position at the time of last seek/play
 
         self._voice_client: Optional[discord.VoiceClient] = None
-        self._last_activity: float = time()
+        self._idle = idle
+        self._on_track_change = on_track_change  # e.g. refresh the live Now Playing message
+        self._presence = presence
+        self._last_activity: float = 0.0
+        self._mark_active()
         self._last_channel: Optional[discord.TextChannel] = None
         self._stopping: bool = False  # True when stop() should NOT advance the queue
         self._seeking: bool = False   # True when seek() is mid stop/restart cycle
@@ -91,8 +158,32 @@ class GuildPlayer:
         # transition between songs doesn't block the event loop.
         self._prefetched_song: Optional[Song] = None
         self._prefetched_audio: Optional[discord.FFmpegOpusAudio] = None
+        self._prefetched_profile: Optional[EncodingProfile] = None
         self._prefetch_task: Optional[asyncio.Task] = None
 
+        # Last Opus encoding profile used, chosen per track from the channel's bitrate
+        self._encoding: Optional[EncodingProfile] = None
+
+        # Volume/bass/speed, applied live to the playing stream (self._audio)
+        # and to every stream spawned after
+        self.filters = FilterSettings()
+        self._audio: Optional[discord.AudioSource] = None
+
+        # Per-track normalisation gains, measured in the background on first play
+        self._loudness = loudness
+
+        # Seek index of the current stream (long tracks only), built when it starts
+        self._seeker = seeker
+        self._seek_index: Optional[tuple[str, SeekIndex]] = None  # (stream url, index)
+
+        # Every ffmpeg this player spawns is registered here and released through it
+        self._tracker = tracker or TRACKER
+        # Send timing of every packet this guild plays (see packet_timing.py)
+        self._clock = PacketClock(guild_id)
+
+        # Fire-and-forget work (loudness measurements, index builds), referenced until done
+        self._background: set[asyncio.Task] = set()
+
     # ------------------------------------------------------------------
     # Voice connection
     # ------------------------------------------------------------------
@@ -112,7 +203,8 @@ class GuildPlayer:
     async def connect(self, channel: discord.VoiceChannel) -> None:
         if self.is_connected:
             return
-        self._voice_client = await channel.connect()
+        with VOICE_CONNECT_SECONDS.time(), tracing.span("voice_connect"):
+            self._voice_client = await channel.connect()
         log.info(f"[guild={self.guild_id}] Connected to voice channel: #{channel.name}")
 
     async def disconnect(self) -> None:
@@ -121,16 +213,84 @@ class GuildPlayer:
         if self._voice_client:
             channel = self._voice_client.channel.name if self._voice_client.channel else "unknown"
             self._voice_client.stop()
+            self._tracker.release(self._audio, "disconnect")
             await self._voice_client.disconnect()
             self._voice_client = None
             log.info(f"[guild={self.guild_id}] Disconnected from voice channel: #{channel}")
         self.current_song = None
-        await self.bot.change_presence(activity=None)
+        self._audio = None
+        self._clear_presence()
 
     # ------------------------------------------------------------------
     # Playback
     # ------------------------------------------------------------------
 
+    def _encoding_profile(self) -> EncodingProfile:
+        """
+        The encoding profile for a stream started now: the voice channel's
+        current bitrate (which follows server boosts and channel moves) and
+        the host's current load.
+        """
+        channel = self._voice_client.channel if self._voice_client else None
+        profile = choose_profile(getattr(channel, "bitrate", None), host_load())
+        if profile != self._encoding:
+            log.info(f"[guild={self.guild_id}] Encoding profile: {profile.describe()}")
+            self._encoding = profile
+        return profile
+
+    async def _create_audio(
+        self,
+        url: str,
+        options: dict,
+        kind: str,
+        profile: Optional[EncodingProfile] = None,
+        settings: Optional[FilterSettings] = None,
+    ) -> discord.FFmpegOpusAudio:
+        """
+        Spawn ffmpeg for `url` off the event loop, encoding with `profile`
+        and filtering with `settings` (default: the current ones). `kind`
+        labels the metric.
+        """
+        profile = profile or self._encoding_profile()
+        ENCODED_STREAMS.inc(bitrate=str(profile.bitrate), complexity=str(profile.complexity))
+        options = profile.apply(options)
+        settings = settings or self.filters
+        options["options"] = ffmpeg_options(options["options"], settings)
+        loop = asyncio.get_event_loop()
+        with FFMPEG_SPAWN_SECONDS.time(kind=kind), tracing.span("ffmpeg_spawn", kind=kind):
+            spawn = loop.run_in_executor(
+                None,
+                tracing.bind(lambda: FilteredAudio(url, settings=settings, **options))
+            )
+            try:
+                audio = await asyncio.shield(spawn)
+            except asyncio.CancelledError:
+                # e.g. a prefetch made stale mid-spawn: the process still starts, so end it
+                spawn.add_done_callback(_cleanup_spawned)
+                raise
+        self._tracker.register(audio, self, kind)
+        return audio
+
+    def _start_audio(self, audio: discord.AudioSource, after, span=None) -> None:
+        """Hand `audio` to the voice client; if that fails it's released, not orphaned."""
+        try:
+            self._voice_client.play(
+                TracedAudio(
+                    audio, span,
+                    on_cleanup=lambda: self._tracker.release(audio, "finished"),
+                    timing=self._clock.stream(audio),
+                ),
+                after=after,
+            )
+        except Exception:
+            self._tracker.release(audio, "play_failed")
+            raise
+        self._tracker.playing(audio)
+
+    def owned_audio(self) -> tuple:
+        """Audio objects this player still references (AudioTracker's leak audit asks)."""
+        return (self._audio, self._prefetched_audio)
+
     async def _prefetch_next(self, source: AudioSource) -> None:
         """
         Resolve and pre-create the FFmpegOpusAudio for the next queued song
@@ -142,75 +302,123 @@ class GuildPlayer:
             return
 
         try:
-            log.debug(f"[guild={self.guild_id}] Prefetching: {next_song.title!r}")
-            resolved = await source.resolve(next_song)
-
-            loop = asyncio.get_event_loop()
-            audio = await loop.run_in_executor(
-                None,
-                lambda: discord.FFmpegOpusAudio(resolved.url, **FFMPEG_OPTIONS)
-            )
+            log.debug("[guild=%s] Prefetching: %r", self.guild_id, next_song.title)
+            admission.scope(self.guild_id, playback=True)
+            # Its own trace: prefetch overlaps playback and shouldn't hold the play trace open
+            with tracing.trace("prefetch", guild=self.guild_id):
+                with tracing.span("resolve"):
+                    resolved = await source.resolve(next_song)
+                profile = self._encoding_profile()
+                audio = await self._create_audio(
+                    resolved.url, FFMPEG_OPTIONS, kind="prefetch",
+                    profile=profile, settings=self._track_filters(resolved),
+                )
 
             # Only store if the queue hasn't changed since we started prefetching
-            if self.queue.peek_next() and self.queue.peek_next().title == next_song.title:
+            upcoming = self.queue.peek_next()
+            if upcoming and upcoming.link == next_song.link:
                 self._prefetched_song = resolved
                 self._prefetched_audio = audio
-                log.debug(f"[guild={self.guild_id}] Prefetch ready: {resolved.title!r}")
+                self._prefetched_profile = profile
+                log.debug("[guild=%s] Prefetch ready: %r", self.guild_id, resolved.title)
             else:
-                log.debug(f"[guild={self.guild_id}] Prefetch discarded (queue changed)")
+                log.debug("[guild=%s] Prefetch discarded (queue changed)", self.guild_id)
+                self._tracker.release(audio, "prefetch_stale")
 
         except Exception as e:
             # Prefetch failure is non-fatal — play_song will resolve normally as fallback
             log.warning(f"[guild={self.guild_id}] Prefetch failed for {next_song.title!r}: {e}")
             self._prefetched_song = None
             self._prefetched_audio = None
+            self._prefetched_profile = None
 
     def _clear_prefetch(self) -> None:
         """Discard any prefetched data, e.g. when the queue changes or we seek."""
         if self._prefetch_task and not self._prefetch_task.done():
             self._prefetch_task.cancel()
         self._prefetch_task = None
+        self._tracker.release(self._prefetched_audio, "prefetch_cleared")
         self._prefetched_song = None
         self._prefetched_audio = None
+        self._prefetched_profile = None
 
     def _schedule_prefetch(self, source: AudioSource) -> None:
         """Schedule prefetch as a background task so it doesn't block play_song."""
         self._clear_prefetch()
         self._prefetch_task = asyncio.ensure_future(self._prefetch_next(source))
 
-    async def play_song(self, song: Song, source: AudioSource, after_ctx) -> None:
+    async def play_song(
+        self,
+        song: Song,
+        source: AudioSource,
+        after_ctx,
+        start_at: float = 0.0,
+        preresolved: bool = False,
+    ) -> None:
         """
         Resolve the song's stream URL and begin playback.
         Uses prefetched audio if available, otherwise resolves on demand.
         On failure, attempts to skip to the next queued song.
+
+        `start_at` begins playback part-way through (used for warm restarts),
+        and `preresolved` skips resolving when `song.url` is known to be fresh.
         """
-        self._last_activity = time()
+        self._mark_active()
+        started = perf_counter()
+        first_audio = None
+        audio = None
+        # Resolving the song about to play goes ahead of queued searches
+        admission.scope(self.guild_id, playback=True)
 
         try:
-            # Use prefetched data if it matches this song
-            if (
-                self._prefetched_song is not None
+            profile = self._encoding_profile()
+            reencode = False
+            prefetched = (
+                not start_at
+                and self._prefetched_song is not None
                 and self._prefetched_audio is not None
                 and self._prefetched_song.link == song.link
-            ):
-                log.debug(f"[guild={self.guild_id}] Using prefetched audio for: {song.title!r}")
+            )
+            if prefetched and self._prefetched_profile.bitrate != profile.bitrate:
+                # The channel's bitrate changed (boost, or we were moved) since the
+                # prefetch: keep the resolved URL, re-encode at the new bitrate.
+                # A complexity change alone isn't worth losing the warm ffmpeg.
+                log.debug("[guild=%s] Prefetched audio has a stale encoding profile: %r", self.guild_id, song.title)
+                PREFETCH_LOOKUPS.inc(result="reencode")
+                self._tracker.release(self._prefetched_audio, "reencode")
+                song, preresolved, prefetched, reencode = self._prefetched_song, True, False, True
+                self._prefetched_song = None
+                self._prefetched_audio = None
+
+            if prefetched:
+                log.debug("[guild=%s] Using prefetched audio for: %r", self.guild_id, song.title)
+                PREFETCH_LOOKUPS.inc(result="hit")
                 resolved = self._prefetched_song
                 audio = self._prefetched_audio
                 self._prefetched_song = None
                 self._prefetched_audio = None
+                self.filters = self._track_filters(resolved)
+                path = "prefetched"
             else:
-                log.debug(f"[guild={self.guild_id}] Resolving stream URL for: {song.title!r}")
-                resolved = await source.resolve(song)
-
-                loop = asyncio.get_event_loop()
-                audio = await loop.run_in_executor(
-                    None,
-                    lambda: discord.FFmpegOpusAudio(resolved.url, **FFMPEG_OPTIONS)
-                )
-
+                if not start_at and not reencode:
+                    PREFETCH_LOOKUPS.inc(result="miss")
+                path = "reencoded" if reencode else "preresolved" if preresolved else "resolved"
+                if preresolved:
+                    resolved = song
+                else:
+                    log.debug("[guild=%s] Resolving stream URL for: %r", self.guild_id, song.title)
+                    with tracing.span("resolve"):
+                        resolved = await source.resolve(song)
+
+                self.filters = self._track_filters(resolved)
+                options = _ffmpeg_options_with_seek(start_at) if start_at else FFMPEG_OPTIONS
+                audio = await self._create_audio(resolved.url, options, kind="play", profile=profile)
+
+            # Prefetched audio was spawned with the filters of its time
+            self._use_audio(audio)
             self.current_song = resolved
             self.start_time = time()
-            self._seek_position = 0.0
+            self._seek_position = start_at
 
             source_name = type(source).__name__.replace("Source", "")
             artist_info = f" — {resolved.artist}" if resolved.artist else ""
@@ -220,24 +428,34 @@ class GuildPlayer:
                 f"(duration={resolved.duration}s, queue_remaining={len(self.queue)})"
             )
 
-            self._voice_client.play(
+            tracing.event("play_path", path=path)
+            # Ended by the AudioPlayer thread when the first Opus packet is read
+            first_audio = tracing.start_span("first_audio", song=resolved.title)
+            self._start_audio(
                 audio,
-                after=lambda e: self._on_audio_error(e, after_ctx, source)
+                after=tracing.bind(lambda e: self._on_audio_error(e, after_ctx, source)),
+                span=first_audio,
             )
+            PLAY_START_SECONDS.observe(perf_counter() - started, path=path)
 
             # Update bot presence to show the current song
-            await self.bot.change_presence(
-                activity=discord.Activity(
-                    type=discord.ActivityType.playing,
-                    name=f"🎵 Playing: {resolved.title}"
-                )
-            )
+            if self._presence:
+                self._presence.set_playing(self.guild_id, resolved.title)
 
             # Start prefetching the next song in the background
             if not self.queue.is_empty():
                 self._schedule_prefetch(source)
 
+            self._seek_index = None
+            if self._seeker and resolved.duration >= MIN_INDEXED_DURATION and resolved.url.startswith("http"):
+                self._in_background(self._build_seek_index(resolved.url))
+
         except Exception as e:
+            PLAY_FAILURES.inc(stage="start")
+            if first_audio is not None:
+                first_audio.end(error=type(e).__name__)
+            if audio is not None and self._tracker.state(audio) == CREATED:
+                self._tracker.release(audio, "play_failed")
             log.error(
                 f"[guild={self.guild_id}] Failed to play {song.title!r}: {e}",
                 exc_info=True
@@ -254,22 +472,31 @@ class GuildPlayer:
         Schedules _after_play normally if no error, or recovery if there was one.
         """
         if error:
+            PLAY_FAILURES.inc(stage="stream")
             log.error(
                 f"[guild={self.guild_id}] FFmpeg error mid-stream: {error}",
                 exc_info=error
             )
             asyncio.run_coroutine_threadsafe(
-                self._recover_from_error(
+                self._traced("recover", self._recover_from_error(
                     ctx, source,
                     "The stream dropped unexpectedly — skipping to next song."
-                ),
+                )),
                 self.bot.loop
             )
         else:
             asyncio.run_coroutine_threadsafe(
-                self._after_play(ctx, source), self.bot.loop
+                self._traced("advance", self._after_play(ctx, source)), self.bot.loop
             )
 
+    async def _traced(self, name: str, coro) -> None:
+        """
+        Run an after-callback coroutine under a new trace. The callback is bound
+        to the finished play's context, so the new trace links back to it.
+        """
+        with tracing.trace(name, guild=self.guild_id):
+            await coro
+
     async def _recover_from_error(self, ctx, source: AudioSource, message: str) -> None:
         """
         Attempt to recover from a playback error by notifying the channel
@@ -291,11 +518,24 @@ class GuildPlayer:
             await self.play_song(next_song, source, ctx)
         else:
             log.info(f"[guild={self.guild_id}] Recovery: queue exhausted, stopping.")
+            self._clear_presence()
             if self._last_channel:
                 try:
                     await self._last_channel.send("Nothing left in the queue to play.")
                 except Exception:
                     pass
+        await self._notify_track_change()
+
+    async def _notify_track_change(self) -> None:
+        """Tell the owner the current song changed (or playback ended)."""
+        if self._on_track_change:
+            try:
+                await self._on_track_change(self)
+            except Exception as e:
+                log.warning(f"[guild={self.guild_id}] Track change hook failed: {e}")
+        elif self._last_channel and self.current_song:
+            from ..ui.now_playing import send_now_playing
+            await send_now_playing(self._last_channel, self, self.bot)
 
     async def _after_play(self, ctx, source: AudioSource) -> None:
         """Called automatically when a song finishes cleanly."""
@@ -303,12 +543,12 @@ class GuildPlayer:
             if self._stopping:
                 self._stopping = False
                 self.current_song = None
-                log.debug(f"[guild={self.guild_id}] Playback stopped (stop/disconnect requested)")
+                log.debug("[guild=%s] Playback stopped (stop/disconnect requested)", self.guild_id)
                 return
 
             if self._seeking:
                 self._seeking = False
-                log.debug(f"[guild={self.guild_id}] Seek cycle complete")
+                log.debug("[guild=%s] Seek cycle complete", self.guild_id)
                 return
 
             finished = self.current_song
@@ -320,13 +560,12 @@ class GuildPlayer:
                 self.current_song = next_song
                 log.info(f"[guild={self.guild_id}] Advancing queue → {next_song.title!r} ({len(self.queue)} remaining)")
                 await self.play_song(next_song, source, ctx)
-                if self._last_channel:
-                    from ..ui.now_playing import send_now_playing
-                    await send_now_playing(self._last_channel, self, self.bot)
+                await self._notify_track_change()
             else:
                 log.info(f"[guild={self.guild_id}] Queue exhausted, playback complete")
                 self.current_song = None
-                await self.bot.change_presence(activity=None)
+                self._clear_presence()
+                await self._notify_track_change()
         except Exception as e:
             log.error(
                 f"[guild={self.guild_id}] Unexpected error in _after_play: {e}",
@@ -338,6 +577,7 @@ class GuildPlayer:
         """Pause playback. Returns True if successful."""
         if self.is_playing:
             self._voice_client.pause()
+            self._clock.resync()
             log.info(f"[guild={self.guild_id}] Paused: {self.current_song.title!r}")
             return True
         return False
@@ -346,6 +586,7 @@ class GuildPlayer:
         """Resume playback. Returns True if successful."""
         if self.is_paused:
             self._voice_client.resume()
+            self._clock.resync()
             log.info(f"[guild={self.guild_id}] Resumed: {self.current_song.title!r}")
             return True
         return False
@@ -359,7 +600,13 @@ class GuildPlayer:
         if self.current_song:
             log.info(f"[guild={self.guild_id}] Stopped: {self.current_song.title!r}")
         self.current_song = None
-        asyncio.ensure_future(self.bot.change_presence(activity=None))
+        self._tracker.release(self._audio, "stopped")
+        self._audio = None
+        self._clear_presence()
+
+    def _clear_presence(self) -> None:
+        if self._presence:
+            self._presence.clear(self.guild_id)
 
     async def skip(self) -> bool:
         """
@@ -386,13 +633,13 @@ class GuildPlayer:
         if was_paused:
             self._voice_client.resume()
 
-        current_position = self._seek_position + (time() - self.start_time)
+        current_position = self._position()
         new_position = max(0.0, current_position + seconds)
 
         if new_position >= self.current_song.duration:
             log.debug(
-                f"[guild={self.guild_id}] Seek rejected: "
-                f"target {new_position:.1f}s >= duration {self.current_song.duration}s"
+                "[guild=%s] Seek rejected: target %.1fs >= duration %ss",
+                self.guild_id, new_position, self.current_song.duration
             )
             return None
 
@@ -404,17 +651,18 @@ class GuildPlayer:
         self._seeking = True
         self._clear_prefetch()
         self._voice_client.stop()
+        # Don't leave the old stream's teardown to the AudioPlayer thread racing the new spawn
+        self._tracker.release(self._audio, "seek")
 
-        options = _ffmpeg_options_with_seek(new_position)
-        loop = asyncio.get_event_loop()
-        audio = await loop.run_in_executor(
-            None,
-            lambda: discord.FFmpegOpusAudio(self.current_song.url, **options)
-        )
-        self._voice_client.play(
-            audio,
-            after=lambda e: self._on_audio_error(e, ctx, source)
-        )
+        indexed = await self._indexed_seek(new_position)
+        if indexed:
+            url, options = indexed
+        else:
+            url, options = self.current_song.url, _ffmpeg_options_with_seek(new_position)
+        SEEKS.inc(method="indexed" if indexed else "ffmpeg")
+        audio = await self._create_audio(url, options, kind="seek")
+        self._use_audio(audio)
+        self._start_audio(audio, after=tracing.bind(lambda e: self._on_audio_error(e, ctx, source)))
         self.start_time = time()
         self._seek_position = new_position
 
@@ -423,6 +671,83 @@ class GuildPlayer:
 
         return new_position
 
+    async def _build_seek_index(self, url: str) -> None:
+        index = await self._seeker.build(url)
+        if index and self.current_song and self.current_song.url == url:
+            self._seek_index = (url, index)
+
+    async def _indexed_seek(self, position: float) -> Optional[tuple[str, dict]]:
+        """(url, options) playing the current stream from `position` via its seek index, if it has one."""
+        if not self._seek_index or self._seek_index[0] != self.current_song.url:
+            return None
+        url, index = self._seek_index
+        point = index.locate(position)
+        if point is None:
+            return None
+        point_time, offset = point
+        log.debug(
+            "[guild=%s] Indexed seek: %.1fs from index point %.1fs (byte %d)",
+            self.guild_id, position, point_time, offset,
+        )
+        local_url = await self._seeker.proxy_url(url, index, offset)
+        # The trim happens after atempo, in output time
+        return local_url, _ffmpeg_options_from_index((position - point_time) / self.filters.speed)
+
+    # ------------------------------------------------------------------
+    # Filters
+    # ------------------------------------------------------------------
+
+    def set_filters(self, **changes) -> FilterSettings:
+        """
+        Change volume/bass/speed (FilterSettings fields). The playing stream
+        is retargeted in place; later tracks start with the new settings.
+        """
+        settings = replace(self.filters, **changes)
+        if settings == self.filters:
+            return settings
+        if settings.speed != self.filters.speed and self.current_song:
+            # Restart the position clock, so time already played keeps the old speed
+            self._seek_position = self._position()
+            self.start_time = time()
+        self.filters = settings
+        log.info(
+            f"[guild={self.guild_id}] Filters: volume={settings.volume}% "
+            f"bass={settings.bass:g}dB speed={settings.speed:g}x"
+        )
+        self._use_audio(self._audio)
+        return settings
+
+    def _track_filters(self, song: Song) -> FilterSettings:
+        """
+        The current filters with `song`'s normalisation gain. An unmeasured
+        song plays at 0 dB and is measured in the background.
+        """
+        if self._loudness is None:
+            return self.filters
+        gain = self._loudness.gain_for(song)
+        if gain is None:
+            gain = 0.0
+            self._in_background(self._measure_loudness(song))
+        return replace(self.filters, track_gain=gain)
+
+    def _in_background(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _measure_loudness(self, song: Song) -> None:
+        """Measure `song` and, if it's still the one playing, normalise it live."""
+        gain = await self._loudness.measure(song)
+        if gain is not None and self.current_song and self.current_song.link == song.link:
+            self.filters = replace(self.filters, track_gain=gain)
+            self._use_audio(self._audio)
+
+    def _use_audio(self, audio: Optional[discord.AudioSource]) -> None:
+        """Make `audio` the stream filter changes go to, bringing it up to date."""
+        self._audio = audio
+        if isinstance(audio, FilteredAudio) and not audio.apply(self.filters):
+            log.debug("[guild=%s] Playing ffmpeg has exited; filters apply from the next track", self.guild_id)
+
     # ------------------------------------------------------------------
     # State inspection
     # ------------------------------------------------------------------
@@ -432,15 +757,66 @@ class GuildPlayer:
         """Seconds elapsed in the current song."""
         if not self.current_song:
             return 0
-        position = self._seek_position + (time() - self.start_time)
-        return max(0, min(int(position), self.current_song.duration))
+        return max(0, min(int(self._position()), self.current_song.duration))
+
+    def _position(self) -> float:
+        """Position in the current song, in song seconds (so faster with .speed above 1)."""
+        return self._seek_position + (time() - self.start_time) * self.filters.speed
+
+    @property
+    def voice_channel_id(self) -> Optional[int]:
+        if self._voice_client and self._voice_client.channel:
+            return self._voice_client.channel.id
+        return None
+
+    def snapshot_key(self) -> tuple:
+        """
+        Cheap fingerprint of everything in snapshot() except the position.
+        When it's unchanged only the position needs persisting.
+        """
+        return (
+            self.queue.version,
+            self.current_song.link if self.current_song else None,
+            self.is_paused,
+            self.filters,
+            self.voice_channel_id,
+            self._last_channel.id if self._last_channel else None,
+        )
+
+    def snapshot(self) -> dict:
+        """
+        Plain-dict view of the state needed to resume this player after a
+        restart. The current song keeps its resolved stream URL so a warm
+        restart can skip re-resolving it while the URL is still valid.
+        """
+        return {
+            "guild_id": self.guild_id,
+            "voice_channel_id": self.voice_channel_id,
+            "text_channel_id": self._last_channel.id if self._last_channel else None,
+            "current": self.current_song.to_dict() if self.current_song else None,
+            "position": float(self.elapsed),
+            "paused": self.is_paused,
+            "filters": asdict(self.filters),
+            "queue": [song.to_dict() for song in self.queue],
+        }
 
     # ------------------------------------------------------------------
     # Inactivity
     # ------------------------------------------------------------------
 
+    @property
+    def last_channel(self) -> Optional[discord.TextChannel]:
+        """The text channel the player was last used from."""
+        return self._last_channel
+
+    def _mark_active(self) -> None:
+        """Record activity now and push back this guild's idle deadline."""
+        self._last_activity = monotonic()
+        if self._idle:
+            self._idle.touch(self.guild_id)
+
     def update_activity(self, channel: discord.TextChannel) -> None:
-        self._last_activity = time()
+        self._mark_active()
         self._last_channel = channel
 
     async def check_inactivity(self) -> bool:
@@ -449,10 +825,10 @@ class GuildPlayer:
         Returns True if it disconnected.
         """
         if self.is_playing:
-            self._last_activity = time()
+            self._mark_active()
             return False
 
-        if time() - self._last_activity > INACTIVITY_LIMIT:
+        if monotonic() - self._last_activity >= INACTIVITY_LIMIT:
             if self.is_connected:
                 await self.disconnect()
                 if self._last_channel:
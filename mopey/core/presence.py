@@ -0,0 +1,110 @@
+"""
+PresenceManager — one coalesced bot presence for every guild.
+
+Presence is global to the bot, so per-guild players calling
+bot.change_presence directly race each other and burn through the
+gateway's presence rate limit. Players instead record what they are
+playing here, and a single task publishes an aggregate status:
+
+    nothing playing   → no activity
+    one guild         → "🎵 Playing: <title>"
+    several guilds    → "🎵 Playing in N servers"
+
+Changes are debounced (a burst of skips becomes one update), updates are
+spaced at least PRESENCE_MIN_INTERVAL apart, and an update is skipped
+entirely when the resulting status text hasn't changed.
+"""
+
+import asyncio
+from time import monotonic
+from typing import Optional
+
+import discord
+from discord.ext import commands
+
+from ..utils.log import get_logger
+
+log = get_logger(__name__)
+
+PRESENCE_DEBOUNCE = 2.0        # seconds to wait for a burst of changes to settle
+PRESENCE_MIN_INTERVAL = 15.0   # at most 4 presence updates a minute — well inside the gateway limit
+MAX_ACTIVITY_NAME = 128
+
+
+class PresenceManager:
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        debounce: float = PRESENCE_DEBOUNCE,
+        min_interval: float = PRESENCE_MIN_INTERVAL,
+    ):
+        self._bot = bot
+        self._debounce = debounce
+        self._min_interval = min_interval
+        self._playing: dict[int, str] = {}   # guild_id -> title
+        self._published: Optional[str] = None
+        self._last_sent = float("-inf")
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Intents from players
+    # ------------------------------------------------------------------
+
+    def set_playing(self, guild_id: int, title: str) -> None:
+        if self._playing.get(guild_id) != title:
+            self._playing[guild_id] = title
+            self._dirty.set()
+
+    def clear(self, guild_id: int) -> None:
+        if self._playing.pop(guild_id, None) is not None:
+            self._dirty.set()
+
+    def status_text(self) -> Optional[str]:
+        """The aggregate status for the current set of playing guilds."""
+        if not self._playing:
+            return None
+        if len(self._playing) == 1:
+            title = next(iter(self._playing.values()))
+            return f"🎵 Playing: {title}"[:MAX_ACTIVITY_NAME]
+        return f"🎵 Playing in {len(self._playing)} servers"
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self._debounce)
+            wait = self._last_sent + self._min_interval - monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._dirty.clear()
+            try:
+                await self._publish()
+            except Exception as e:
+                log.warning(f"Presence update failed: {e}")
+
+    async def _publish(self) -> None:
+        text = self.status_text()
+        if text == self._published:
+            return
+        activity = (
+            discord.Activity(type=discord.ActivityType.playing, name=text)
+            if text else None
+        )
+        await self._bot.change_presence(activity=activity)
+        self._published = text
+        self._last_sent = monotonic()
+        log.debug("Presence updated: %r", text)
@@ -1,21 +1,53 @@
 """
-SongQueue — a simple bounded queue for one guild.
+SongQueue — a bounded queue for one guild.
 
 Keeping this as its own class means the GuildPlayer doesn't
 manipulate raw lists directly, and queue rules (max size, etc.)
 are enforced in one place.
+
+Backed by a plain list, so indexing by position (.remove, .playqueue,
+queue pages) is O(1) and removing from the middle is a single memmove.
+The songs start at `_head` rather than at 0: popping the next song just
+advances `_head`, moving a song to the front fills the slot before it,
+and removing from the front half shifts only the songs before it. The
+vacated prefix is dropped once it's half the list, and re-grown in one
+step when a move to the front finds none left, so both stay O(1)
+amortised instead of shifting the whole queue every time. A count index
+keyed by Song.link gives O(1) membership/dedupe checks.
 """
 
+from itertools import islice
+from typing import Optional
+
 from .song import Song
 
-MAX_QUEUE_SIZE = 50
+MAX_QUEUE_SIZE = 50       # default capacity for a guild
+LARGE_QUEUE_SIZE = 10_000  # capacity for guilds configured for large playlists
+_MIN_GAP = 16             # vacated slots worth keeping or creating at the front
 
 
 class SongQueue:
 
     def __init__(self, max_size: int = MAX_QUEUE_SIZE):
-        self._songs: list[Song] = []
+        self._songs: list[Optional[Song]] = []
+        self._head = 0    # _songs[:_head] are vacated slots
+        self._links: dict[str, int] = {}  # Song.link -> number of queued copies
         self.max_size = max_size
+        self.version = 0  # bumped on every mutation so callers can cheaply detect changes
+
+    # ------------------------------------------------------------------
+    # Index bookkeeping
+    # ------------------------------------------------------------------
+
+    def _index_add(self, song: Song) -> None:
+        self._links[song.link] = self._links.get(song.link, 0) + 1
+
+    def _index_remove(self, song: Song) -> None:
+        count = self._links.get(song.link, 0) - 1
+        if count > 0:
+            self._links[song.link] = count
+        else:
+            self._links.pop(song.link, None)
 
     # ------------------------------------------------------------------
     # Core operations
@@ -23,18 +55,33 @@ class SongQueue:
 
     def add(self, song: Song) -> bool:
         """Add a song to the end of the queue. Returns False if full."""
-        if len(self._songs) >= self.max_size:
+        if len(self) >= self.max_size:
             return False
         self._songs.append(song)
+        self._index_add(song)
+        self.version += 1
         return True
 
     def pop_next(self) -> Song | None:
         """Remove and return the next song, or None if empty."""
-        return self._songs.pop(0) if self._songs else None
+        if not len(self):
+            return None
+        song = self._songs[self._head]
+        self._songs[self._head] = None
+        self._head += 1
+        if self._head == len(self._songs):
+            self._songs.clear()
+            self._head = 0
+        elif self._head >= _MIN_GAP and 2 * self._head >= len(self._songs):
+            del self._songs[:self._head]
+            self._head = 0
+        self._index_remove(song)
+        self.version += 1
+        return song
 
     def peek_next(self) -> Song | None:
         """Return the next song without removing it."""
-        return self._songs[0] if self._songs else None
+        return self._songs[self._head] if len(self) else None
 
     def remove_at(self, position: int) -> Song | None:
         """
@@ -42,9 +89,20 @@ class SongQueue:
         Returns the removed Song, or None if position is invalid.
         """
         index = position - 1
-        if 0 <= index < len(self._songs):
-            return self._songs.pop(index)
-        return None
+        size = len(self)
+        if not 0 <= index < size:
+            return None
+        if 2 * index >= size:
+            song = self._songs.pop(self._head + index)
+            self._index_remove(song)
+            self.version += 1
+            return song
+        # Nearer the front: shift the songs before it back one slot instead
+        head = self._head
+        song = self._songs[head + index]
+        self._songs[head + 1:head + index + 1] = self._songs[head:head + index]
+        self._songs[head] = song
+        return self.pop_next()
 
     def move_to_front(self, position: int) -> Song | None:
         """
@@ -52,30 +110,62 @@ class SongQueue:
         Returns the song, or None if position is invalid.
         """
         index = position - 1
-        if 0 <= index < len(self._songs):
-            song = self._songs.pop(index)
-            self._songs.insert(0, song)
+        if 0 <= index < len(self):
+            song = self._songs.pop(self._head + index)
+            if not self._head:
+                gap = max(_MIN_GAP, len(self._songs) // 4)
+                self._songs[:0] = [None] * gap
+                self._head = gap
+            self._head -= 1
+            self._songs[self._head] = song
+            self.version += 1
             return song
         return None
 
     def clear(self):
         self._songs.clear()
+        self._head = 0
+        self._links.clear()
+        self.version += 1
+
+    def resize(self, max_size: int) -> None:
+        """
+        Change the capacity. Songs already queued beyond the new limit are
+        kept; the queue just won't accept more until it drains below it.
+        """
+        self.max_size = max_size
 
     # ------------------------------------------------------------------
     # Inspection
     # ------------------------------------------------------------------
 
+    def contains(self, link: str) -> bool:
+        """O(1) check for whether a song with this link is already queued."""
+        return link in self._links
+
     def is_empty(self) -> bool:
-        return len(self._songs) == 0
+        return len(self) == 0
 
     def is_full(self) -> bool:
-        return len(self._songs) >= self.max_size
+        return len(self) >= self.max_size
 
     def __len__(self) -> int:
-        return len(self._songs)
+        return len(self._songs) - self._head
+
+    def __contains__(self, song: Song) -> bool:
+        return song.link in self._links
 
     def __iter__(self):
-        return iter(self._songs)
+        return islice(self._songs, self._head, None)
 
     def __getitem__(self, index):
-        return self._songs[index]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step < 0:
+                return list(self)[index]
+            return self._songs[self._head + start:self._head + stop:step]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("queue index out of range")
+        return self._songs[self._head + index]
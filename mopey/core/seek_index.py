@@ -0,0 +1,396 @@
+"""
+Seek indexes: jump into a long remote stream by byte offset.
+
+GuildPlayer.seek() restarts ffmpeg with `-ss` on the stream URL. How fast
+that is depends on ffmpeg finding the container's index by itself over
+HTTP; when it can't, it reads and discards everything up to the target,
+which on a two-hour mix is most of the file.
+
+For long tracks, RangeSeeker reads the container's own index as soon as
+the track starts playing, with one or two small HTTP range requests:
+
+  WebM  — the Cues element (cue time -> cluster position), found directly
+          or through the SeekHead
+  MP4   — the `sidx` box of a fragmented file (YouTube's m4a streams):
+          subsegment durations and sizes
+
+A seek then picks the last index point at or before the target and
+plays from a local proxy URL that serves the stream's init segment (headers,
+track info) followed by the stream from that point's byte offset,
+fetched with a single Range request. ffmpeg sees a short, ordinary
+stream whose timestamps it starts at zero, and an output `-ss` trims the
+few seconds between the index point and the target. A seek takes
+the same time at 30 seconds as at 3 hours.
+
+Streams without a usable index (Plex files, progressive MP4, live streams)
+keep using plain `-ss`.
+"""
+
+import asyncio
+import bisect
+import secrets
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
+
+log = get_logger(__name__)
+
+MIN_INDEXED_DURATION = 600  # seconds; shorter tracks seek fast enough with plain -ss
+HEAD_BYTES = 64 * 1024      # first request: headers, and usually the index itself
+MAX_INDEX_BYTES = 2 * 1024 * 1024
+MAX_REGISTRATIONS = 64      # pending proxy URLs kept (one per recent seek)
+CHUNK = 64 * 1024
+UPSTREAM_RETRIES = 2        # re-requests (from the last byte sent) if the upstream drops
+INDEX_TIMEOUT = 10
+
+SEEK_INDEX_BUILDS = REGISTRY.counter(
+    "mopey_seek_index_builds_total", "Seek index builds", ["result"]
+)
+
+# EBML element IDs (with their length markers, as they appear on the wire)
+_EBML = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_SEEK_HEAD = 0x114D9B74
+_SEEK = 0x4DBB
+_SEEK_ID = 0x53AB
+_SEEK_POSITION = 0x53AC
+_INFO = 0x1549A966
+_TIMESTAMP_SCALE = 0x2AD7B1
+_CLUSTER = 0x1F43B675
+_CUES = 0x1C53BB6B
+_CUE_POINT = 0xBB
+_CUE_TIME = 0xB3
+_CUE_TRACK_POSITIONS = 0xB7
+_CUE_CLUSTER_POSITION = 0xF1
+
+
+class _NeedMore(Exception):
+    """The structure being parsed runs past the bytes fetched: `length` bytes are needed."""
+
+    def __init__(self, length: int):
+        self.length = length
+
+
+@dataclass(slots=True)
+class SeekIndex:
+    init_end: int                  # bytes [0, init_end) set up a decoder
+    times: list[float]             # seconds, ascending
+    offsets: list[int]             # absolute byte offset of the data starting at times[i]
+
+    def locate(self, position: float) -> Optional[tuple[float, int]]:
+        """(time, byte offset) of the last index point at or before `position`."""
+        i = bisect.bisect_right(self.times, position) - 1
+        return (self.times[i], self.offsets[i]) if i >= 0 else None
+
+
+# ---------------------------------------------------------------------------
+# WebM
+# ---------------------------------------------------------------------------
+
+def _vint(data: bytes, pos: int, marker: bool) -> tuple[int, int]:
+    """An EBML variable-length integer at `pos`: (value, next pos). IDs keep their `marker`."""
+    if pos >= len(data):
+        raise IndexError
+    first = data[pos]
+    length, mask = 1, 0x80
+    while not first & mask:
+        length += 1
+        mask >>= 1
+        if length > 8:
+            raise ValueError("invalid EBML length")
+    if pos + length > len(data):
+        raise IndexError
+    value = first if marker else first & (mask - 1)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+    return value, pos + length
+
+
+def _element(data: bytes, pos: int) -> tuple[int, int, int]:
+    """(id, data start, size) of the element at `pos`; unknown sizes run to the end of `data`."""
+    element_id, pos = _vint(data, pos, marker=True)
+    size_start = pos
+    size, pos = _vint(data, pos, marker=False)
+    if size == (1 << (7 * (pos - size_start))) - 1:  # all ones: unknown size
+        size = len(data) - pos
+    return element_id, pos, size
+
+
+def _children(data: bytes, start: int, end: int):
+    pos = start
+    while pos < end:
+        element_id, child, size = _element(data, pos)
+        yield element_id, child, size
+        pos = child + size
+
+
+def _uint(data: bytes, start: int, size: int) -> int:
+    return int.from_bytes(data[start:start + size], "big")
+
+
+def webm_layout(data: bytes) -> tuple[int, int, int]:
+    """
+    (segment data offset, timestamp scale, Cues offset) from the first
+    bytes of a WebM stream. Offsets are absolute.
+    """
+    element_id, pos, size = _element(data, 0)
+    if element_id != _EBML:
+        raise ValueError("not a WebM/Matroska stream")
+    element_id, segment_start, _ = _element(data, pos + size)
+    if element_id != _SEGMENT:
+        raise ValueError("no Segment element")
+
+    scale, cues_at, pos = 1_000_000, None, segment_start
+    try:
+        while pos < len(data):
+            element_id, child, size = _element(data, pos)
+            if element_id == _CUES:
+                cues_at = pos
+            if element_id in (_CLUSTER, _CUES):
+                break
+            if element_id in (_INFO, _SEEK_HEAD) and child + size > len(data):
+                raise ValueError("WebM headers larger than the first fetch")
+            if element_id == _INFO:
+                for sub_id, sub, sub_size in _children(data, child, child + size):
+                    if sub_id == _TIMESTAMP_SCALE:
+                        scale = _uint(data, sub, sub_size)
+            elif element_id == _SEEK_HEAD:
+                for seek_id, seek, seek_size in _children(data, child, child + size):
+                    fields = {k: (s, n) for k, s, n in _children(data, seek, seek + seek_size)}
+                    if seek_id == _SEEK and _SEEK_ID in fields and _SEEK_POSITION in fields:
+                        if _uint(data, *fields[_SEEK_ID]) == _CUES:
+                            cues_at = segment_start + _uint(data, *fields[_SEEK_POSITION])
+            pos = child + size
+    except IndexError:
+        pass  # ran off the fetched bytes between elements; the SeekHead is all we need
+    if cues_at is None:
+        raise ValueError("no Cues")
+    return segment_start, scale, cues_at
+
+
+def webm_cues(data: bytes, segment_start: int, scale: int) -> SeekIndex:
+    """Index from bytes starting at the Cues element."""
+    element_id, start, size = _element(data, 0)
+    if element_id != _CUES:
+        raise ValueError("Cues not where the SeekHead says")
+    if start + size > len(data):
+        raise _NeedMore(start + size)
+    return _webm_cues(data, start, start + size, segment_start, scale)
+
+
+def _webm_cues(data: bytes, start: int, end: int, segment_start: int, scale: int) -> SeekIndex:
+    points = []
+    for element_id, child, size in _children(data, start, end):
+        if element_id != _CUE_POINT:
+            continue
+        time = cluster = None
+        for sub_id, sub, sub_size in _children(data, child, child + size):
+            if sub_id == _CUE_TIME:
+                time = _uint(data, sub, sub_size)
+            elif sub_id == _CUE_TRACK_POSITIONS and cluster is None:
+                for pos_id, pos, pos_size in _children(data, sub, sub + sub_size):
+                    if pos_id == _CUE_CLUSTER_POSITION:
+                        cluster = _uint(data, pos, pos_size)
+        if time is not None and cluster is not None:
+            points.append((time * scale / 1e9, segment_start + cluster))
+    if not points:
+        raise ValueError("empty Cues")
+    points.sort()
+    # Everything before the first cluster is what a decoder needs to start
+    return SeekIndex(
+        init_end=min(offset for _, offset in points),
+        times=[t for t, _ in points],
+        offsets=[o for _, o in points],
+    )
+
+
+# ---------------------------------------------------------------------------
+# MP4
+# ---------------------------------------------------------------------------
+
+def parse_mp4(data: bytes) -> SeekIndex:
+    """Index from a fragmented MP4's `sidx` box (which must be in `data`)."""
+    pos, init_end = 0, None
+    while pos + 8 <= len(data):
+        size, kind = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            size, = struct.unpack_from(">Q", data, pos + 8)
+            header = 16
+        elif size == 0:
+            size = len(data) - pos
+        if kind == b"moov":
+            init_end = pos + size
+        elif kind == b"sidx":
+            if pos + size > len(data):
+                raise _NeedMore(pos + size)
+            if init_end is None:
+                raise ValueError("sidx before moov")
+            return _mp4_sidx(data, pos + header, pos + size, init_end)
+        elif kind in (b"moof", b"mdat"):
+            break
+        pos += size
+    if pos + 8 > len(data) and init_end is None:
+        raise _NeedMore(pos + HEAD_BYTES)  # moov runs past the fetched bytes
+    raise ValueError("no sidx (not a fragmented MP4)")
+
+
+def _mp4_sidx(data: bytes, pos: int, end: int, init_end: int) -> SeekIndex:
+    version = data[pos]
+    pos += 4 + 4  # version/flags, reference_ID
+    timescale, = struct.unpack_from(">I", data, pos)
+    pos += 4
+    if version == 0:
+        earliest, first_offset = struct.unpack_from(">II", data, pos)
+        pos += 8
+    else:
+        earliest, first_offset = struct.unpack_from(">QQ", data, pos)
+        pos += 16
+    count, = struct.unpack_from(">2xH", data, pos)
+    pos += 4
+    times, offsets = [], []
+    time, offset = earliest, end + first_offset
+    for _ in range(count):
+        reference, duration = struct.unpack_from(">II", data, pos)
+        pos += 12
+        if reference >> 31:
+            raise ValueError("hierarchical sidx not supported")
+        times.append(time / timescale)
+        offsets.append(offset)
+        time += duration
+        offset += reference & 0x7FFFFFFF
+    if not times:
+        raise ValueError("empty sidx")
+    return SeekIndex(init_end=init_end, times=times, offsets=offsets)
+
+
+# ---------------------------------------------------------------------------
+# Index builder + local range proxy
+# ---------------------------------------------------------------------------
+
+class RangeSeeker:
+    """Builds seek indexes for stream URLs and serves indexed seeks from a local proxy."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self._host = host
+        self._session = None   # aiohttp.ClientSession, created on first use (needs the loop)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._port = 0
+        self._start_lock = asyncio.Lock()
+        self._registrations: OrderedDict[str, tuple[str, int, int]] = OrderedDict()
+
+    def _http(self):
+        if self._session is None:
+            import aiohttp  # discord.py's own HTTP client, so always installed alongside it
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(sock_read=INDEX_TIMEOUT))
+        return self._session
+
+    async def _fetch(self, url: str, offset: int, length: int) -> bytes:
+        headers = {"Range": f"bytes={offset}-{offset + length - 1}"}
+        async with self._http().get(url, headers=headers) as response:
+            if response.status != 206:
+                raise ValueError(f"no range support (HTTP {response.status})")
+            return await response.content.read(length)
+
+    async def build(self, url: str) -> Optional[SeekIndex]:
+        """The stream's seek index, or None if it has no usable one."""
+        try:
+            index = await asyncio.wait_for(self._build(url), INDEX_TIMEOUT)
+        except Exception as e:
+            SEEK_INDEX_BUILDS.inc(result="unavailable")
+            log.debug("No seek index for stream: %s", e)
+            return None
+        SEEK_INDEX_BUILDS.inc(result="ok")
+        log.debug("Seek index built: %d points, init segment %d bytes", len(index.times), index.init_end)
+        return index
+
+    async def _build(self, url: str) -> SeekIndex:
+        head = await self._fetch(url, 0, HEAD_BYTES)
+        if head[:4] == b"\x1a\x45\xdf\xa3":
+            segment_start, scale, cues_at = webm_layout(head)
+            data = head[cues_at:] if cues_at < len(head) else await self._fetch(url, cues_at, HEAD_BYTES)
+            try:
+                return webm_cues(data, segment_start, scale)
+            except _NeedMore as more:
+                return webm_cues(await self._fetch(url, cues_at, self._limit(more)), segment_start, scale)
+        try:
+            return parse_mp4(head)
+        except _NeedMore as more:
+            return parse_mp4(await self._fetch(url, 0, self._limit(more)))
+
+    @staticmethod
+    def _limit(more: _NeedMore) -> int:
+        if more.length > MAX_INDEX_BYTES:
+            raise ValueError(f"index too large ({more.length} bytes)")
+        return more.length
+
+    # -- proxy ------------------------------------------------------------
+
+    async def proxy_url(self, url: str, index: SeekIndex, offset: int) -> str:
+        """A local URL streaming `url`'s init segment, then `url` from byte `offset`."""
+        async with self._start_lock:
+            if self._server is None:
+                self._server = await asyncio.start_server(self._handle, self._host, 0)
+                self._port = self._server.sockets[0].getsockname()[1]
+                log.info(f"Seek proxy listening on {self._host}:{self._port}")
+        token = secrets.token_urlsafe(12)
+        self._registrations[token] = (url, index.init_end, offset)
+        while len(self._registrations) > MAX_REGISTRATIONS:
+            self._registrations.popitem(last=False)
+        return f"http://{self._host}:{self._port}/{token}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            registration = self._registrations.pop(parts[1].lstrip("/"), None) if len(parts) >= 2 else None
+            if registration is None:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+            url, init_end, offset = registration
+            # No Content-Length or Accept-Ranges: ffmpeg treats the stream as
+            # unseekable and reads it front to back, as we want
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\nConnection: close\r\n\r\n")
+            await self._relay(url, 0, init_end, writer)
+            await self._relay(url, offset, None, writer)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass  # ffmpeg went away (stopped, skipped, seeked again)
+        except Exception as e:
+            log.warning(f"Seek proxy stream failed: {e}")
+        finally:
+            writer.close()
+
+    async def _relay(self, url: str, start: int, end: Optional[int], writer: asyncio.StreamWriter) -> None:
+        """Copy bytes [start, end) of `url` (to EOF if `end` is None), resuming if the upstream drops."""
+        position = start
+        for attempt in range(UPSTREAM_RETRIES + 1):
+            headers = {"Range": f"bytes={position}-{'' if end is None else end - 1}"}
+            try:
+                async with self._http().get(url, headers=headers) as response:
+                    if response.status != 206:
+                        raise ValueError(f"HTTP {response.status} for range {position}-")
+                    async for chunk in response.content.iter_chunked(CHUNK):
+                        writer.write(chunk)
+                        position += len(chunk)
+                        await writer.drain()
+                return
+            except ConnectionError:
+                raise  # our side: ffmpeg hung up
+            except Exception as e:
+                if attempt == UPSTREAM_RETRIES or (end is not None and position >= end):
+                    raise
+                log.debug("Seek proxy upstream dropped at byte %d (%s); resuming", position, e)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        if self._session is not None:
+            await self._session.close()
+
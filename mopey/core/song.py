@@ -1,16 +1,31 @@
 """
 Song dataclass — the single shared data contract between sources, the queue,
 the player, and the UI. Both YouTube and Plex produce one of these.
+
+Songs are held by the thousand in queues, caches and saved state, so the
+class is slotted (no per-instance __dict__) and the strings most often
+repeated across songs — artist, album and thumbnail — are interned so every
+song by the same artist shares one string object.
+
+The stream URL is the bulky part of a song (YouTube's are ~1 KB). Only
+resolved songs carry one: search results leave `url` empty until the player
+resolves them, and when `url` and `link` are equal (Plex) they share a
+single string.
 """
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class Song:
     title: str
-    url: str            # The actual streamable audio URL
+    url: str            # The actual streamable audio URL ("" until resolved)
     link: str           # The original link/identifier (YouTube URL, Plex stream URL)
     duration: int       # Seconds
 
@@ -19,6 +34,13 @@ class Song:
     album: Optional[str] = None
     thumbnail: Optional[str] = None
 
+    def __post_init__(self):
+        self.artist = _intern(self.artist)
+        self.album = _intern(self.album)
+        self.thumbnail = _intern(self.thumbnail)
+        if self.url == self.link:
+            self.url = self.link  # share one string rather than holding two copies
+
     def to_dict(self) -> dict:
         """Convenience for any legacy code paths that expect a plain dict."""
         return {
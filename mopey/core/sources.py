@@ -6,20 +6,47 @@ YouTubeSource and PlexSource implement it.
 
 The GuildPlayer and commands never branch on "is this Plex or YouTube?" —
 they just call these methods and get back Song objects.
+
+yt_dlp and plexapi are slow to import and their clients slow to build, so
+both are deferred: sources are cheap to construct, and warm_up() (run in
+the background after the bot is ready) pays the cost before the first
+.play does. Whichever comes first builds the client, exactly once.
 """
 
 import asyncio
+import os
+import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import contextmanager, nullcontext
+from time import time
+from typing import TYPE_CHECKING, Optional
 
-import yt_dlp
-from plexapi.server import PlexServer
+try:
+    import fcntl
+except ImportError:  # Windows: warm-up isn't serialised across processes
+    fcntl = None
 
+from .hedge import hedged
 from .song import Song
+from ..utils import tracing
 from ..utils.log import get_logger
+from ..utils.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    import yt_dlp
+    from .admission import AdmissionController
+    from plexapi.server import PlexServer
 
 log = get_logger(__name__)
 
+SOURCE_SECONDS = REGISTRY.histogram(
+    "mopey_source_seconds", "Search/resolve latency per source", ["source", "op"]
+)
+SOURCE_ERRORS = REGISTRY.counter(
+    "mopey_source_errors_total", "Search/resolve calls that raised", ["source", "op"]
+)
+
 
 # ---------------------------------------------------------------------------
 # Base class
@@ -46,6 +73,10 @@ class AudioSource(ABC):
         """
         ...
 
+    async def warm_up(self) -> None:
+        """Import and build whatever the source needs, ahead of first use."""
+        return None
+
 
 # ---------------------------------------------------------------------------
 # YouTube
@@ -67,6 +98,67 @@ YTDL_OPTIONS_RESOLVE = {
     "playlist_items": "1",
 }
 
+# yt-dlp caches YouTube's player JS and solved signature/n-parameter functions
+# under `cachedir`. The default (~/.cache/yt-dlp) is lost on container restarts;
+# point ytdl_cache_dir at a volume so the solving survives them.
+DEFAULT_YTDL_CACHE_DIR = "ytdl_cache"
+YTDL_CACHE_MAX_AGE = 30 * 24 * 3600   # player versions rotate; prune entries older than this
+# A stable, always-available video whose extraction fetches the current player
+WARMUP_VIDEO = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
+
+# Hedging: extraction time is long-tailed (player JS fetches, throttled
+# clients), so a late call is retried on another player client rather than
+# waited out. Env-configurable in bot.py.
+HEDGE_AFTER = 4.0           # seconds before launching alternates
+SEARCH_DEADLINE = 20.0      # seconds before giving up on a search
+RESOLVE_DEADLINE = 15.0     # seconds before giving up on a resolve
+FALLBACK_DURATION_SLACK = 10  # seconds a fallback track's length may differ by
+FALLBACK_MIN_OVERLAP = 0.6    # share of the wanted title's words a fallback track must cover
+YTDL_ALT_EXTRACTOR_ARGS = {"youtube": {"player_client": ["web_safari", "mweb"]}}
+
+_CLIENT_OPTIONS = {
+    "search": YTDL_OPTIONS,
+    "resolve": YTDL_OPTIONS_RESOLVE,
+    "search_alt": {**YTDL_OPTIONS, "extractor_args": YTDL_ALT_EXTRACTOR_ARGS},
+    "resolve_alt": {**YTDL_OPTIONS_RESOLVE, "extractor_args": YTDL_ALT_EXTRACTOR_ARGS},
+}
+
+
+@contextmanager
+def _cache_lock(cache_dir: str):
+    """
+    Exclusive cross-process lock on the cache directory. While one process
+    warms the cache, others sharing it wait and then hit the entries it wrote
+    instead of solving the same player challenges in parallel.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(cache_dir, ".lock"), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _prune_cache(cache_dir: str, max_age: float = YTDL_CACHE_MAX_AGE) -> int:
+    """Delete cache files not modified within `max_age` seconds. Returns the count."""
+    cutoff = time() - max_age
+    removed = 0
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            if name == ".lock":
+                continue
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
 
 def _classify_ytdl_error(error: Exception) -> str:
     """
@@ -92,15 +184,128 @@ class VideoUnavailableError(Exception):
     pass
 
 
+class ExtractionFailed(Exception):
+    """An extraction attempt produced no usable result."""
+    pass
+
+
 def _is_url(query: str) -> bool:
     return query.startswith("http://") or query.startswith("https://")
 
 
+_TITLE_NOISE = re.compile(
+    r"[\(\[][^)\]]*[\)\]]|\b(?:official|video|audio|lyrics?|hd|4k)\b|[^\w\s]", re.IGNORECASE
+)
+
+
+def normalise_title(title: str) -> str:
+    """Lowercase title without bracketed tags and 'official video'-style noise."""
+    return " ".join(_TITLE_NOISE.sub(" ", title).lower().split())
+
+
+def title_words(*parts: Optional[str]) -> set[str]:
+    """The normalised words of `parts` (title, artist, ...), skipping missing ones."""
+    return set(normalise_title(" ".join(filter(None, parts))).split())
+
+
 class YouTubeSource(AudioSource):
+    """
+    yt-dlp backed source. search() and resolve() are deadline-bounded and
+    hedged: if the primary extraction is slower than `hedge_after`, the same
+    extraction is started on an alternate YouTube player client and, for
+    resolve, a matching track is looked up on the `fallback` source (Plex).
+    Whichever finishes first wins.
+    """
 
-    def __init__(self):
-        self._ytdl = yt_dlp.YoutubeDL(YTDL_OPTIONS)
-        self._ytdl_resolve = yt_dlp.YoutubeDL(YTDL_OPTIONS_RESOLVE)
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DEFAULT_YTDL_CACHE_DIR,
+        hedge_after: Optional[float] = HEDGE_AFTER,
+        search_deadline: Optional[float] = SEARCH_DEADLINE,
+        resolve_deadline: Optional[float] = RESOLVE_DEADLINE,
+        fallback: Optional[AudioSource] = None,
+        admission: Optional["AdmissionController"] = None,
+    ):
+        """
+        `cache_dir` of None keeps yt-dlp's default cache location.
+        `hedge_after` of None disables hedging; a deadline of None disables it.
+        With `admission`, extractions share its concurrency budget.
+        """
+        self._cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+        self._hedge_after = hedge_after
+        self._search_deadline = search_deadline
+        self._resolve_deadline = resolve_deadline
+        self._fallback = fallback
+        self._admission = admission
+        self._clients: dict[str, "yt_dlp.YoutubeDL"] = {}
+        self._build_lock = threading.Lock()
+
+    def set_fallback(self, source: Optional[AudioSource]) -> None:
+        """Source searched for a matching track when a resolve is slow (e.g. Plex)."""
+        self._fallback = source
+
+    def _client(self, kind: str) -> "yt_dlp.YoutubeDL":
+        """The YoutubeDL instance for `kind` (see _CLIENT_OPTIONS), built on first use. Blocking."""
+        client = self._clients.get(kind)
+        if client is None:
+            with self._build_lock:
+                client = self._clients.get(kind)
+                if client is None:
+                    import yt_dlp
+                    cache = {"cachedir": self._cache_dir} if self._cache_dir else {}
+                    client = self._clients[kind] = yt_dlp.YoutubeDL({**_CLIENT_OPTIONS[kind], **cache})
+                    log.info(f"yt-dlp {kind} client loaded (cache: {self._cache_dir or 'default'})")
+        return client
+
+    def _warm_cache(self) -> None:
+        """
+        Build the clients and run one extraction through each player client, so
+        the current player JS and its solved signature functions are on disk
+        and in memory before the first user request. Blocking.
+        """
+        for kind in _CLIENT_OPTIONS:
+            self._client(kind)
+        # Without a cache_dir yt-dlp uses its default location; still worth warming
+        lock = nullcontext()
+        if self._cache_dir:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            lock = _cache_lock(self._cache_dir)
+        failed = []
+        with lock:
+            if self._cache_dir:
+                pruned = _prune_cache(self._cache_dir)
+                if pruned:
+                    log.info(f"Pruned {pruned} stale yt-dlp cache file(s)")
+            # Search clients share these player clients and read what these write
+            for kind in ("resolve", "resolve_alt"):
+                with SOURCE_SECONDS.time(source="youtube", op="warm_up"):
+                    # ignoreerrors: a failed extraction returns None rather than raising
+                    if not self._client(kind).extract_info(WARMUP_VIDEO, download=False):
+                        failed.append(kind)
+        if failed:
+            log.warning(f"yt-dlp warm-up extraction failed ({', '.join(failed)}); first requests may be slow")
+        else:
+            log.info("yt-dlp extraction cache warm")
+
+    async def warm_up(self) -> None:
+        await asyncio.get_event_loop().run_in_executor(None, self._warm_cache)
+
+    async def _extract(self, kind: str, target: str, started: Optional[asyncio.Event] = None) -> dict:
+        """
+        extract_info on the `kind` client in an executor thread, within the
+        extraction budget. `started` is set once it has a slot and is running.
+        """
+        work = tracing.bind(lambda: self._client(kind).extract_info(target, download=False))
+        if self._admission is not None:
+            data = await self._admission.run_extraction(work, kind=kind, on_slot=started and started.set)
+        else:
+            if started is not None:
+                started.set()
+            data = await asyncio.get_event_loop().run_in_executor(None, work)
+        if not data:
+            # ignoreerrors makes yt-dlp return None instead of raising
+            raise ExtractionFailed(f"yt-dlp returned nothing for {target}")
+        return data
 
     async def search(self, query: str, limit: int = 3) -> list[Song]:
         """
@@ -114,23 +319,33 @@ class YouTubeSource(AudioSource):
             return [song]
 
         log.info(f"YouTube search: {query!r} (limit={limit})")
-        loop = asyncio.get_event_loop()
+        target = f"ytsearch{limit}:{query}"
+        # Hedges wait for the primary's extraction slot: time queued isn't slowness
+        started = asyncio.Event()
         try:
-            data = await loop.run_in_executor(
-                None,
-                lambda: self._ytdl.extract_info(f"ytsearch{limit}:{query}", download=False)
-            )
+            with SOURCE_SECONDS.time(source="youtube", op="search"):
+                data = await hedged(
+                    "youtube_search",
+                    primary=lambda: self._extract("search", target, started),
+                    alternates={"alt_client": lambda: self._extract("search_alt", target)},
+                    hedge_after=self._hedge_after,
+                    deadline=self._search_deadline,
+                    primary_started=started,
+                )
         except Exception as e:
+            SOURCE_ERRORS.inc(source="youtube", op="search")
             friendly = _classify_ytdl_error(e)
             if friendly:
                 raise VideoUnavailableError(friendly) from e
             raise
-        entries = [e for e in (data.get("entries", []) if data else []) if e is not None]
+        entries = [e for e in data.get("entries", []) if e is not None]
         songs = []
         for entry in entries[:limit]:
+            # The stream URL from a search result is never played — resolve()
+            # re-extracts a fresh one at play time — so don't carry it around.
             songs.append(Song(
                 title=entry.get("title", "Unknown Title"),
-                url=entry.get("url", ""),
+                url="",
                 link=entry.get("webpage_url", ""),
                 duration=entry.get("duration", 0),
                 thumbnail=entry.get("thumbnail"),
@@ -142,24 +357,37 @@ class YouTubeSource(AudioSource):
         """
         Re-extract to get a fresh, playable stream URL from the YouTube page URL.
         Raises VideoUnavailableError for known issues (age restriction, region block, etc.)
+        and DeadlineExceeded if no attempt finishes within the resolve deadline.
         """
-        log.debug(f"YouTube resolving stream URL for: {song.link}")
-        loop = asyncio.get_event_loop()
+        log.debug("YouTube resolving stream URL for: %s", song.link)
+        alternates = {"alt_client": lambda: self._resolve_with("resolve_alt", song)}
+        if self._fallback is not None and song.title:
+            alternates["fallback"] = lambda: self._resolve_from_fallback(song)
+        started = asyncio.Event()
         try:
-            data = await loop.run_in_executor(
-                None,
-                lambda: self._ytdl_resolve.extract_info(song.link, download=False)
-            )
+            with SOURCE_SECONDS.time(source="youtube", op="resolve"):
+                resolved = await hedged(
+                    "youtube_resolve",
+                    primary=lambda: self._resolve_with("resolve", song, started),
+                    alternates=alternates,
+                    hedge_after=self._hedge_after,
+                    deadline=self._resolve_deadline,
+                    primary_started=started,
+                )
         except Exception as e:
+            SOURCE_ERRORS.inc(source="youtube", op="resolve")
             friendly = _classify_ytdl_error(e)
             if friendly:
                 raise VideoUnavailableError(friendly) from e
             raise
+        log.debug("YouTube resolved: %r (%ss)", resolved.title, resolved.duration)
+        return resolved
 
+    async def _resolve_with(self, kind: str, song: Song, started: Optional[asyncio.Event] = None) -> Song:
+        data = await self._extract(kind, song.link, started)
         if "entries" in data:
             data = data["entries"][0]
-
-        resolved = Song(
+        return Song(
             title=data.get("title", song.title),
             url=data["url"],
             link=song.link,
@@ -168,8 +396,37 @@ class YouTubeSource(AudioSource):
             artist=song.artist,
             album=song.album,
         )
-        log.debug(f"YouTube resolved: {resolved.title!r} ({resolved.duration}s)")
-        return resolved
+
+    async def _resolve_from_fallback(self, song: Song) -> Song:
+        """
+        A matching track from the fallback source. The YouTube link is kept so
+        the queue, prefetch and Now Playing still see the same song.
+        """
+        if not song.duration:
+            raise ExtractionFailed(f"No fallback for {song.title!r}: duration unknown")
+        # YouTube titles are often "Artist - Title"; libraries index the title alone
+        query = normalise_title(song.title.split(" - ", 1)[-1]) or normalise_title(song.title)
+        wanted = title_words(song.title, song.artist)
+        for candidate in await self._fallback.search(query, limit=3):
+            # Every word of the candidate's title and artist must appear in the
+            # wanted title, and together they must cover most of it
+            title = title_words(candidate.title)
+            words = title | title_words(candidate.artist)
+            if not title or not words <= wanted or len(words) < FALLBACK_MIN_OVERLAP * len(wanted):
+                continue
+            if not candidate.duration or abs(song.duration - candidate.duration) > FALLBACK_DURATION_SLACK:
+                continue
+            candidate = await self._fallback.resolve(candidate)
+            return Song(
+                title=candidate.title,
+                url=candidate.url,
+                link=song.link,
+                duration=candidate.duration,
+                thumbnail=song.thumbnail,
+                artist=candidate.artist,
+                album=candidate.album,
+            )
+        raise ExtractionFailed(f"No fallback match for {song.title!r}")
 
 
 # ---------------------------------------------------------------------------
@@ -181,18 +438,27 @@ class PlexSource(AudioSource):
     def __init__(self, base_url: str, token: str):
         self._base_url = base_url
         self._token = token
-        self._plex: Optional[PlexServer] = None
+        self._plex: Optional["PlexServer"] = None
+        self._connect_lock = threading.Lock()
 
-    def _get_connection(self) -> Optional[PlexServer]:
+    def _get_connection(self) -> Optional["PlexServer"]:
         if self._plex:
             return self._plex
-        try:
-            self._plex = PlexServer(self._base_url, self._token)
-            log.info("Connected to Plex server.")
-        except Exception as e:
-            log.error(f"Failed to connect to Plex: {e}", exc_info=True)
-            self._plex = None
-        return self._plex
+        # Warm-up and the first search may race from executor threads; connect once
+        with self._connect_lock:
+            if self._plex:
+                return self._plex
+            try:
+                from plexapi.server import PlexServer
+                self._plex = PlexServer(self._base_url, self._token)
+                log.info("Connected to Plex server.")
+            except Exception as e:
+                log.error(f"Failed to connect to Plex: {e}", exc_info=True)
+                self._plex = None
+            return self._plex
+
+    async def warm_up(self) -> None:
+        await asyncio.get_event_loop().run_in_executor(None, self._get_connection)
 
     def _build_stream_url(self, track) -> str:
         media_part = track.media[0].parts[0]
@@ -225,10 +491,12 @@ class PlexSource(AudioSource):
             try:
                 return conn.search(query, mediatype="track")
             except Exception as e:
+                SOURCE_ERRORS.inc(source="plex", op="search")
                 log.error(f"Plex search failed for query {query!r}: {e}", exc_info=True)
                 return []
 
-        results = await loop.run_in_executor(None, _search)
+        with SOURCE_SECONDS.time(source="plex", op="search"):
+            results = await loop.run_in_executor(None, _search)
         songs = []
         for track in results[:limit]:
             song = self._track_to_song(track)
@@ -238,6 +506,28 @@ class PlexSource(AudioSource):
         log.info(f"Plex search {query!r} → {len(songs)} result(s)")
         return songs
 
+    async def list_tracks(self, limit: int) -> list[Song]:
+        """
+        Fetch up to `limit` tracks from the music library, e.g. to build a
+        local autocomplete index. Runs synchronous PlexAPI calls in executor.
+        """
+        loop = asyncio.get_event_loop()
+
+        def _list():
+            conn = self._get_connection()
+            if not conn:
+                return []
+            try:
+                return conn.library.search(libtype="track", maxresults=limit)
+            except Exception as e:
+                log.error(f"Plex track listing failed: {e}", exc_info=True)
+                return []
+
+        tracks = await loop.run_in_executor(None, _list)
+        songs = [song for song in map(self._track_to_song, tracks) if song]
+        log.info(f"Plex library listing → {len(songs)} track(s)")
+        return songs
+
     async def resolve(self, song: Song) -> Song:
         """Plex stream URLs are already fully resolved at search time — nothing to do."""
         return song
\ No newline at end of file
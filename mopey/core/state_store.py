@@ -0,0 +1,183 @@
+"""
+PlayerStateStore — crash-safe persistence of GuildPlayer state.
+
+Snapshots are appended to a local SQLite database running in WAL mode, so
+a write is a single small insert and a crash can never leave a half-written
+snapshot behind. Three kinds of row are appended per guild:
+
+    state     — the full snapshot (queue, current song, channels, ...)
+                written only when the player's structure changes
+    position  — just the playback position, written on every save tick
+                while something is playing (a few bytes)
+    clear     — a tombstone: the guild stopped playing, don't restore it
+
+Reading back takes the latest `state` per guild and overlays the latest
+`position` written after it. `compact()` deletes superseded rows so the
+file stays small.
+
+This module has no Discord imports — it only deals in plain dicts.
+"""
+
+import json
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import time
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+from ..utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_STATE_PATH = "mopey_state.db"
+
+# Don't trust a saved stream URL that expires within this many seconds
+URL_EXPIRY_MARGIN = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_state (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id  INTEGER NOT NULL,
+    saved_at  REAL    NOT NULL,
+    kind      TEXT    NOT NULL,
+    payload   TEXT
+);
+CREATE INDEX IF NOT EXISTS player_state_guild ON player_state (guild_id, kind, seq);
+"""
+
+
+def stream_url_expired(url: str, margin: int = URL_EXPIRY_MARGIN) -> bool:
+    """
+    True if a resolved stream URL is known to have expired (or will shortly).
+    YouTube stream URLs carry an `expire=<unix time>` query parameter; URLs
+    without one (e.g. Plex) are treated as non-expiring.
+    """
+    if not url:
+        return True
+    try:
+        expire = parse_qs(urlparse(url).query).get("expire")
+        if expire:
+            return int(expire[0]) - margin <= time()
+    except ValueError:
+        return True
+    return False
+
+
+class PlayerStateStore:
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self._path = path
+        self._lock = threading.Lock()  # writes come from executor threads
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints, fast commits
+        self._conn.executescript(_SCHEMA)
+        # One writer thread keeps appends in submission order (a 'clear' can
+        # never land before a 'state' submitted ahead of it)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mopey-state")
+        log.info(f"Player state store opened: {path}")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, rows: list[tuple[int, str, Optional[dict]]]) -> None:
+        """
+        Append a batch of (guild_id, kind, payload) rows in one transaction.
+        `kind` is 'state', 'position', or 'clear'.
+        """
+        if not rows:
+            return
+        now = time()
+        params = [
+            (guild_id, now, kind, json.dumps(payload) if payload is not None else None)
+            for guild_id, kind, payload in rows
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO player_state (guild_id, saved_at, kind, payload) VALUES (?, ?, ?, ?)",
+                    params,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def submit(self, rows: list[tuple[int, str, Optional[dict]]]) -> Future:
+        """Queue `append(rows)` on the writer thread. Wrap with asyncio.wrap_future to await."""
+        return self._writer.submit(self.append, rows)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def load_all(self) -> dict[int, dict]:
+        """
+        Return the latest restorable state for every guild, with `position`
+        updated from any newer position heartbeat.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT guild_id, kind, payload FROM player_state
+                WHERE seq IN (
+                    SELECT MAX(seq) FROM player_state GROUP BY guild_id, kind
+                )
+                ORDER BY seq
+                """
+            ).fetchall()
+
+        states: dict[int, dict] = {}
+        for guild_id, kind, payload in rows:
+            # Rows are ordered by seq, so a later clear wipes an earlier state,
+            # and a position only applies if it came after the surviving state.
+            if kind == "clear":
+                states.pop(guild_id, None)
+            elif kind == "state":
+                states[guild_id] = json.loads(payload)
+            elif kind == "position" and guild_id in states:
+                states[guild_id]["position"] = json.loads(payload)["position"]
+        return states
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def compact(self) -> None:
+        """Delete rows superseded by a newer state/clear row for the same guild."""
+        with self._lock:
+            self._conn.execute(
+                """
+                DELETE FROM player_state
+                WHERE seq < (
+                    SELECT MAX(p.seq) FROM player_state p
+                    WHERE p.guild_id = player_state.guild_id
+                      AND p.kind IN ('state', 'clear')
+                )
+                OR (
+                    kind = 'position' AND seq < (
+                        SELECT MAX(p.seq) FROM player_state p
+                        WHERE p.guild_id = player_state.guild_id AND p.kind = 'position'
+                    )
+                )
+                """
+            )
+            # A guild whose newest row is a tombstone needs no rows at all
+            self._conn.execute(
+                """
+                DELETE FROM player_state
+                WHERE kind = 'clear' AND seq = (
+                    SELECT MAX(p.seq) FROM player_state p
+                    WHERE p.guild_id = player_state.guild_id
+                )
+                """
+            )
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
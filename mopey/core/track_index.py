@@ -0,0 +1,74 @@
+"""
+TrackIndex — a bounded, in-memory index of known tracks for autocomplete.
+
+Slash command autocomplete must answer within Discord's 3 second deadline,
+which rules out calling yt-dlp or Plex per keystroke. Instead the cogs feed
+this index with songs they already have (recent YouTube results, the Plex
+library) and autocomplete only ever reads from memory.
+
+Matching is case-insensitive: every word of the query must appear in the
+track's "title artist album" text. Newest entries are returned first.
+The index holds at most `max_size` songs, evicting the least recently added.
+"""
+
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from .song import Song
+from ..utils.formatting import format_time
+
+MAX_CHOICE_LENGTH = 100  # Discord's limit for choice names and values
+
+
+def choice_label(song: Song) -> str:
+    """Human-readable autocomplete label, e.g. 'Title — Artist (3:45)'."""
+    artist = f" — {song.artist}" if song.artist else ""
+    suffix = f" ({format_time(song.duration)})" if song.duration else ""
+    label = f"{song.title}{artist}"
+    return label[: MAX_CHOICE_LENGTH - len(suffix)] + suffix
+
+
+class TrackIndex:
+
+    def __init__(self, max_size: int = 2_000):
+        self.max_size = max_size
+        # link -> (song, lowercase search text); order is recency
+        self._entries: OrderedDict[str, tuple[Song, str]] = OrderedDict()
+        self._labels: dict[str, str] = {}  # choice label -> link
+
+    def add(self, song: Song) -> None:
+        if not song.link:
+            return
+        text = " ".join(filter(None, (song.title, song.artist, song.album))).lower()
+        self._entries[song.link] = (song, text)
+        self._entries.move_to_end(song.link, last=False)
+        self._labels[choice_label(song)] = song.link
+        while len(self._entries) > self.max_size:
+            link, (evicted, _) = self._entries.popitem()
+            label = choice_label(evicted)
+            if self._labels.get(label) == link:
+                del self._labels[label]
+
+    def add_many(self, songs: Iterable[Song]) -> None:
+        for song in songs:
+            self.add(song)
+
+    def search(self, query: str, limit: int = 25) -> list[Song]:
+        """Up to `limit` songs whose text contains every word of `query`."""
+        words = query.lower().split()
+        results = []
+        for song, text in self._entries.values():
+            if all(word in text for word in words):
+                results.append(song)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def lookup(self, label: str) -> Optional[Song]:
+        """The song an autocomplete choice label was generated from, if still indexed."""
+        link = self._labels.get(label)
+        entry = self._entries.get(link) if link else None
+        return entry[0] if entry else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
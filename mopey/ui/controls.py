@@ -4,65 +4,95 @@ PlaybackControls — the button row shown under Now Playing embeds.
 Key improvement over the original: buttons call the MusicCog's player
 methods directly instead of re-invoking commands by string name.
 This means they work correctly even if command names change.
+
+There is exactly one PlaybackControls instance for the whole bot. It is a
+persistent view (no timeout, stable custom_ids) registered once at startup
+with bot.add_view, so every Now Playing message shares it, memory doesn't
+grow with the number of messages sent, and buttons on messages sent before
+a restart keep working. Each press is routed by interaction.guild_id.
+
+Messages are sent with detached() rather than the registered instance:
+discord.py stores a dispatch entry per message for any live view sent
+with one, which would grow without bound; a stopped copy renders the same
+buttons and isn't stored.
 """
 
-import discord
+from discord.ext import commands
 from discord.ui import View, button
 from discord import ButtonStyle, Interaction
 
+CUSTOM_ID_PREFIX = "mopey:controls:"
+
 
 class PlaybackControls(View):
 
-    def __init__(self, ctx_or_channel, bot: discord.ext.commands.Bot):
+    def __init__(self, bot: commands.Bot):
         super().__init__(timeout=None)
-        self._ctx_or_channel = ctx_or_channel
         self._bot = bot
 
+    def detached(self) -> "PlaybackControls":
+        """
+        A stopped copy to attach to messages. Same buttons and custom_ids, so
+        presses still reach the registered view; discord.py doesn't track a
+        finished view, so sending it stores nothing per message.
+        """
+        copy = PlaybackControls(self._bot)
+        copy.stop()
+        return copy
+
+    def _music_cog(self):
+        return self._bot.cogs.get("MusicCog")
+
     def _get_player(self, guild_id: int):
         """Retrieve the GuildPlayer from the MusicCog."""
-        cog = self._bot.cogs.get("MusicCog")
+        cog = self._music_cog()
         if cog is None:
             return None
         return cog.get_player(guild_id)
 
-    def _guild_id(self, interaction: Interaction) -> int:
-        return interaction.guild_id
+    def _refresh(self, player) -> None:
+        cog = self._music_cog()
+        if cog:
+            cog.refresh_now_playing(player)
 
-    @button(label="►", style=ButtonStyle.green)
+    @button(label="►", style=ButtonStyle.green, custom_id=CUSTOM_ID_PREFIX + "play")
     async def play_button(self, interaction: Interaction, btn):
         await interaction.response.defer()
-        player = self._get_player(self._guild_id(interaction))
+        player = self._get_player(interaction.guild_id)
         if player and player.resume():
+            self._refresh(player)
             await interaction.followup.send("Music resumed!")
 
-    @button(label="⏸", style=ButtonStyle.blurple)
+    @button(label="⏸", style=ButtonStyle.blurple, custom_id=CUSTOM_ID_PREFIX + "pause")
     async def pause_button(self, interaction: Interaction, btn):
         await interaction.response.defer()
-        player = self._get_player(self._guild_id(interaction))
+        player = self._get_player(interaction.guild_id)
         if player and player.pause():
+            self._refresh(player)
             await interaction.followup.send("Music paused!")
 
-    @button(label="⟲", style=ButtonStyle.blurple)
+    @button(label="⟲", style=ButtonStyle.blurple, custom_id=CUSTOM_ID_PREFIX + "restart")
     async def restart_button(self, interaction: Interaction, btn):
         await interaction.response.defer()
-        player = self._get_player(self._guild_id(interaction))
-        cog = self._bot.cogs.get("MusicCog")
+        player = self._get_player(interaction.guild_id)
+        cog = self._music_cog()
         if player and cog:
-            await player.seek(-99999, cog.get_source_for_player(player), self._ctx_or_channel)
+            channel = player.last_channel or interaction.channel
+            await player.seek(-99999, cog.get_source_for_player(player), channel)
+            self._refresh(player)
             await interaction.followup.send("Restarting song.")
 
-    @button(label="⏭", style=ButtonStyle.blurple)
+    @button(label="⏭", style=ButtonStyle.blurple, custom_id=CUSTOM_ID_PREFIX + "skip")
     async def skip_button(self, interaction: Interaction, btn):
         await interaction.response.defer()
-        player = self._get_player(self._guild_id(interaction))
+        player = self._get_player(interaction.guild_id)
         if player and player.is_playing:
             await interaction.followup.send("Song skipped.")
             await player.skip()
 
-    @button(label="⏹", style=ButtonStyle.danger)
+    @button(label="⏹", style=ButtonStyle.danger, custom_id=CUSTOM_ID_PREFIX + "stop")
     async def stop_button(self, interaction: Interaction, btn):
         await interaction.response.defer()
-        player = self._get_player(self._guild_id(interaction))
-        if player:
-            await player.disconnect()
-            await interaction.followup.send("Music stopped and disconnected.")
\ No newline at end of file
+        cog = self._music_cog()
+        if cog and await cog.stop_player(interaction.guild_id):
+            await interaction.followup.send("Music stopped and disconnected.")
@@ -3,28 +3,47 @@ Now Playing embed UI.
 
 Separated from command logic so it can be called from both
 the .playing command and the auto-advance after-callback.
+
+NowPlayingBoard keeps one live Now Playing message per guild and edits it
+in place: on track changes, queue changes, and on a slow interval so the
+progress bar stays current. Edits go through a single EditScheduler shared
+by every guild, which
+  - coalesces: a guild has at most one pending edit, rendered from the
+    player's state at send time, so a burst of skips costs one edit;
+  - respects Discord's per-channel message edit bucket (5 per 5 s);
+  - caps total edits per second below the global REST limit;
+  - serves guilds round-robin so busy guilds can't starve the others.
 """
 
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+
 import discord
+from discord.ext import commands
 
+from .controls import PlaybackControls
 from ..utils.formatting import format_time, format_song_line, build_progress_bar
+from ..utils.log import get_logger
+from ..utils.ratelimit import TokenBucket
 
+log = get_logger(__name__)
 
-async def send_now_playing(
-    destination: discord.abc.Messageable,
-    player,   # GuildPlayer — avoiding circular import with string annotation
-    bot: discord.ext.commands.Bot,
-) -> None:
-    """
-    Build and send a Now Playing embed to `destination`.
-    Works with any Messageable (TextChannel or Context).
-    """
-    from ..ui.controls import PlaybackControls  # local import avoids circular dep
+PROGRESS_REFRESH_INTERVAL = 15.0  # seconds between progress bar refreshes
+CHANNEL_EDIT_INTERVAL = 1.0       # per-channel spacing (Discord allows 5 edits / 5 s)
+GLOBAL_EDITS_PER_SECOND = 20.0    # stays well under the 50 req/s global limit
 
+
+def build_now_playing_embed(player) -> discord.Embed:
+    """Render the Now Playing embed for `player`'s current state."""
     song = player.current_song
     if not song:
-        await destination.send("No song is currently playing.")
-        return
+        return discord.Embed(
+            title="Now Playing",
+            description="`Nothing is playing`",
+            color=discord.Color.dark_gray(),
+        )
 
     elapsed = player.elapsed
     duration = song.duration
@@ -47,7 +66,7 @@ async def send_now_playing(
     embed.add_field(
         name="Progress",
         value=(
-            f"▶️ {format_time(elapsed)} "
+            f"{'⏸️' if player.is_paused else '▶️'} {format_time(elapsed)} "
             f"{build_progress_bar(elapsed, duration)} "
             f"{format_time(duration)}"
         ),
@@ -57,7 +76,227 @@ async def send_now_playing(
 
     if song.thumbnail:
         embed.set_thumbnail(url=song.thumbnail)
+    return embed
+
+
+async def send_now_playing(
+    destination: discord.abc.Messageable,
+    player,   # GuildPlayer — avoiding circular import with string annotation
+    bot: commands.Bot,
+    view: Optional[discord.ui.View] = None,
+) -> Optional[discord.Message]:
+    """
+    Build and send a Now Playing embed to `destination`.
+    Works with any Messageable (TextChannel or Context).
+    `view` is normally the bot's single persistent PlaybackControls.
+    Returns the sent message, or None if nothing is playing.
+    """
+    if not player.current_song:
+        await destination.send("No song is currently playing.")
+        return None
+
+    if view is None:
+        return await destination.send(embed=build_now_playing_embed(player))
+    return await destination.send(embed=build_now_playing_embed(player), view=view)
+
+
+# ---------------------------------------------------------------------------
+# Edit scheduling
+# ---------------------------------------------------------------------------
+
+class EditScheduler:
+    """
+    Global, rate-limit-aware queue of message edits keyed by guild.
+    `schedule()` is cheap and can be called as often as state changes.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_EDITS_PER_SECOND,
+        channel_interval: float = CHANNEL_EDIT_INTERVAL,
+    ):
+        self._bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self._channel_interval = channel_interval
+        # guild_id -> (channel_id, job); insertion order is the round-robin order
+        self._pending: OrderedDict[int, tuple[int, Callable[[], Awaitable[None]]]] = OrderedDict()
+        self._channel_ready_at: dict[int, float] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, key: int, channel_id: int, job: Callable[[], Awaitable[None]]) -> None:
+        """
+        Queue `job` for `key`. If `key` already has a pending edit, the new job
+        replaces it in place — it keeps its turn but only the latest runs.
+        """
+        self._pending[key] = (channel_id, job)
+        self._wake.set()
+
+    def discard(self, key: int) -> None:
+        self._pending.pop(key, None)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def _next_ready(self, now: float) -> tuple[Optional[int], float]:
+        """First pending key whose channel is off cooldown, else the soonest wait."""
+        soonest = float("inf")
+        for key, (channel_id, _) in self._pending.items():
+            ready_at = self._channel_ready_at.get(channel_id, 0.0)
+            if ready_at <= now:
+                return key, 0.0
+            soonest = min(soonest, ready_at - now)
+        return None, soonest
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            key, wait = self._next_ready(monotonic())
+            if key is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            delay = self._bucket.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue  # re-pick: state may have changed while we slept
+            self._bucket.try_acquire()
+
+            channel_id, job = self._pending.pop(key)
+            self._channel_ready_at[channel_id] = monotonic() + self._channel_interval
+            asyncio.ensure_future(self._execute(key, job))
+
+            if len(self._channel_ready_at) > 4 * len(self._pending) + 256:
+                now = monotonic()
+                self._channel_ready_at = {
+                    c: t for c, t in self._channel_ready_at.items() if t > now
+                }
+
+    @staticmethod
+    async def _execute(key: int, job: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await job()
+        except Exception as e:
+            log.warning(f"[guild={key}] Now Playing edit failed: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Live Now Playing messages
+# ---------------------------------------------------------------------------
+
+class NowPlayingBoard:
+    """One live, self-updating Now Playing message per guild."""
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        controls: Optional[PlaybackControls] = None,
+        scheduler: Optional[EditScheduler] = None,
+    ):
+        self._bot = bot
+        # What's attached to messages: a stopped copy, see PlaybackControls.detached()
+        self._controls = controls.detached() if controls is not None else None
+        self._scheduler = scheduler or EditScheduler()
+        self._messages: dict[int, discord.Message] = {}
+        self._players: dict[int, object] = {}  # guild_id -> GuildPlayer
+        self._progress_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._scheduler.start()
+        if self._progress_task is None or self._progress_task.done():
+            self._progress_task = asyncio.ensure_future(self._refresh_progress())
+
+    def stop(self) -> None:
+        self._scheduler.stop()
+        if self._progress_task and not self._progress_task.done():
+            self._progress_task.cancel()
+        self._progress_task = None
+
+    async def post(self, destination: discord.abc.Messageable, player) -> None:
+        """
+        Send a fresh Now Playing message and make it the guild's live message.
+        The previous live message, if any, is deleted so only one set of
+        controls is ever shown.
+        """
+        interaction = getattr(destination, "interaction", None)
+        if interaction is not None and player.current_song:
+            # ctx.send() on a slash command sends an interaction followup, which
+            # can't be edited or deleted once the token expires (15 minutes): the
+            # live message goes to the channel, the interaction gets a short reply
+            await destination.send(f"Now playing: **{player.current_song.title}**", ephemeral=True)
+            destination = destination.channel
+        message = await send_now_playing(destination, player, self._bot, view=self._controls)
+        if message is None:
+            return
+        old = self._messages.get(player.guild_id)
+        self._messages[player.guild_id] = message
+        self._players[player.guild_id] = player
+        self._scheduler.discard(player.guild_id)  # the new message is already current
+        if old is not None and old.id != message.id:
+            asyncio.ensure_future(self._delete_quietly(old))
+
+    def refresh(self, player) -> None:
+        """Request an in-place edit of the guild's live message (coalesced)."""
+        message = self._messages.get(player.guild_id)
+        if message is None:
+            return
+        self._scheduler.schedule(
+            player.guild_id, message.channel.id, lambda: self._edit(player.guild_id)
+        )
+
+    async def track_changed(self, player) -> None:
+        """Update the live message for a new track, posting one if there's none yet."""
+        if player.guild_id in self._messages:
+            self.refresh(player)
+        elif player.last_channel:
+            await self.post(player.last_channel, player)
+
+    def forget(self, guild_id: int) -> None:
+        self._messages.pop(guild_id, None)
+        self._players.pop(guild_id, None)
+        self._scheduler.discard(guild_id)
+
+    async def _edit(self, guild_id: int) -> None:
+        message = self._messages.get(guild_id)
+        player = self._players.get(guild_id)
+        if message is None or player is None:
+            return
+        try:
+            if player.current_song:
+                await message.edit(embed=build_now_playing_embed(player))
+            else:
+                # Playback ended: freeze the message without controls and let it go
+                await message.edit(embed=build_now_playing_embed(player), view=None)
+                self.forget(guild_id)
+        except discord.NotFound:
+            log.debug("[guild=%s] Now Playing message was deleted, forgetting it", guild_id)
+            self.forget(guild_id)
+
+    async def _refresh_progress(self) -> None:
+        while True:
+            await asyncio.sleep(PROGRESS_REFRESH_INTERVAL)
+            try:
+                for guild_id, player in list(self._players.items()):
+                    if player.is_playing or not player.current_song:
+                        self.refresh(player)
+            except Exception as e:
+                log.error(f"Error refreshing Now Playing progress: {e}", exc_info=True)
 
-    # Pass the destination as ctx-like object for the controls
-    view = PlaybackControls(destination, bot)
-    await destination.send(embed=embed, view=view)
\ No newline at end of file
+    async def _delete_quietly(self, message: discord.Message) -> None:
+        try:
+            await message.delete()
+        except discord.HTTPException:
+            pass
@@ -1,22 +1,176 @@
 """
-Reusable reaction-based search result picker.
+Reusable button-based search result picker.
 
 Both the YouTube search and Plex search commands show a list of results
-and wait for the user to react with 1️⃣/2️⃣/3️⃣ or ❌.
+and let the user pick one with numbered buttons, paging with ◀/▶ when
+there are more results than fit on one page.
 Extracted here so the two cogs don't duplicate this logic.
+
+The whole picker is a single message send: buttons arrive with the embed,
+so results are selectable after one round trip, and a pick answers the
+interaction by editing that same message.
+
+show_streaming_results() is the same picker fed incrementally: it opens
+with whatever has arrived and is edited as more sources answer. Each pick
+button is bound to the song it was rendered with, so a re-rank between
+render and press can't pick a different song than the one shown.
 """
 
 import asyncio
-from typing import Optional
+from typing import AsyncIterator, Callable, Optional
 
 import discord
+from discord import ButtonStyle, Interaction
+from discord.ui import View, Button
 
 from ..core.song import Song
+from ..utils import tracing
 from ..utils.formatting import format_time, format_song_line
 
-RESULT_EMOJIS = ["1️⃣", "2️⃣", "3️⃣"]
-CANCEL_EMOJI = "❌"
-REACTION_TIMEOUT = 30.0
+PAGE_SIZE = 5
+PICK_TIMEOUT = 30.0
+
+
+def build_results_embed(
+    songs: list[Song],
+    page: int,
+    title: str,
+    color: discord.Color,
+    tag: Optional[Callable[[Song], str]] = None,
+    pending: tuple[str, ...] = (),
+) -> discord.Embed:
+    """
+    Render one page of results. Result numbers are global across pages.
+    `tag` labels each result (e.g. with its source); `pending` names sources
+    whose results haven't arrived yet.
+    """
+    start = page * PAGE_SIZE
+    embed = discord.Embed(title=title, color=color)
+    for number, song in enumerate(songs[start:start + PAGE_SIZE], start=start + 1):
+        line = format_song_line(song.title, song.duration, song.artist, song.album)
+        label = f"**{tag(song)}** " if tag else ""
+        embed.add_field(
+            name=f"{number}.",
+            value=f"`[{format_time(song.duration)}]` {label}{line}",
+            inline=False,
+        )
+    if not songs:
+        embed.description = "Searching…" if pending else "No results found."
+    footer = []
+    pages = _page_count(songs)
+    if pages > 1:
+        footer.append(f"Page {page + 1}/{pages}")
+    if pending:
+        footer.append(f"Still searching: {', '.join(pending)}")
+    if footer:
+        embed.set_footer(text=" · ".join(footer))
+    return embed
+
+
+def _page_count(songs: list[Song]) -> int:
+    return max(1, (len(songs) + PAGE_SIZE - 1) // PAGE_SIZE)
+
+
+class SearchPicker(View):
+    """
+    Numbered pick buttons for the current page, plus paging and cancel.
+    Only the user who ran the search can press them.
+    """
+
+    def __init__(
+        self,
+        author_id: int,
+        songs: list[Song],
+        title: str,
+        color: discord.Color,
+        timeout: float = PICK_TIMEOUT,
+        tag: Optional[Callable[[Song], str]] = None,
+    ):
+        super().__init__(timeout=timeout)
+        self._author_id = author_id
+        self._songs = songs
+        self._title = title
+        self._color = color
+        self._tag = tag
+        self._pending: tuple[str, ...] = ()
+        self._page = 0
+        self.chosen: Optional[Song] = None
+        self.canceled = False
+        self.message: Optional[discord.Message] = None
+        self._render_buttons()
+
+    def embed(self) -> discord.Embed:
+        return build_results_embed(
+            self._songs, self._page, self._title, self._color, tag=self._tag, pending=self._pending
+        )
+
+    def update(self, songs: list[Song], pending: tuple[str, ...] = ()) -> None:
+        """Replace the results (e.g. as more sources answer); the caller edits the message."""
+        self._songs = songs
+        self._pending = pending
+        self._page = min(self._page, _page_count(songs) - 1)
+        self._render_buttons()
+
+    def _render_buttons(self) -> None:
+        self.clear_items()
+        start = self._page * PAGE_SIZE
+        for number in range(start + 1, min(start + PAGE_SIZE, len(self._songs)) + 1):
+            pick = Button(label=str(number), style=ButtonStyle.blurple, row=0)
+            pick.callback = self._make_pick(self._songs[number - 1])
+            self.add_item(pick)
+
+        if _page_count(self._songs) > 1:
+            prev_button = Button(label="◀", style=ButtonStyle.gray, row=1, disabled=self._page == 0)
+            prev_button.callback = self._make_turn(-1)
+            self.add_item(prev_button)
+            next_button = Button(
+                label="▶", style=ButtonStyle.gray, row=1,
+                disabled=self._page >= _page_count(self._songs) - 1,
+            )
+            next_button.callback = self._make_turn(1)
+            self.add_item(next_button)
+
+        cancel = Button(label="✖", style=ButtonStyle.danger, row=1)
+        cancel.callback = self._cancel
+        self.add_item(cancel)
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        if interaction.user.id != self._author_id:
+            await interaction.response.send_message(
+                "Only the person who searched can pick a result.", ephemeral=True
+            )
+            return False
+        return True
+
+    def _make_pick(self, song: Song):
+        async def pick(interaction: Interaction):
+            self.chosen = song
+            line = format_song_line(self.chosen.title, self.chosen.duration, self.chosen.artist, self.chosen.album)
+            await interaction.response.edit_message(
+                embed=discord.Embed(title=self._title, description=f"Selected: {line}", color=self._color),
+                view=None,
+            )
+            self.stop()
+        return pick
+
+    def _make_turn(self, step: int):
+        async def turn(interaction: Interaction):
+            self._page = max(0, min(self._page + step, _page_count(self._songs) - 1))
+            self._render_buttons()
+            await interaction.response.edit_message(embed=self.embed(), view=self)
+        return turn
+
+    async def _cancel(self, interaction: Interaction):
+        self.canceled = True
+        await interaction.response.edit_message(content="Search canceled.", embed=None, view=None)
+        self.stop()
+
+    async def on_timeout(self) -> None:
+        if self.message:
+            try:
+                await self.message.edit(content="You took too long to respond! Search canceled.", view=None)
+            except discord.HTTPException:
+                pass
 
 
 async def show_search_results(
@@ -26,45 +180,59 @@ async def show_search_results(
     color: discord.Color = discord.Color.dark_gray(),
 ) -> Optional[Song]:
     """
-    Display `songs` (up to 3) in an embed, add number reactions, and wait
-    for the user to pick one. Returns the chosen Song, or None if canceled/timed out.
+    Display `songs` in an embed with pick buttons and wait for the user to
+    choose one. Returns the chosen Song, or None if canceled/timed out.
     """
     if not songs:
         await ctx.send("No results found.")
         return None
 
-    songs = songs[:3]
-    reactions = RESULT_EMOJIS[: len(songs)] + [CANCEL_EMOJI]
+    picker = SearchPicker(ctx.author.id, songs, title, color)
+    picker.message = await ctx.send(embed=picker.embed(), view=picker)
+    # User think time: shown in the trace so it isn't mistaken for pipeline latency
+    with tracing.span("picker", results=len(songs), user_wait=True):
+        await picker.wait()
+    return picker.chosen
 
-    embed = discord.Embed(title=title, color=color)
-    for i, song in enumerate(songs, start=1):
-        line = format_song_line(song.title, song.duration, song.artist, song.album)
-        embed.add_field(
-            name=f"{RESULT_EMOJIS[i - 1]}",
-            value=f"`[{format_time(song.duration)}]` {line}",
-            inline=False,
-        )
 
-    message = await ctx.send(embed=embed)
-    for emoji in reactions:
-        await message.add_reaction(emoji)
-
-    def check(reaction, user):
-        return (
-            user == ctx.author
-            and str(reaction.emoji) in reactions
-            and reaction.message.id == message.id
-        )
-
-    try:
-        reaction, _ = await ctx.bot.wait_for("reaction_add", timeout=REACTION_TIMEOUT, check=check)
-    except asyncio.TimeoutError:
-        await ctx.send("You took too long to respond! Search canceled.")
-        return None
+async def show_streaming_results(
+    ctx,
+    updates: AsyncIterator[tuple[list[Song], tuple[str, ...]]],
+    title: str = "Search Results",
+    color: discord.Color = discord.Color.dark_gray(),
+    tag: Optional[Callable[[Song], str]] = None,
+    searching: tuple[str, ...] = (),
+) -> Optional[Song]:
+    """
+    Like show_search_results, but `updates` yields (songs so far, sources
+    still searching) and the picker is edited as each update arrives.
+    `searching` names the sources shown as pending before the first update.
+    The user can pick as soon as the first results are shown.
+    """
+    picker = SearchPicker(ctx.author.id, [], title, color, tag=tag)
+    picker.update([], pending=searching)
+    picker.message = await ctx.send(embed=picker.embed(), view=picker)
 
-    if str(reaction.emoji) == CANCEL_EMOJI:
-        await ctx.send("Search canceled.")
-        return None
+    async def feed() -> None:
+        songs: list[Song] = []
+        async for songs, pending in updates:
+            if picker.is_finished():
+                return
+            picker.update(songs, tuple(pending))
+            try:
+                await picker.message.edit(embed=picker.embed(), view=picker)
+            except discord.HTTPException:
+                pass  # the next update (or the pick) redraws it
+        if not songs and not picker.is_finished():
+            picker.stop()
+            try:
+                await picker.message.edit(embed=picker.embed(), view=None)
+            except discord.HTTPException:
+                pass
 
-    index = RESULT_EMOJIS.index(str(reaction.emoji))
-    return songs[index]
+    feeder = asyncio.ensure_future(feed())
+    with tracing.span("picker", user_wait=True):
+        await picker.wait()
+    if not feeder.done():
+        feeder.cancel()
+    return picker.chosen
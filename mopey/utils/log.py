@@ -13,28 +13,153 @@ Log levels used:
     INFO    — normal operational events (song started, user connected, etc.)
     WARNING — recoverable problems (Plex unavailable, song skipped due to error)
     ERROR   — unexpected failures with full tracebacks
+
+Log calls never write to stdout themselves: records are put on an in-memory
+queue and a background QueueListener thread formats and writes them, so a
+slow terminal or pipe can't stall the event loop or the voice threads.
+Message formatting is deferred to that thread too — prefer
+    log.debug("[guild=%s] Prefetching: %r", guild_id, title)
+over f-strings in hot paths, so a filtered-out debug line costs nothing.
+
+Output is either the human-readable text format or, with json_lines=True,
+one JSON object per line carrying guild and trace fields for log shippers.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import re
 import sys
+from typing import Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_atexit_registered = False
+
+_GUILD_PATTERN = re.compile(r"\[guild=(\d+)\]")
+
+
+# ---------------------------------------------------------------------------
+# Handler, filters and formatters
+# ---------------------------------------------------------------------------
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that hands the record over as-is. The stock prepare() formats
+    the message in the calling thread, which is exactly the work we want off
+    the event loop; the listener is in-process, so nothing needs pickling.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _TraceContextFilter(logging.Filter):
+    """Stamp records with the caller's trace id (contextvars don't cross to the listener)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        from . import tracing  # tracing imports this module
+        record.trace_id = tracing.current_trace_id()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """
+    Keep 1 in `every` DEBUG records per call site; other levels always pass.
+    Counting per call site means a chatty loop is thinned without silencing
+    rare debug lines elsewhere.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts: dict[tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        site = (record.pathname, record.lineno)
+        count = self._counts.get(site, 0)
+        self._counts[site] = count + 1
+        return count % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with guild (from the '[guild=…]' prefix) and trace fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": message,
+        }
+        guild = getattr(record, "guild", None)
+        if guild is None:
+            match = _GUILD_PATTERN.search(message)
+            guild = int(match.group(1)) if match else None
+        if guild is not None:
+            entry["guild"] = guild
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
 
+# ---------------------------------------------------------------------------
+# Setup
+# ---------------------------------------------------------------------------
 
-def setup_logging(level: int = logging.DEBUG) -> None:
+def setup_logging(
+    level: int = logging.DEBUG,
+    json_lines: bool = False,
+    debug_sample_every: int = 1,
+) -> None:
     """
     Call once at startup (in bot.py) to configure the root logger.
-    All child loggers (mopey.*) inherit this config.
+    All child loggers (mopey.*) inherit this config. Calling it again
+    replaces the previous configuration rather than adding to it.
+
+    `json_lines` switches stdout to JSON lines; `debug_sample_every` keeps
+    only every Nth DEBUG record from each call site.
     """
-    fmt = logging.Formatter(
-        fmt="%(asctime)s  %(levelname)-8s  %(name)-30s  %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    global _listener, _atexit_registered
+
+    if json_lines:
+        fmt = JsonFormatter()
+    else:
+        fmt = logging.Formatter(
+            fmt="%(asctime)s  %(levelname)-8s  %(name)-30s  %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
 
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(fmt)
 
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(records)
+    if debug_sample_every > 1:
+        queue_handler.addFilter(DebugSampler(debug_sample_every))
+    if json_lines:
+        queue_handler.addFilter(_TraceContextFilter())
+
     root = logging.getLogger("mopey")
+    for old in [h for h in root.handlers if isinstance(h, _DeferredQueueHandler)]:
+        root.removeHandler(old)
+
+    shutdown_logging()
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+
     root.setLevel(level)
-    root.addHandler(handler)
+    root.addHandler(queue_handler)
 
     # Suppress noisy third-party loggers
     logging.getLogger("discord").setLevel(logging.WARNING)
@@ -42,6 +167,14 @@ def setup_logging(level: int = logging.DEBUG) -> None:
     logging.getLogger("yt_dlp").setLevel(logging.ERROR)
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer (safe to call twice)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger namespaced under 'mopey'.
@@ -52,4 +185,4 @@ def get_logger(name: str) -> logging.Logger:
     # so loggers are always rooted at 'mopey'
     if not name.startswith("mopey"):
         name = f"mopey.{name}"
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
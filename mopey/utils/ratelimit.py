@@ -0,0 +1,42 @@
+"""
+Rate-limiting primitives. No Discord or bot imports.
+"""
+
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens, refilled at `rate`
+    tokens per second. Not thread-safe — use from the event loop only.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take `tokens` if available. Returns False (taking nothing) otherwise."""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` would be available (0 if they already are)."""
+        self._refill()
+        missing = tokens - self._tokens
+        return max(0.0, missing / self.rate) if missing > 0 else 0.0
+
+    def is_full(self) -> bool:
+        """True when the bucket has fully refilled, i.e. it's been idle long enough to discard."""
+        self._refill()
+        return self._tokens >= self.capacity
@@ -0,0 +1,127 @@
+"""
+Startup profiling: where does time-to-ready go?
+
+When enabled (startup_profile=1, see main.py) before the bot is imported,
+this records
+  - every module import, with inclusive time and self time (excluding the
+    modules it imported in turn), via a sys.meta_path hook;
+  - named initialisation phases, via `phase("build sources")` blocks;
+and logs a report once the bot is ready. When disabled, `phase()` is a
+near-free no-op and nothing is hooked.
+
+Roughly what `python -X importtime` prints, but in-process, alongside the
+bot's own init phases, and readable in the normal log.
+"""
+
+import importlib.abc
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional
+
+REPORT_TOP_MODULES = 25
+
+_enabled = False
+_started_at = perf_counter()
+# module name -> [inclusive seconds, self seconds]
+_imports: dict[str, list[float]] = {}
+_phases: list[tuple[str, float, float]] = []   # (name, start offset, duration)
+_stack: list[list[float]] = []                 # per in-flight import: [start, child seconds]
+
+
+class _TimedLoader(importlib.abc.Loader):
+
+    def __init__(self, inner: importlib.abc.Loader, name: str):
+        self._inner = inner
+        self._name = name
+
+    def create_module(self, spec):
+        return self._inner.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        frame = [perf_counter(), 0.0]
+        _stack.append(frame)
+        try:
+            self._inner.exec_module(module)
+        finally:
+            _stack.pop()
+            inclusive = perf_counter() - frame[0]
+            _imports[self._name] = [inclusive, inclusive - frame[1]]
+            if _stack:
+                _stack[-1][1] += inclusive
+
+    def __getattr__(self, name):
+        # get_resource_reader, is_package, get_code, ... behave as the real loader
+        return getattr(self._inner, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, fullname)
+                return spec
+        return None
+
+
+def enable() -> None:
+    """Start recording imports. Call before importing the bot."""
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    sys.meta_path.insert(0, _TimingFinder())
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def phase(name: str):
+    """Time an initialisation phase (no-op unless profiling is enabled)."""
+    if not _enabled:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, start - _started_at, perf_counter() - start))
+
+
+def mark(name: str) -> None:
+    """Record an instant, e.g. 'ready', relative to process start."""
+    if _enabled:
+        _phases.append((name, perf_counter() - _started_at, 0.0))
+
+
+def report(top: int = REPORT_TOP_MODULES) -> Optional[str]:
+    """Text report of phases and the slowest imports, or None when disabled."""
+    if not _enabled:
+        return None
+    lines = [f"Startup profile ({perf_counter() - _started_at:.2f}s since start)", "  phases:"]
+    for name, offset, duration in _phases:
+        took = f"{duration * 1000:9.1f} ms" if duration else " " * 12
+        lines.append(f"    {name:<32}{took}  @ {offset:6.2f}s")
+
+    total_self = sum(s for _, s in _imports.values())
+    lines.append(f"  imports: {len(_imports)} modules, {total_self:.2f}s total; top {top} by self time:")
+    lines.append(f"    {'module':<40}{'self ms':>10}{'incl ms':>10}")
+    slowest = sorted(_imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (inclusive, own) in slowest:
+        lines.append(f"    {name:<40}{own * 1000:>10.1f}{inclusive * 1000:>10.1f}")
+
+    by_package: dict[str, float] = {}
+    for name, (_, own) in _imports.items():
+        root = name.split(".", 1)[0]
+        by_package[root] = by_package.get(root, 0.0) + own
+    lines.append("  by top-level package:")
+    for root, own in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:10]:
+        lines.append(f"    {root:<40}{own * 1000:>10.1f}")
+    return "\n".join(lines)
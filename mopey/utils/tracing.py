@@ -0,0 +1,320 @@
+"""
+Lightweight span tracing for the play pipeline.
+
+A `.play` crosses several async hops and two kinds of thread (executor
+workers for yt-dlp/ffmpeg spawn, discord.py's AudioPlayer thread), so
+plain log lines can't tell you where a slow play spent its time. This
+module keeps a trace per request:
+
+    with tracing.trace("play", guild=guild_id, query=link):
+        with tracing.span("resolve"):
+            ...
+        tracing.event("queued", position=3)
+
+The current span lives in a contextvar, so it follows awaits for free.
+Threads don't inherit contextvars; wrap callables handed to executors or
+thread callbacks with `bind()` so spans opened there join the same trace.
+A span can also outlive its `with` block: `start_span()` returns an open
+span that another thread finishes with `Span.end()` (used for the time to
+the first Opus packet, which the AudioPlayer thread observes).
+
+A trace is complete once every span in it has ended. Completed traces
+go to an in-memory ring buffer (served on /traces and /traces.json when
+the metrics endpoint is on), optionally to a JSON-lines file, and slow
+ones are logged as a waterfall. Spans opened with `user_wait=True` (a
+search picker waiting for a choice) don't count towards "slow": that's
+the user thinking, not the bot.
+"""
+
+import contextvars
+import json
+import queue
+import secrets
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter, time
+from typing import Any, Callable, Optional
+
+from .log import get_logger
+from .metrics import ROUTES
+
+log = get_logger(__name__)
+
+RECENT_TRACES = 200          # completed traces kept in memory
+SLOW_TRACE_SECONDS = 3.0     # traces slower than this are logged as a waterfall
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "mopey_trace_span", default=None
+)
+
+
+# ---------------------------------------------------------------------------
+# Data model
+# ---------------------------------------------------------------------------
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attrs", "events", "start", "end_at")
+
+    def __init__(self, trace: "Trace", name: str, parent: Optional["Span"], attrs: dict):
+        self.trace = trace
+        self.span_id = secrets.token_hex(4)
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attrs = attrs
+        self.events: list[tuple[float, str, dict]] = []
+        self.start = perf_counter()
+        self.end_at: Optional[float] = None
+
+    @property
+    def ended(self) -> bool:
+        return self.end_at is not None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def event(self, name: str, **attrs) -> None:
+        self.events.append((perf_counter(), name, attrs))
+
+    def end(self, **attrs) -> None:
+        """End the span. Safe to call more than once, from any thread."""
+        if attrs:
+            self.attrs.update(attrs)
+        self.trace._end_span(self)
+
+
+class Trace:
+
+    def __init__(self, name: str, attrs: dict):
+        self.trace_id = secrets.token_hex(8)
+        self.name = name
+        self.started_at = time()
+        self.origin = perf_counter()
+        self.spans: list[Span] = []
+        self._open = 0
+        self._lock = threading.Lock()
+        self.root = self._new_span(name, None, attrs)
+
+    def _new_span(self, name: str, parent: Optional[Span], attrs: dict) -> Span:
+        span = Span(self, name, parent, attrs)
+        with self._lock:
+            self.spans.append(span)
+            self._open += 1
+        return span
+
+    def _end_span(self, span: Span) -> None:
+        with self._lock:
+            if span.end_at is not None:
+                return
+            span.end_at = perf_counter()
+            self._open -= 1
+            finished = self._open == 0
+        if finished:
+            _record(self)
+
+    @property
+    def duration(self) -> float:
+        ends = [s.end_at for s in self.spans if s.end_at is not None]
+        return (max(ends) if ends else perf_counter()) - self.origin
+
+    @property
+    def busy_duration(self) -> float:
+        """Duration minus time spent in `user_wait` spans."""
+        waiting = sum(
+            (s.end_at or perf_counter()) - s.start for s in self.spans if s.attrs.get("user_wait")
+        )
+        return self.duration - waiting
+
+    def to_dict(self) -> dict:
+        def offset_ms(t: float) -> float:
+            return round((t - self.origin) * 1000, 2)
+
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "spans": [
+                {
+                    "span_id": s.span_id,
+                    "parent_id": s.parent_id,
+                    "name": s.name,
+                    "start_ms": offset_ms(s.start),
+                    "duration_ms": round((s.end_at - s.start) * 1000, 2) if s.end_at else None,
+                    "attrs": {k: _jsonable(v) for k, v in s.attrs.items()},
+                    "events": [
+                        {"name": n, "at_ms": offset_ms(t), "attrs": {k: _jsonable(v) for k, v in a.items()}}
+                        for t, n, a in s.events
+                    ],
+                }
+                for s in self.spans
+            ],
+        }
+
+
+def _jsonable(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current.get()
+    return span.trace.trace_id if span else None
+
+
+@contextmanager
+def trace(name: str, **attrs):
+    """
+    Start a new trace whose root span covers the `with` block. If a trace is
+    already active (e.g. an auto-advance scheduled from a finished play), the
+    new trace records it as `follows_from` rather than nesting inside it.
+    """
+    previous = _current.get()
+    if previous is not None:
+        attrs.setdefault("follows_from", previous.trace.trace_id)
+    new = Trace(name, attrs)
+    token = _current.set(new.root)
+    try:
+        yield new.root
+    except BaseException as e:
+        new.root.set(error=type(e).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        new.root.end()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """A child span of the current span, or a no-op when no trace is active."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.trace._new_span(name, parent, attrs)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.set(error=type(e).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        child.end()
+
+
+def start_span(name: str, **attrs) -> Optional[Span]:
+    """Open a child span that the caller (or another thread) must end()."""
+    parent = _current.get()
+    if parent is None:
+        return None
+    return parent.trace._new_span(name, parent, attrs)
+
+
+def event(name: str, **attrs) -> None:
+    span_ = _current.get()
+    if span_ is not None:
+        span_.event(name, **attrs)
+
+
+def bind(fn: Callable) -> Callable:
+    """
+    Return `fn` wrapped to run in a copy of the caller's context, so spans it
+    opens on an executor or audio thread attach to the caller's trace.
+    """
+    context = contextvars.copy_context()
+
+    def bound(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+
+    return bound
+
+
+# ---------------------------------------------------------------------------
+# Completed traces: ring buffer, waterfall, export
+# ---------------------------------------------------------------------------
+
+_recent: deque[Trace] = deque(maxlen=RECENT_TRACES)
+_recent_lock = threading.Lock()   # appended from AudioPlayer threads, read on the loop
+_export_path: Optional[str] = None
+_export_queue: "queue.SimpleQueue[dict]" = queue.SimpleQueue()
+_export_thread: Optional[threading.Thread] = None
+
+
+def recent_traces() -> list[Trace]:
+    with _recent_lock:
+        return list(_recent)
+
+
+def configure_export(path: Optional[str]) -> None:
+    """Append each completed trace as one JSON line to `path` (None disables)."""
+    global _export_path, _export_thread
+    _export_path = path or None
+    if _export_path and _export_thread is None:
+        _export_thread = threading.Thread(target=_export_worker, name="mopey-trace-export", daemon=True)
+        _export_thread.start()
+
+
+def _export_worker() -> None:
+    while True:
+        record = _export_queue.get()
+        path = _export_path
+        if not path:
+            continue
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            log.warning(f"Trace export to {path} failed: {e}")
+
+
+def _record(finished: Trace) -> None:
+    # May run on the AudioPlayer thread: keep it to appends and a queue put
+    with _recent_lock:
+        _recent.append(finished)
+    if _export_path:
+        _export_queue.put(finished.to_dict())
+    if finished.busy_duration >= SLOW_TRACE_SECONDS:
+        log.info(f"Slow trace {finished.name} ({finished.duration:.2f}s):\n{format_waterfall(finished)}")
+
+
+def format_waterfall(trace_: Trace, width: int = 40) -> str:
+    """Render a trace as an indented text waterfall, one line per span."""
+    total = max(trace_.duration, 1e-6)
+    by_parent: dict[Optional[str], list[Span]] = {}
+    for s in trace_.spans:
+        by_parent.setdefault(s.parent_id, []).append(s)
+
+    lines = [f"trace {trace_.trace_id} {trace_.name} {total * 1000:.1f} ms"]
+
+    def walk(parent_id: Optional[str], depth: int) -> None:
+        for s in sorted(by_parent.get(parent_id, []), key=lambda s: s.start):
+            begin = s.start - trace_.origin
+            length = (s.end_at or perf_counter()) - s.start
+            lead = int(begin / total * width)
+            bar = "#" * max(1, int(length / total * width))
+            label = f"{'  ' * depth}{s.name}"
+            lines.append(f"  {label:<28} {' ' * lead}{bar:<{width - lead}} {begin * 1000:8.1f} +{length * 1000:.1f} ms")
+            for t, name, _ in s.events:
+                lines.append(f"  {'  ' * (depth + 1)}* {name} @ {(t - trace_.origin) * 1000:.1f} ms")
+            walk(s.span_id, depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+ROUTES["/traces"] = lambda: (
+    "text/plain; charset=utf-8",
+    "\n\n".join(format_waterfall(t) for t in reversed(recent_traces())) + "\n",
+)
+ROUTES["/traces.json"] = lambda: (
+    "application/json",
+    json.dumps([t.to_dict() for t in reversed(recent_traces())]),
+)